@@ -4,9 +4,13 @@
 # #autonomous-ai #cursor
 # SPDX-License-Identifier: MIT
 
-import json
 import requests # Still need for exception handling
 from porkbun_api import make_porkbun_request # Import the helper function
+from porkbun_codec import print_json, pop_flag # JSON output (--raw prints the body untouched)
+from porkbun_profiling import profile_from_argv # Handles --profile / --profile-out=FILE
+
+profile_from_argv()
+RAW_OUTPUT = pop_flag("--raw")
 
 # --- API Call specific to ping ---
 try:
@@ -14,7 +18,7 @@ try:
     # Make request to the /ping endpoint using the imported function
     ping_response = make_porkbun_request("/ping", {})
     print("Ping successful!")
-    print(json.dumps(ping_response, indent=2))
+    print_json(ping_response, raw=RAW_OUTPUT)
 
 # Handle potential errors from the API call or JSON parsing
 except (requests.exceptions.RequestException, ValueError) as e:
@@ -4,19 +4,39 @@
 # #autonomous-ai #cursor
 # SPDX-License-Identifier: MIT
 
-import json
+# Usage: ./07_list_all_domains.py [--raw | --ndjson] [--profile] [--profile-out=FILE]
+#   --raw     print the API response body untouched
+#   --ndjson  page through all domains, one compact JSON object per domain per line
+#             (status messages go to stderr)
+
 import requests # For exception handling
-from porkbun_api import make_porkbun_request # Import the helper function
+from porkbun_api import make_porkbun_request, iter_domain_pages # Import the helper functions
+from porkbun_codec import print_json, pop_flag, ndjson_output # JSON output (--raw prints the body untouched)
+from porkbun_profiling import profile_from_argv # Handles --profile / --profile-out=FILE
+
+profile_from_argv()
+RAW_OUTPUT = pop_flag("--raw")
+NDJSON_OUTPUT = pop_flag("--ndjson")
 
 # --- API Call to List Domains ---
 try:
-    print("Attempting to list all domains...")
-    # Payload for listing domains (empty for all domains by default)
-    list_payload = {}
-    # Make request to the /domain/listAll endpoint
-    domains_response = make_porkbun_request("/domain/listAll", list_payload)
-    print("Successfully retrieved domain list!")
-    print(json.dumps(domains_response, indent=2))
+    if NDJSON_OUTPUT:
+        # Stream page by page (listAll returns up to 1000 domains per 'start' offset)
+        with ndjson_output() as out:
+            print("Attempting to list all domains...")
+            for page in iter_domain_pages():
+                for domain in page:
+                    out.write(domain)
+                out.flush()
+            print(f"Successfully listed {out.count} domains.")
+    else:
+        print("Attempting to list all domains...")
+        # Payload for listing domains (empty for all domains by default)
+        list_payload = {}
+        # Make request to the /domain/listAll endpoint
+        domains_response = make_porkbun_request("/domain/listAll", list_payload)
+        print("Successfully retrieved domain list!")
+        print_json(domains_response, raw=RAW_OUTPUT)
 
 # Handle potential errors from the API call or JSON parsing
 except (requests.exceptions.RequestException, ValueError) as e:
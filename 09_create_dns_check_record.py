@@ -9,12 +9,13 @@ Example script to create a DNS record using the Porkbun API.
 Reads record details from 08_dns_check_record_text.txt and takes domain as argument.
 
 Ensure your virtual environment is active and ~/.env file is populated.
-Usage: ./09_create_dns_check_record.py yourdomain.com
+Usage: ./09_create_dns_check_record.py yourdomain.com [--profile] [--profile-out=FILE]
 """
 
 from porkbun_api import make_porkbun_request
+from porkbun_profiling import profile_from_argv
 import requests  # For exception handling
-import json      # For printing output
+from porkbun_codec import print_json # For printing output
 import os        # For potential future env var use
 import sys       # For command-line arguments
 import re        # For parsing the config file
@@ -93,6 +94,9 @@ def create_dns_record(domain, name, record_type, content, ttl="600"):
     return make_porkbun_request(endpoint, payload)
 
 if __name__ == "__main__":
+    # Handle --profile / --profile-out=FILE before checking arguments
+    profile_from_argv()
+
     if len(sys.argv) != 2:
         print(f"Usage: {sys.argv[0]} <yourdomain.com>")
         sys.exit(1)
@@ -124,7 +128,7 @@ if __name__ == "__main__":
             ttl=RECORD_TTL
         )
         print("\nAPI Response:")
-        print(json.dumps(response, indent=2))
+        print_json(response)
 
         if response.get("status") == "SUCCESS":
             record_full_name = f"{RECORD_NAME}.{DOMAIN}" if RECORD_NAME else DOMAIN
@@ -10,12 +10,14 @@ Reads record details from 08_dns_check_record_text.txt and takes domain as argum
 It first retrieves the record ID and then uses the delete-by-ID endpoint.
 
 Ensure your virtual environment is active and ~/.env file is populated.
-Usage: ./11_delete_dns_check_record.py yourdomain.com
+Usage: ./11_delete_dns_check_record.py yourdomain.com [--profile] [--profile-out=FILE]
 """
 
 from porkbun_api import make_porkbun_request
+from porkbun_models import parse_records
+from porkbun_profiling import profile_from_argv
 import requests  # For exception handling
-import json      # For printing output
+from porkbun_codec import print_json # For printing output
 import os        # For potential future env var use
 import sys       # For command-line arguments
 import re        # For parsing the config file
@@ -84,14 +86,14 @@ def get_dns_record_id(domain, name, record_type, content_filter=None):
     try:
         response = make_porkbun_request(endpoint, {})
         if response.get("status") == "SUCCESS" and "records" in response:
-            matching_records = []
-            for record in response["records"]:
-                # Filter by exact content if provided
-                if content_filter is None or record.get("content") == content_filter:
-                    matching_records.append(record)
+            # Filter by exact content if provided (None matches any content)
+            matching_records = [
+                record for record in parse_records(response, domain)
+                if record.matches(name, record_type, domain, content_filter)
+            ]
 
             if len(matching_records) == 1:
-                record_id = matching_records[0].get("id")
+                record_id = matching_records[0].id
                 print(f"Found unique matching record with ID: {record_id}")
                 return record_id
             elif len(matching_records) > 1:
@@ -131,6 +133,9 @@ def delete_dns_record_by_id(domain, record_id):
     return make_porkbun_request(endpoint, {})
 
 if __name__ == "__main__":
+    # Handle --profile / --profile-out=FILE before checking arguments
+    profile_from_argv()
+
     if len(sys.argv) != 2:
         print(f"Usage: {sys.argv[0]} <yourdomain.com>")
         sys.exit(1)
@@ -164,7 +169,7 @@ if __name__ == "__main__":
         if record_id_to_delete:
             delete_response = delete_dns_record_by_id(DOMAIN, record_id_to_delete)
             print("\nDeletion API Response:")
-            print(json.dumps(delete_response, indent=2))
+            print_json(delete_response)
 
             if delete_response.get("status") == "SUCCESS":
                 print(f"\nSuccessfully deleted record ID '{record_id_to_delete}'")
@@ -10,12 +10,15 @@ and specifically check if the test record from 08_dns_check_record_text.txt is p
 Reads record details from 08_dns_check_record_text.txt and takes domain as argument.
 
 Ensure your virtual environment is active and ~/.env file is populated.
-Usage: ./12_check_delete_dns_check_record.py yourdomain.com
+Usage: ./12_check_delete_dns_check_record.py yourdomain.com [--debug] [--ndjson] [--profile] [--profile-out=FILE]
 """
 
 from porkbun_api import make_porkbun_request
+from porkbun_models import parse_records
+from porkbun_profiling import profile_from_argv
 import requests  # For exception handling
 import json      # For printing output
+from porkbun_codec import print_json, pop_flag, ndjson_output # Prints API responses (raw body passthrough, NDJSON)
 import os        # For potential future env var use
 import sys       # For command-line arguments
 import re        # For parsing the config file
@@ -30,6 +33,13 @@ if '--debug' in args:
     args.remove('--debug')
 sys.argv = [sys.argv[0]] + args
 
+# Handle --profile / --profile-out=FILE the same way
+profile_from_argv()
+
+# --ndjson: write every record as one compact JSON object per line on stdout
+# (all other output goes to stderr)
+NDJSON_OUTPUT = pop_flag("--ndjson")
+
 def load_record_config(config_path):
     """Loads record details from the specified config file."""
     config = {}
@@ -96,6 +106,7 @@ if __name__ == "__main__":
         sys.exit(1)
 
     DOMAIN = sys.argv[1]
+    ndjson = ndjson_output() if NDJSON_OUTPUT else None
     # Print debug info after parsing domain
     if DEBUG:
         print(f"Debug: DEBUG mode ON")
@@ -121,21 +132,23 @@ if __name__ == "__main__":
         # Print debug info for raw API response
         if DEBUG:
             print("Debug: Raw API response:")
-            print(json.dumps(response, indent=2))
+            print_json(response, raw=True)
 
         if response.get("status") == "SUCCESS" and "records" in response:
             print(f"\nSuccessfully retrieved {len(response['records'])} records for {DOMAIN}.")
+            if ndjson:
+                # Tag each record with its domain so output from several runs can be concatenated
+                for record in response['records']:
+                    ndjson.write({"domain": DOMAIN, **record})
+                ndjson.flush()
             # Check specifically for the test record
             found_test_record = False
-            for record in response['records']:
-                # Porkbun API might return name with or without trailing domain
-                # Let's check both possibilities for robustness
-                api_record_name = record.get('name')
-                is_match = (api_record_name == record_name_to_check or api_record_name == record_full_name) and record.get('type') == record_type_to_check
-
-                if is_match:
+            for record in parse_records(response, DOMAIN):
+                # Porkbun API might return name with or without trailing domain;
+                # DnsRecord.matches accepts both
+                if record.matches(record_name_to_check, record_type_to_check, DOMAIN):
                     print(f"\n[!] FOUND: The test record ({record_type_to_check} for {record_full_name}) was found in the list.")
-                    print(json.dumps(record, indent=4))
+                    print(json.dumps(record.to_dict(), indent=4))
                     found_test_record = True
                     # Don't break, show all matches if duplicates exist (shouldn't normally)
 
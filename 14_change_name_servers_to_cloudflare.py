@@ -9,12 +9,13 @@ Script to change the name servers of a domain to Cloudflare's name servers using
 Takes the domain as a command line argument to keep domain names out of public repositories.
 
 Ensure your virtual environment is active and ~/.env file is populated with API keys.
-Usage: ./14_change_name_servers_to_cloudflare.py yourdomain.com
+Usage: ./14_change_name_servers_to_cloudflare.py yourdomain.com [--profile] [--profile-out=FILE]
 """
 
 from porkbun_api import make_porkbun_request
+from porkbun_profiling import profile_from_argv
 import requests  # For exception handling
-import json      # For printing output
+from porkbun_codec import print_json # For printing output
 import sys       # For command-line arguments
 
 # Cloudflare's nameservers
@@ -66,6 +67,9 @@ def update_nameservers(domain, nameservers):
     return make_porkbun_request(endpoint, payload)
 
 if __name__ == "__main__":
+    # Handle --profile / --profile-out=FILE before checking arguments
+    profile_from_argv()
+
     if len(sys.argv) != 2:
         print(f"Usage: {sys.argv[0]} <yourdomain.com>")
         sys.exit(1)
@@ -88,7 +92,7 @@ if __name__ == "__main__":
         response = update_nameservers(DOMAIN, CLOUDFLARE_NS)
         
         print("\nAPI Response:")
-        print(json.dumps(response, indent=2))
+        print_json(response)
         
         if response.get("status") == "SUCCESS":
             print(f"\nSuccessfully changed nameservers for {DOMAIN} to Cloudflare's nameservers.")
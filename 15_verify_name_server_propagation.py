@@ -9,20 +9,31 @@ Script to verify nameserver propagation globally after changing to Cloudflare na
 A companion to 14_change_name_servers_to_cloudflare.py that provides a visual dashboard
 of propagation status across global DNS servers.
 
+With --ecs, a few fast ECS-capable resolvers are asked on behalf of client
+subnets in every region (EDNS Client Subnet, RFC 7871) instead of querying
+dozens of regional resolvers, many of which are slow or unreachable.
+
 Ensure your virtual environment is active.
-Usage: ./15_verify_name_server_propagation.py yourdomain.com [interval] [timeout]
+Usage: ./15_verify_name_server_propagation.py yourdomain.com [interval] [timeout] [--ecs] [--ecs-resolver=IP[:PORT]]
+                                              [--profile] [--profile-out=FILE]
     interval: Optional. Check every N seconds (default: 0 - single check)
     timeout: Optional. Timeout for each DNS query in seconds (default: 5)
+    --ecs: Optional. Query ECS_RESOLVERS once per vantage point in ECS_VANTAGE_POINTS
+    --ecs-resolver: Optional, repeatable. ECS resolver to use instead of ECS_RESOLVERS (implies --ecs)
 """
 
 import sys
-import subprocess
 import json
 import time
 import datetime
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import random
-import os
+
+import dns_resolver
+import dns_wire
+import porkbun_metrics
+from porkbun_profiling import profile_from_argv
+from terminal_renderer import LiveRenderer
 
 # ANSI color codes for terminal output
 class Colors:
@@ -97,140 +108,206 @@ BACKUP_DNS_SERVERS = {
     ]
 }
 
-def run_dig_command(domain, record_type, dns_server, timeout=5):
+# ECS-capable resolvers for --ecs mode: they pass the Client Subnet option on to
+# authoritative servers and cache answers per subnet scope
+ECS_RESOLVERS = [
+    {"name": "Google", "ip": "8.8.8.8"},
+    {"name": "OpenDNS", "ip": "208.67.222.222"}
+]
+
+# Client subnets standing in for users in each region (/24s of large regional ISPs)
+ECS_VANTAGE_POINTS = {
+    "North America": [
+        {"name": "US East (Verizon)", "subnet": "71.178.0.0/24"},
+        {"name": "US West (Comcast)", "subnet": "73.189.0.0/24"},
+        {"name": "Canada (Rogers)", "subnet": "99.224.0.0/24"}
+    ],
+    "Europe": [
+        {"name": "Germany (Telekom)", "subnet": "87.128.0.0/24"},
+        {"name": "UK (BT)", "subnet": "86.128.0.0/24"},
+        {"name": "France (Orange)", "subnet": "90.0.0.0/24"}
+    ],
+    "Asia": [
+        {"name": "Singapore (Singtel)", "subnet": "116.14.0.0/24"},
+        {"name": "India (Airtel)", "subnet": "122.160.0.0/24"},
+        {"name": "Japan (NTT)", "subnet": "153.240.0.0/24"}
+    ],
+    "Oceania": [
+        {"name": "Australia (Telstra)", "subnet": "1.120.0.0/24"},
+        {"name": "New Zealand (Spark)", "subnet": "122.56.0.0/24"}
+    ],
+    "South America": [
+        {"name": "Brazil (Vivo)", "subnet": "200.158.0.0/24"},
+        {"name": "Argentina (Telecom)", "subnet": "181.0.0.0/24"}
+    ],
+    "Africa": [
+        {"name": "South Africa (Telkom)", "subnet": "41.0.0.0/24"},
+        {"name": "Nigeria (Airtel)", "subnet": "105.112.0.0/24"}
+    ]
+}
+
+def ecs_servers(resolvers=None):
     """
-    Run a dig command against the specified DNS server for the domain and record type.
+    Build the server list for ECS mode: every vantage point through every ECS resolver.
+    
+    Args:
+        resolvers (list, optional): Resolver dicts (name, ip, optional port) or "IP[:PORT]"
+                                    strings (default: ECS_RESOLVERS)
+        
+    Returns:
+        list: Server dicts with name, ip, port, region and subnet, for verify_nameserver_propagation
+    """
+    servers = []
+    for resolver in resolvers or ECS_RESOLVERS:
+        if isinstance(resolver, str):
+            ip, port = dns_resolver.parse_server(resolver)
+            resolver = {"name": resolver, "ip": ip, "port": port}
+        for region, vantage_points in ECS_VANTAGE_POINTS.items():
+            for vantage_point in vantage_points:
+                servers.append({
+                    "name": f"{vantage_point['name']} via {resolver['name']}",
+                    "ip": resolver["ip"],
+                    "port": resolver.get("port"),
+                    "region": region,
+                    "subnet": vantage_point["subnet"],
+                })
+    return servers
+
+def run_dns_query(domain, record_type, dns_server, timeout=5):
+    """
+    Query the specified DNS server for the domain and record type with the
+    in-process resolver (dns_resolver), so no external `dig` binary is needed.
     
     Args:
         domain (str): Domain name to query
         record_type (str): DNS record type (A, MX, TXT, CNAME, NS, etc)
-        dns_server (dict): Dictionary with DNS server info (name and ip)
+        dns_server (dict): Dictionary with DNS server info (name, ip and optional port, region
+                           and subnet; a subnet is sent as an EDNS Client Subnet option)
         timeout (int): Timeout for the query in seconds
         
     Returns:
-        dict: Result with server info and dig output
+        dict: Result with server info and the answers in `dig +short` format; in ECS mode also
+              the subnet and the scope prefix the resolver answered for (None if not echoed)
     """
     server_ip = dns_server["ip"]
-    server_name = dns_server["name"]
-    
-    # Build dig command
-    dig_cmd = ["dig", "@" + server_ip, domain, record_type, "+short", f"+time={timeout}"]
+    subnet = dns_server.get("subnet")
+    result = {
+        "server": dns_server["name"],
+        "server_ip": server_ip,
+        "region": dns_server.get("region") or get_server_region(server_ip),
+        "subnet": subnet,
+        "scope": None,
+        "success": False,
+        "answers": [],
+        "error": None,
+        "timed_out": False,
+        "is_backup": "region" not in dns_server and
+                     not any(s["ip"] == server_ip for servers in PRIMARY_DNS_SERVERS.values() for s in servers)
+    }
     
+    options = [dns_wire.encode_client_subnet(subnet)] if subnet else ()
     try:
-        # Run dig command and capture output
-        result = subprocess.run(dig_cmd, capture_output=True, text=True, timeout=timeout+1)
-        
-        # Parse the output
-        output = result.stdout.strip()
-        success = result.returncode == 0
-        
-        # Format the result
-        if output:
-            lines = output.split('\n')
-            answers = lines
-        else:
-            answers = []
-            
-        return {
-            "server": server_name,
-            "server_ip": server_ip,
-            "region": next((region for region, servers in PRIMARY_DNS_SERVERS.items() 
-                           if any(s["ip"] == server_ip for s in servers)), 
-                          next((region for region, servers in BACKUP_DNS_SERVERS.items() 
-                               if any(s["ip"] == server_ip for s in servers)), "Unknown")),
-            "success": success,
-            "answers": answers,
-            "error": result.stderr.strip() if result.stderr else None,
-            "is_backup": not any(s["ip"] == server_ip for region, servers in PRIMARY_DNS_SERVERS.items() for s in servers)
-        }
-        
-    except subprocess.TimeoutExpired:
-        return {
-            "server": server_name,
-            "server_ip": server_ip,
-            "region": next((region for region, servers in PRIMARY_DNS_SERVERS.items() 
-                           if any(s["ip"] == server_ip for s in servers)), 
-                          next((region for region, servers in BACKUP_DNS_SERVERS.items() 
-                               if any(s["ip"] == server_ip for s in servers)), "Unknown")),
-            "success": False,
-            "answers": [],
-            "error": "Timeout querying DNS server",
-            "is_backup": not any(s["ip"] == server_ip for region, servers in PRIMARY_DNS_SERVERS.items() for s in servers)
-        }
-    except Exception as e:
-        return {
-            "server": server_name,
-            "server_ip": server_ip,
-            "region": next((region for region, servers in PRIMARY_DNS_SERVERS.items() 
-                           if any(s["ip"] == server_ip for s in servers)), 
-                          next((region for region, servers in BACKUP_DNS_SERVERS.items() 
-                               if any(s["ip"] == server_ip for s in servers)), "Unknown")),
-            "success": False,
-            "answers": [],
-            "error": str(e),
-            "is_backup": not any(s["ip"] == server_ip for region, servers in PRIMARY_DNS_SERVERS.items() for s in servers)
-        }
+        # Non-standard port, e.g. a local stub server used by the benchmarks
+        response = dns_resolver.query((server_ip, dns_server.get("port") or 53), domain, record_type,
+                                      timeout=timeout, options=options)
+    except dns_resolver.DnsTimeout:
+        result.update(error="Timeout querying DNS server", timed_out=True)
+        return result
+    except dns_resolver.DnsError as e:
+        result["error"] = str(e)
+        return result
+    
+    # Like dig +short: only records of the queried type (e.g. no CNAME chain for NS)
+    result["success"] = True
+    result["answers"] = [dns_resolver.format_short(r) for r in response["answers"] if r["type"] == record_type]
+    if subnet:
+        try:
+            echoed = dns_wire.client_subnet(response)
+        except dns_wire.DnsFormatError:
+            echoed = None
+        result["scope"] = echoed[1] if echoed else None
+    return result
 
-def check_command_exists(command):
-    """Check if a command exists on the system."""
-    try:
-        subprocess.run(["which", command], capture_output=True, check=True)
-        return True
-    except:
-        return False
+def query_dns_server(domain, record_type, dns_server, timeout=5):
+    """
+    Run a DNS query via run_dns_query, recording per-resolver latency and
+    timeout metrics when metrics are enabled.
+    
+    Args and return value are the same as run_dns_query.
+    """
+    if not porkbun_metrics.ENABLED:
+        return run_dns_query(domain, record_type, dns_server, timeout)
+    
+    start = time.perf_counter()
+    result = run_dns_query(domain, record_type, dns_server, timeout)
+    porkbun_metrics.DNS_QUERY_LATENCY.observe(time.perf_counter() - start, result["server_ip"], result["region"])
+    if result.get("timed_out"):
+        porkbun_metrics.DNS_QUERY_TIMEOUTS.inc(result["server_ip"], result["region"])
+    return result
 
-def verify_nameserver_propagation(domain, timeout=5):
+def verify_nameserver_propagation(domain, timeout=5, on_result=None, servers=None):
     """
     Verify nameserver propagation by querying multiple global DNS servers.
     Try backup servers for regions with failed primary servers.
     
+    A backup query for a region is started as soon as every primary server in that
+    region has answered without data, rather than after all regions have finished.
+    
     Args:
         domain (str): Domain name to check
         timeout (int): Timeout for each query in seconds
+        on_result (callable, optional): Called with each result dict as soon as it arrives
+        servers (list, optional): Server dicts to query instead of PRIMARY_DNS_SERVERS,
+                                  without backups (e.g. from ecs_servers())
         
     Returns:
         list: Results from all DNS servers
     """
     # First, gather all primary servers
     all_primary_servers = []
-    for region, servers in PRIMARY_DNS_SERVERS.items():
+    if servers:
         all_primary_servers.extend(servers)
+    else:
+        for region, region_servers in PRIMARY_DNS_SERVERS.items():
+            all_primary_servers.extend(region_servers)
+    
+    # Track outstanding primaries per region to know when a backup is needed
+    primaries_pending = {} if servers else {region: len(region_servers)
+                                            for region, region_servers in PRIMARY_DNS_SERVERS.items()}
+    regions_answered = set()
+    all_results = []
     
-    # Use ThreadPoolExecutor to query all primary DNS servers in parallel
-    with ThreadPoolExecutor(max_workers=min(20, len(all_primary_servers))) as executor:
-        primary_results = list(executor.map(
-            lambda server: run_dig_command(domain, "NS", server, timeout),
-            all_primary_servers
-        ))
-    
-    # Group primary results by region to identify which regions need backup servers
-    primary_by_region = {}
-    for result in primary_results:
-        region = result["region"]
-        if region not in primary_by_region:
-            primary_by_region[region] = []
-        primary_by_region[region].append(result)
-    
-    # Determine which regions need backup servers
-    backup_servers_to_try = []
-    for region, results in primary_by_region.items():
-        # If all servers in the region failed or had no answers, try a backup
-        if not any(r["success"] and r["answers"] for r in results):
-            if region in BACKUP_DNS_SERVERS and BACKUP_DNS_SERVERS[region]:
-                # Choose a random backup server from this region
-                backup_servers_to_try.append(random.choice(BACKUP_DNS_SERVERS[region]))
-    
-    # Query backup servers if needed
-    backup_results = []
-    if backup_servers_to_try:
-        with ThreadPoolExecutor(max_workers=min(10, len(backup_servers_to_try))) as executor:
-            backup_results = list(executor.map(
-                lambda server: run_dig_command(domain, "NS", server, timeout),
-                backup_servers_to_try
-            ))
-    
-    # Combine results and sort by region
-    all_results = primary_results + backup_results
+    # Use ThreadPoolExecutor to query all DNS servers in parallel, handling results as they complete
+    with ThreadPoolExecutor(max_workers=min(32, len(all_primary_servers))) as executor:
+        futures = {
+            executor.submit(query_dns_server, domain, "NS", server, timeout)
+            for server in all_primary_servers
+        }
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                all_results.append(result)
+                if on_result:
+                    on_result(result)
+                
+                if result["is_backup"]:
+                    continue
+                region = result["region"]
+                if result["success"] and result["answers"]:
+                    regions_answered.add(region)
+                if region not in primaries_pending:
+                    continue
+                primaries_pending[region] -= 1
+                
+                # If all servers in the region failed or had no answers, try a backup
+                if primaries_pending[region] == 0 and region not in regions_answered:
+                    if BACKUP_DNS_SERVERS.get(region):
+                        # Choose a random backup server from this region
+                        backup_server = random.choice(BACKUP_DNS_SERVERS[region])
+                        futures.add(executor.submit(query_dns_server, domain, "NS", backup_server, timeout))
+    
+    # Sort results by region
     all_results.sort(key=lambda x: (x["region"], x["server"]))
     
     return all_results
@@ -240,87 +317,111 @@ def is_cloudflare_nameserver(nameserver):
     nameserver = nameserver.lower().rstrip('.')
     return any(ns.lower() == nameserver for ns in CLOUDFLARE_NS)
 
-def display_nameserver_dashboard(results, domain, start_time=None, check_count=1):
+def get_server_region(server_ip):
+    """Return the region a DNS server IP belongs to (primary or backup list)."""
+    for server_lists in (PRIMARY_DNS_SERVERS, BACKUP_DNS_SERVERS):
+        for region, servers in server_lists.items():
+            if any(s["ip"] == server_ip for s in servers):
+                return region
+    return "Unknown"
+
+def get_server_status(res):
     """
-    Display a dashboard of nameserver propagation status with colors and visual indicators.
+    Classify a DNS query result for display.
+    
+    Returns:
+        tuple: (status_color, status_icon, status_text, has_cloudflare)
+    """
+    if not res["success"]:
+        return Colors.RED, "✗", "ERROR", False
+    if not res["answers"]:
+        return Colors.YELLOW, "?", "NO DATA", False
+    # Check if any answer is a Cloudflare nameserver
+    if any(is_cloudflare_nameserver(answer) for answer in res["answers"]):
+        return Colors.GREEN, "✓", "CLOUDFLARE", True
+    return Colors.PURPLE, "!", "OLD NS", False
+
+def format_server_lines(res):
+    """Format the status line and answer/error lines for one DNS query result."""
+    status_color, status_icon, status_text, _ = get_server_status(res)
+    
+    # Mark backup servers
+    backup_indicator = f" {Colors.BLUE}[BACKUP]{Colors.RESET}" if res.get("is_backup") else ""
+    
+    # Show the client subnet and the scope the resolver answered for (0 = same answer for everyone)
+    if res.get("subnet"):
+        scope = "not echoed" if res.get("scope") is None else f"scope /{res['scope']}"
+        backup_indicator += f" {Colors.CYAN}[ECS {res['subnet']}, {scope}]{Colors.RESET}"
+    
+    lines = [f"{status_color}{status_icon} {res['server']} ({res['server_ip']}){backup_indicator} - {status_text}{Colors.RESET}"]
+    
+    # Add the answers or error
+    if res["success"]:
+        if res["answers"]:
+            for answer in res["answers"]:
+                ns_color = Colors.GREEN if is_cloudflare_nameserver(answer) else Colors.GRAY
+                lines.append(f"  └─ {ns_color}{answer}{Colors.RESET}")
+        else:
+            lines.append(f"  └─ {Colors.GRAY}No records returned{Colors.RESET}")
+    else:
+        lines.append(f"  └─ {Colors.GRAY}Error: {res['error']}{Colors.RESET}")
+    return lines
+
+def build_dashboard_lines(results, domain, start_time=None, check_count=1, pending=None):
+    """
+    Build the lines of the nameserver propagation dashboard.
     
     Args:
-        results (list): DNS query results
+        results (list): DNS query results received so far
         domain (str): Domain being checked
         start_time (float): When the first check started (for continuous monitoring)
         check_count (int): Number of checks performed so far
+        pending (list, optional): DNS server dicts still being queried
+        
+    Returns:
+        tuple: (lines, cloudflare_propagated, total_responsive_servers)
     """
-    # Clear the screen for better dashboard view (only if not the first run)
-    if check_count > 1 and sys.stdout.isatty():
-        os.system('cls' if os.name == 'nt' else 'clear')
-    
     current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     elapsed = f" (monitoring for {int(time.time() - start_time)} seconds)" if start_time else ""
     
-    print(f"\n{Colors.BOLD}{Colors.BLUE}=== NAMESERVER PROPAGATION DASHBOARD ===={Colors.RESET}")
-    print(f"{Colors.BOLD}Domain:{Colors.RESET} {domain}")
-    print(f"{Colors.BOLD}Time:{Colors.RESET} {current_time}{elapsed}")
-    print(f"{Colors.BOLD}Check #{Colors.RESET} {check_count}\n")
+    lines = [
+        "",
+        f"{Colors.BOLD}{Colors.BLUE}=== NAMESERVER PROPAGATION DASHBOARD ===={Colors.RESET}",
+        f"{Colors.BOLD}Domain:{Colors.RESET} {domain}",
+        f"{Colors.BOLD}Time:{Colors.RESET} {current_time}{elapsed}",
+        f"{Colors.BOLD}Check #{Colors.RESET} {check_count}",
+        "",
+    ]
     
-    # Group results by region
+    # Group results (and servers still being queried) by region, in a stable order
+    entries = [(res["region"], res["server"], res) for res in results]
+    for server in pending or []:
+        entries.append((server.get("region") or get_server_region(server["ip"]), server["name"], server))
+    entries.sort(key=lambda entry: (entry[0], entry[1]))
     by_region = {}
-    for result in results:
-        region = result["region"]
-        if region not in by_region:
-            by_region[region] = []
-        by_region[region].append(result)
+    for region, _, entry in entries:
+        by_region.setdefault(region, []).append(entry)
     
     # Propagation counters
     cloudflare_propagated = 0
     total_responsive_servers = 0
     
     # Display results by region
-    for region, region_results in by_region.items():
-        print(f"{Colors.BOLD}== {region} =={Colors.RESET}")
+    for region, region_entries in by_region.items():
+        lines.append(f"{Colors.BOLD}== {region} =={Colors.RESET}")
         
-        for res in region_results:
+        for entry in region_entries:
+            if "success" not in entry:
+                # Still waiting for this server
+                lines.append(f"{Colors.GRAY}… {entry['name']} ({entry['ip']}) - QUERYING{Colors.RESET}")
+                continue
+            
             # Count responsive servers
-            if res["success"]:
+            if entry["success"]:
                 total_responsive_servers += 1
-            
-            # Determine status indicators and colors
-            if not res["success"]:
-                status_color = Colors.RED
-                status_icon = "✗"
-                status_text = "ERROR"
-            elif not res["answers"]:
-                status_color = Colors.YELLOW
-                status_icon = "?"
-                status_text = "NO DATA"
-            else:
-                # Check if any answer is a Cloudflare nameserver
-                has_cloudflare = any(is_cloudflare_nameserver(answer) for answer in res["answers"])
-                if has_cloudflare:
-                    cloudflare_propagated += 1
-                    status_color = Colors.GREEN
-                    status_icon = "✓"
-                    status_text = "CLOUDFLARE"
-                else:
-                    status_color = Colors.PURPLE
-                    status_icon = "!"
-                    status_text = "OLD NS"
-            
-            # Mark backup servers
-            backup_indicator = f" {Colors.BLUE}[BACKUP]{Colors.RESET}" if res.get("is_backup") else ""
-            
-            # Print the server status line
-            print(f"{status_color}{status_icon} {res['server']} ({res['server_ip']}){backup_indicator} - {status_text}{Colors.RESET}")
-            
-            # Print the answers or error
-            if res["success"]:
-                if res["answers"]:
-                    for answer in res["answers"]:
-                        ns_color = Colors.GREEN if is_cloudflare_nameserver(answer) else Colors.GRAY
-                        print(f"  └─ {ns_color}{answer}{Colors.RESET}")
-                else:
-                    print(f"  └─ {Colors.GRAY}No records returned{Colors.RESET}")
-            else:
-                print(f"  └─ {Colors.GRAY}Error: {res['error']}{Colors.RESET}")
+            if get_server_status(entry)[3]:
+                cloudflare_propagated += 1
+            lines.extend(format_server_lines(entry))
     
     # Calculate propagation percentage
     if total_responsive_servers > 0:
@@ -333,12 +434,15 @@ def display_nameserver_dashboard(results, domain, start_time=None, check_count=1
     filled_width = int(bar_width * propagation_pct / 100)
     bar = "█" * filled_width + "░" * (bar_width - filled_width)
     
-    print(f"\n{Colors.BOLD}=== PROPAGATION SUMMARY ==={Colors.RESET}")
-    print(f"{Colors.BOLD}Cloudflare NS detected:{Colors.RESET} {cloudflare_propagated}/{total_responsive_servers} servers ({propagation_pct:.1f}%)")
-    print(f"{Colors.BOLD}Progress:{Colors.RESET} |{Colors.GREEN}{bar}{Colors.RESET}| {propagation_pct:.1f}%")
+    lines.append("")
+    lines.append(f"{Colors.BOLD}=== PROPAGATION SUMMARY ==={Colors.RESET}")
+    lines.append(f"{Colors.BOLD}Cloudflare NS detected:{Colors.RESET} {cloudflare_propagated}/{total_responsive_servers} servers ({propagation_pct:.1f}%)")
+    lines.append(f"{Colors.BOLD}Progress:{Colors.RESET} |{Colors.GREEN}{bar}{Colors.RESET}| {propagation_pct:.1f}%")
     
+    if pending:
+        lines.append(f"{Colors.BOLD}Status:{Colors.RESET} {Colors.CYAN}Waiting for {len(pending)} server(s)...{Colors.RESET}")
     # Estimate completion
-    if 0 < propagation_pct < 100:
+    elif 0 < propagation_pct < 100:
         # Very rough estimate based on typical propagation times
         if propagation_pct < 30:
             est_hours = "24-48"
@@ -349,42 +453,114 @@ def display_nameserver_dashboard(results, domain, start_time=None, check_count=1
         else:
             est_hours = "1-4"
             
-        print(f"{Colors.BOLD}Estimated completion:{Colors.RESET} Approximately {est_hours} hours remaining")
+        lines.append(f"{Colors.BOLD}Estimated completion:{Colors.RESET} Approximately {est_hours} hours remaining")
     elif propagation_pct >= 100:
-        print(f"{Colors.BOLD}Status:{Colors.RESET} {Colors.GREEN}PROPAGATION COMPLETE!{Colors.RESET}")
+        lines.append(f"{Colors.BOLD}Status:{Colors.RESET} {Colors.GREEN}PROPAGATION COMPLETE!{Colors.RESET}")
     else:
-        print(f"{Colors.BOLD}Status:{Colors.RESET} {Colors.YELLOW}No propagation detected yet{Colors.RESET}")
+        lines.append(f"{Colors.BOLD}Status:{Colors.RESET} {Colors.YELLOW}No propagation detected yet{Colors.RESET}")
     
     # Some tips
-    if propagation_pct < 100:
-        print(f"\n{Colors.YELLOW}NOTE:{Colors.RESET} DNS changes can take up to 48 hours to fully propagate worldwide.")
-        print(f"      Some ISPs and DNS services cache results longer than others.")
-        print(f"      Run this script periodically to track progress.")
+    if not pending and propagation_pct < 100:
+        lines.append("")
+        lines.append(f"{Colors.YELLOW}NOTE:{Colors.RESET} DNS changes can take up to 48 hours to fully propagate worldwide.")
+        lines.append(f"      Some ISPs and DNS services cache results longer than others.")
+        lines.append(f"      Run this script periodically to track progress.")
     
+    return lines, cloudflare_propagated, total_responsive_servers
+
+def display_nameserver_dashboard(results, domain, start_time=None, check_count=1):
+    """
+    Display a dashboard of nameserver propagation status with colors and visual indicators.
+    
+    Args:
+        results (list): DNS query results
+        domain (str): Domain being checked
+        start_time (float): When the first check started (for continuous monitoring)
+        check_count (int): Number of checks performed so far
+    """
+    lines, cloudflare_propagated, total_responsive_servers = build_dashboard_lines(
+        results, domain, start_time, check_count
+    )
+    print("\n".join(lines))
     return cloudflare_propagated, total_responsive_servers
 
-if __name__ == "__main__":
-    # Check if dig is installed
-    if not check_command_exists("dig"):
-        print(f"{Colors.RED}Error: The 'dig' command is not installed or not found in PATH.{Colors.RESET}")
-        print("Please install dig (usually part of the 'dnsutils' or 'bind-utils' package).")
-        sys.exit(1)
+def run_live_check(renderer, domain, timeout, start_time=None, check_count=1, servers=None):
+    """
+    Run one propagation check, updating the dashboard in place as each result arrives.
+    
+    Args:
+        renderer (LiveRenderer): Renderer for the dashboard
+        domain (str): Domain being checked
+        timeout (int): Timeout for each DNS query in seconds
+        start_time (float): When the first check started (for continuous monitoring)
+        check_count (int): Number of checks performed so far
+        servers (list, optional): Servers to query instead of PRIMARY_DNS_SERVERS (ECS mode)
         
+    Returns:
+        tuple: (results, cloudflare_count, total_count)
+    """
+    received = []
+    pending = list(servers) if servers else [server for region_servers in PRIMARY_DNS_SERVERS.values()
+                                             for server in region_servers]
+    
+    def on_result(result):
+        received.append(result)
+        # Backup servers are never listed as pending, so only primaries are removed
+        # (in ECS mode several entries share one resolver IP, so match the name too)
+        pending[:] = [s for s in pending if (s["name"], s["ip"]) != (result["server"], result["server_ip"])]
+        region_tag = f"[{result['region']}] "
+        renderer.event(region_tag + format_server_lines(result)[0])
+        lines, _, _ = build_dashboard_lines(received, domain, start_time, check_count, pending)
+        renderer.render(lines)
+    
+    renderer.reset(clear_screen=check_count > 1)
+    lines, _, _ = build_dashboard_lines([], domain, start_time, check_count, pending)
+    renderer.render(lines, force=True)
+    
+    results = verify_nameserver_propagation(domain, timeout, on_result=on_result, servers=servers)
+    lines, cloudflare_count, total_count = build_dashboard_lines(results, domain, start_time, check_count)
+    renderer.finish(lines)
+    return results, cloudflare_count, total_count
+
+if __name__ == "__main__":
+    # Turn on metrics if PORKBUN_METRICS_PORT or PORKBUN_METRICS_TEXTFILE is set
+    porkbun_metrics.enable_from_env()
+    
+    # Handle --profile / --profile-out=FILE before parsing positional arguments
+    profile_from_argv()
+    
+    # Pull out --ecs / --ecs-resolver=IP[:PORT]; the rest are positional
+    ecs_mode = False
+    ecs_resolvers = []
+    positional = []
+    for arg in sys.argv[1:]:
+        if arg == "--ecs":
+            ecs_mode = True
+        elif arg.startswith("--ecs-resolver="):
+            ecs_mode = True
+            ecs_resolvers.append(arg.split("=", 1)[1])
+        else:
+            positional.append(arg)
+    
     # Parse command line arguments
-    if len(sys.argv) < 2:
-        print(f"{Colors.BOLD}Usage:{Colors.RESET} {sys.argv[0]} <domain> [interval] [timeout]")
+    if not positional:
+        print(f"{Colors.BOLD}Usage:{Colors.RESET} {sys.argv[0]} <domain> [interval] [timeout] [--ecs] [--ecs-resolver=IP[:PORT]]")
         print(f"  domain: Domain to check nameserver propagation for")
         print(f"  interval: Optional. Check every N seconds (default: 0 - single check)")
         print(f"  timeout: Optional. Timeout for each DNS query in seconds (default: 5)")
+        print(f"  --ecs: Optional. Ask a few ECS-capable resolvers on behalf of client subnets in every region")
+        print(f"  --ecs-resolver: Optional, repeatable. ECS resolver to use (implies --ecs)")
         print(f"\n{Colors.BOLD}Examples:{Colors.RESET}")
         print(f"  ./15_verify_name_server_propagation.py example.com")
         print(f"  ./15_verify_name_server_propagation.py example.com 300")
         print(f"  ./15_verify_name_server_propagation.py example.com 300 3")
+        print(f"  ./15_verify_name_server_propagation.py example.com --ecs")
         sys.exit(1)
     
-    domain = sys.argv[1]
-    interval = int(sys.argv[2]) if len(sys.argv) > 2 else 0
-    timeout = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    domain = positional[0]
+    interval = int(positional[1]) if len(positional) > 1 else 0
+    timeout = int(positional[2]) if len(positional) > 2 else 5
+    servers = ecs_servers(ecs_resolvers) if ecs_mode else None
     
     print(f"{Colors.BOLD}Verifying nameserver propagation for {domain}...{Colors.RESET}")
     print(f"Checking if {Colors.GREEN}Cloudflare nameservers{Colors.RESET} have propagated worldwide...")
@@ -392,22 +568,19 @@ if __name__ == "__main__":
     # Start tracking with timestamps for continuous monitoring
     start_time = time.time() if interval > 0 else None
     check_count = 1
+    cloudflare_count, total_count = 0, 0
+    
+    # Updates the dashboard in place on a terminal; plain line output otherwise
+    renderer = LiveRenderer()
     
     try:
         while True:
-            # Clear the screen after the first run for better dashboard display
-            if check_count > 1 and sys.stdout.isatty():
-                os.system('cls' if os.name == 'nt' else 'clear')
-                
             # Start tracking
             check_start_time = time.time()
-            results = verify_nameserver_propagation(domain, timeout)
-            elapsed_time = time.time() - check_start_time
-            
-            # Display dashboard 
-            cloudflare_count, total_count = display_nameserver_dashboard(
-                results, domain, start_time, check_count
+            results, cloudflare_count, total_count = run_live_check(
+                renderer, domain, timeout, start_time, check_count, servers
             )
+            elapsed_time = time.time() - check_start_time
             
             print(f"\nCheck completed in {elapsed_time:.2f} seconds.")
             
@@ -425,6 +598,7 @@ if __name__ == "__main__":
             check_count += 1
             
     except KeyboardInterrupt:
+        renderer.finish()
         print(f"\n{Colors.YELLOW}Monitoring stopped by user.{Colors.RESET}")
         
     # Final message
@@ -435,4 +609,4 @@ if __name__ == "__main__":
         print(f"Run this script again later to check progress.")
     else:
         print(f"\n{Colors.RED}NOT STARTED: Cloudflare nameservers have not propagated yet.{Colors.RESET}")
-        print(f"Make sure you've run 14_change_name_servers_to_cloudflare.py successfully.") 
\ No newline at end of file
+        print(f"Make sure you've run 14_change_name_servers_to_cloudflare.py successfully.")
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Offline benchmark suite for the API and DNS hot paths, with regression gates.
+
+Everything runs against local stand-ins (fake_porkbun_server.py and
+stub_dns_server.py), so no credentials or network access are needed. The
+user's caches, daemon and metrics settings are kept out (isolated_environment).
+
+Usage:
+    ./benchmark_suite.py run [--output results.json] [--only NAME ...] [--quick]
+    ./benchmark_suite.py compare BASELINE.json RESULTS.json [--threshold 0.25]
+    ./benchmark_suite.py check [--baseline benchmarks/baseline.json] [--threshold 0.25]
+    ./benchmark_suite.py list
+
+`compare` and `check` exit with status 1 when any metric is worse than the
+baseline by more than the threshold (a fraction; 0.25 = 25%). Baselines are
+machine-specific: record one per machine/CI runner with
+    ./benchmark_suite.py run --output benchmarks/baseline.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import fake_porkbun_server
+import load_test
+import porkbun_codec
+import porkbun_models
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(REPO_DIR, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+# Startup budget for `porkbun --help`: time spent importing porkbun_cli and its
+# imports (from -X importtime), and the modules that must not be loaded at all.
+CLI_IMPORT_BUDGET_MS = 15.0
+CLI_FORBIDDEN_IMPORTS = ("requests", "dotenv", "urllib3", "porkbun_api")
+
+BENCHMARKS = {}  # name -> function(quick) returning {metric: {"value", "unit", "better"}}
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark that cannot run in this environment."""
+
+
+def benchmark(name):
+    """Registers a benchmark function under the given name."""
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+
+def metric(value, unit, better="lower", budget=None):
+    """Builds a metric entry; `better` is 'lower' or 'higher'. A value above `budget` always fails."""
+    entry = {"value": round(value, 4), "unit": unit, "better": better}
+    if budget is not None:
+        entry["budget"] = budget
+    return entry
+
+
+def load_script_module(filename, module_name):
+    """Imports one of the numbered scripts (their names are not valid identifiers)."""
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(REPO_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def start_fake_api(latency="none", domains=20, records=10):
+    """Starts a seeded fake Porkbun API and points porkbun_api at it."""
+    server = fake_porkbun_server.FakePorkbunServer(latency=latency, seed=1)
+    server.store.seed(domains, records)
+    server.start()
+    os.environ["PORKBUN_API_URL"] = server.api_url
+    os.environ["PORKBUN_API_KEY"] = fake_porkbun_server.FAKE_API_KEY
+    os.environ["PORKBUN_SECRET_KEY"] = fake_porkbun_server.FAKE_SECRET_KEY
+    import porkbun_api
+    porkbun_api.PORKBUN_API_URL = server.api_url
+    porkbun_api.API_KEY = fake_porkbun_server.FAKE_API_KEY
+    porkbun_api.SECRET_KEY = fake_porkbun_server.FAKE_SECRET_KEY
+    return server
+
+
+@benchmark("api_single_call")
+def bench_api_single_call(quick):
+    """Sequential make_porkbun_request latency against a zero-latency stand-in."""
+    from porkbun_api import make_porkbun_request
+    server = start_fake_api()
+    try:
+        calls = 50 if quick else 300
+        make_porkbun_request("/ping", {})  # warm-up
+        latencies = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            make_porkbun_request("/dns/retrieve/example00000.com", {})
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        server.stop()
+    latencies.sort()
+    return {
+        "p50_ms": metric(statistics.median(latencies), "ms"),
+        "p95_ms": metric(latencies[int(len(latencies) * 0.95) - 1], "ms"),
+    }
+
+
+@benchmark("api_batch_throughput")
+def bench_api_batch_throughput(quick):
+    """Throughput of concurrent calls with 10 ms of simulated server latency (per-call and pooled client)."""
+    from porkbun_api import PorkbunClient, make_porkbun_request
+    server = start_fake_api(latency="fixed:10")
+    results = {}
+    try:
+        for concurrency in (1, 4, 16):
+            total = max(concurrency * (10 if quick else 25), 50)
+            stats = load_test.run_load_test(make_porkbun_request, ["/ping"], concurrency, total_requests=total)
+            results[f"c{concurrency}_rps"] = metric(stats["throughput_rps"], "req/s", "higher")
+        with PorkbunClient(pool_size=16, retries=0) as client:
+            stats = load_test.run_load_test(client.request, ["/ping"], 16, total_requests=16 * (10 if quick else 25))
+            results["c16_pooled_rps"] = metric(stats["throughput_rps"], "req/s", "higher")
+    finally:
+        server.stop()
+    return results
+
+
+@benchmark("propagation_check")
+def bench_propagation_check(quick):
+    """Full verify_nameserver_propagation run over N local stub resolvers."""
+    import stub_dns_server
+    verify_ns = load_script_module("15_verify_name_server_propagation.py", "verify_ns_benchmark")
+
+    resolver_count = 6 if quick else 24
+    servers = []
+    try:
+        for index in range(resolver_count):
+            # Distinct loopback addresses keep results distinguishable by IP (Linux routes 127/8)
+            try:
+                server = stub_dns_server.StubDnsServer(host=f"127.0.0.{index + 2}", port=0, latency_ms=2)
+            except OSError:
+                raise SkipBenchmark("cannot bind additional 127.0.0.x loopback addresses")
+            for ns in verify_ns.CLOUDFLARE_NS:
+                server.add_record("example.com", "NS", ns)
+            servers.append(server.start())
+        regions = ("North America", "Europe", "Asia", "Oceania")
+        verify_ns.PRIMARY_DNS_SERVERS = {region: [] for region in regions}
+        verify_ns.BACKUP_DNS_SERVERS = {}
+        for index, server in enumerate(servers):
+            verify_ns.PRIMARY_DNS_SERVERS[regions[index % len(regions)]].append(
+                {"name": f"Stub {index}", "ip": server.host, "port": server.port})
+
+        runs = []
+        for _ in range(2 if quick else 5):
+            start = time.perf_counter()
+            results = verify_ns.verify_nameserver_propagation("example.com", timeout=2)
+            runs.append((time.perf_counter() - start) * 1000)
+            if not all(r["success"] and r["answers"] for r in results):
+                raise SkipBenchmark("stub resolvers did not answer")
+    finally:
+        for server in servers:
+            server.stop()
+    return {f"n{resolver_count}_ms": metric(statistics.median(runs), "ms")}
+
+
+def build_large_retrieve_body(record_count):
+    """Builds a /dns/retrieve response body with the given number of records."""
+    records = [{
+        "id": str(200000000 + i), "name": f"host{i}.example.com", "type": "A" if i % 3 else "TXT",
+        "content": f"198.51.100.{i % 254 + 1}" if i % 3 else f"v=spf1 include:_spf{i}.example.net ~all",
+        "ttl": "600", "prio": "0", "notes": "",
+    } for i in range(record_count)]
+    return json.dumps({"status": "SUCCESS", "cloudflare": "enabled", "records": records}).encode("utf-8")
+
+
+@benchmark("json_decode_retrieve")
+def bench_json_decode_retrieve(quick):
+    """Decoding a large /dns/retrieve response (20k records): stdlib json vs the active codec."""
+    body = build_large_retrieve_body(20000)
+    runs = []
+    for _ in range(3 if quick else 9):
+        start = time.perf_counter()
+        json.loads(body)
+        runs.append((time.perf_counter() - start) * 1000)
+    codec_runs = []
+    for _ in range(3 if quick else 9):
+        start = time.perf_counter()
+        porkbun_codec.decode_response(body)
+        codec_runs.append((time.perf_counter() - start) * 1000)
+    return {
+        "stdlib_20k_ms": metric(statistics.median(runs), "ms"),
+        "codec_20k_ms": metric(statistics.median(codec_runs), "ms"),
+    }
+
+
+def measure_retained_bytes(build):
+    """Bytes still allocated (tracemalloc) after build() returns, while its result is alive."""
+    import gc
+    import tracemalloc
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+@benchmark("record_memory")
+def bench_record_memory(quick):
+    """Memory per record for 100k /dns/retrieve records: decoded dicts vs DnsRecord objects."""
+    count = 20000 if quick else 100000
+    body = build_large_retrieve_body(count)
+    dict_bytes = measure_retained_bytes(lambda: porkbun_codec.loads(body)["records"])
+    model_bytes = measure_retained_bytes(
+        lambda: porkbun_models.parse_records(porkbun_codec.loads(body), "example.com"))
+    return {
+        "dict_bytes_per_record": metric(dict_bytes / count, "bytes"),
+        "model_bytes_per_record": metric(model_bytes / count, "bytes"),
+    }
+
+
+def time_command(command, runs, env=None):
+    """Median wall-clock time of running a command, in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=REPO_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def measure_cli_imports():
+    """
+    Runs `porkbun --help` under -X importtime.
+
+    Returns:
+        tuple: (cumulative import time of porkbun_cli in ms, set of imported top-level modules)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.join(REPO_DIR, "porkbun"), "--help"],
+        cwd=REPO_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    cli_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = [field.strip() for field in line[len("import time:"):].split("|")]
+        if not fields[1].isdigit():
+            continue  # header line
+        module = fields[2]
+        modules.add(module.split(".")[0])
+        if module == "porkbun_cli":
+            cli_us = int(fields[1])
+    return cli_us / 1000.0, modules
+
+
+@benchmark("cli_cold_start")
+def bench_cli_cold_start(quick):
+    """Fresh interpreter start of `porkbun --help` and of a numbered script (with import budget)."""
+    runs = 3 if quick else 7
+    script = [sys.executable, os.path.join(REPO_DIR, "12_check_delete_dns_check_record.py")]
+    cli_help = [sys.executable, os.path.join(REPO_DIR, "porkbun"), "--help"]
+    baseline_python = [sys.executable, "-c", "pass"]
+    import_ms, modules = measure_cli_imports()
+    forbidden = [name for name in CLI_FORBIDDEN_IMPORTS if name in modules]
+    if forbidden:
+        print(f"  porkbun --help imported: {', '.join(forbidden)}", file=sys.stderr)
+    return {
+        "porkbun_help_ms": metric(time_command(cli_help, runs), "ms"),
+        "porkbun_help_import_ms": metric(import_ms, "ms", budget=CLI_IMPORT_BUDGET_MS),
+        "porkbun_help_heavy_imports": metric(len(forbidden), "modules", budget=0),
+        "script_usage_ms": metric(time_command(script, runs), "ms"),
+        "bare_python_ms": metric(time_command(baseline_python, runs), "ms"),
+    }
+
+
+@contextlib.contextmanager
+def isolated_environment():
+    """
+    Points HOME and the cache/socket paths at a temporary directory and turns off
+    the shared response cache, the daemon broker and metrics, so every benchmark
+    measures real HTTP calls and nothing is written to the user's ~/.cache.
+    """
+    saved = dict(os.environ)
+    with tempfile.TemporaryDirectory(prefix="porkbun-benchmark-") as home:
+        os.environ.update({
+            "HOME": home,
+            "PORKBUN_SHARED_CACHE_TTL": "0",
+            "PORKBUN_SHARED_CACHE_DIR": os.path.join(home, "shared"),
+            "PORKBUN_BROKER": "off",
+            "PORKBUN_DAEMON_SOCKET": os.path.join(home, "daemon.sock"),
+        })
+        for name in ("PORKBUN_METRICS_PORT", "PORKBUN_METRICS_TEXTFILE"):
+            os.environ.pop(name, None)
+        try:
+            yield home
+        finally:
+            os.environ.clear()
+            os.environ.update(saved)
+
+
+def run_benchmarks(selected=None, quick=False):
+    """
+    Runs the selected benchmarks (all by default) in an isolated_environment().
+
+    Returns:
+        dict: {"meta": {...}, "metrics": {"bench.metric": {...}}, "skipped": {bench: reason}}
+    """
+    results = {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+            "json_codec": porkbun_codec.backend_name(),
+        },
+        "metrics": {},
+        "skipped": {},
+    }
+    with isolated_environment():
+        for name, function in BENCHMARKS.items():
+            if selected and name not in selected:
+                continue
+            print(f"Running {name}...", file=sys.stderr)
+            try:
+                for metric_name, entry in function(quick).items():
+                    results["metrics"][f"{name}.{metric_name}"] = entry
+            except SkipBenchmark as e:
+                results["skipped"][name] = str(e)
+                print(f"  skipped: {e}", file=sys.stderr)
+    return results
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares two result sets metric by metric.
+
+    A metric regresses when it is worse than the baseline by more than `threshold`
+    (a fraction), or by its own "threshold" if the baseline entry sets one. Metrics
+    with a "budget" also fail whenever the current value exceeds it.
+
+    Returns:
+        tuple: (list of regressed metric names, list of report lines)
+    """
+    regressions = []
+    lines = [f"{'metric':<40}{'baseline':>12}{'current':>12}{'change':>9}  status"]
+    for name, base in sorted(baseline.get("metrics", {}).items()):
+        entry = current.get("metrics", {}).get(name)
+        if entry is None:
+            lines.append(f"{name:<40}{base['value']:>12.2f}{'-':>12}{'':>9}  missing")
+            continue
+        limit = base.get("threshold", threshold)
+        if base["value"]:
+            change = (entry["value"] - base["value"]) / base["value"]
+        else:
+            change = 0.0
+        worse = change > limit if base.get("better", "lower") == "lower" else change < -limit
+        status = "REGRESSION" if worse else "ok"
+        budget = entry.get("budget")
+        if budget is not None and entry["value"] > budget:
+            worse = True
+            status = f"OVER BUDGET ({budget})"
+        if worse:
+            regressions.append(name)
+        lines.append(f"{name:<40}{base['value']:>12.2f}{entry['value']:>12.2f}{change * 100:>8.1f}%  {status}  ({entry['unit']})")
+    for name in sorted(set(current.get("metrics", {})) - set(baseline.get("metrics", {}))):
+        entry = current["metrics"][name]
+        status = "new"
+        if entry.get("budget") is not None and entry["value"] > entry["budget"]:
+            regressions.append(name)
+            status = f"OVER BUDGET ({entry['budget']})"
+        lines.append(f"{name:<40}{'-':>12}{entry['value']:>12.2f}{'':>9}  {status}")
+    for name, reason in sorted(current.get("skipped", {}).items()):
+        lines.append(f"{name:<40}{'':>33}  skipped ({reason})")
+    return regressions, lines
+
+
+def load_results(path):
+    """Reads a results/baseline JSON file."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(results, path):
+    """Writes results as JSON, creating the directory if needed."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run offline benchmarks and check them against a baseline.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks and print or save the results")
+    run_parser.add_argument("--output", help="Write results JSON to this file")
+    run_parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="Run only this benchmark")
+    run_parser.add_argument("--quick", action="store_true", help="Fewer iterations (noisier)")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    check_parser = subparsers.add_parser("check", help="Run benchmarks and compare against the baseline")
+    check_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    check_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    check_parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS))
+    check_parser.add_argument("--quick", action="store_true")
+    check_parser.add_argument("--output", help="Also write the new results to this file")
+
+    subparsers.add_parser("list", help="List the benchmarks")
+
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name, function in BENCHMARKS.items():
+            print(f"{name:<24}{function.__doc__}")
+        sys.exit(0)
+
+    if args.command == "run":
+        results = run_benchmarks(args.only, args.quick)
+        if args.output:
+            save_results(results, args.output)
+            print(f"Results written to {args.output}", file=sys.stderr)
+        else:
+            print(json.dumps(results, indent=2, sort_keys=True))
+        sys.exit(0)
+
+    if args.command == "compare":
+        baseline, current = load_results(args.baseline), load_results(args.current)
+    else:
+        baseline = load_results(args.baseline)
+        current = run_benchmarks(args.only, args.quick)
+        if args.output:
+            save_results(current, args.output)
+        if args.only:
+            prefixes = tuple(f"{name}." for name in args.only)
+            baseline = {**baseline, "metrics": {k: v for k, v in baseline["metrics"].items() if k.startswith(prefixes)}}
+
+    regressions, report = compare_results(baseline, current, args.threshold)
+    print("\n".join(report))
+    if regressions:
+        print(f"\nFAIL: {len(regressions)} metric(s) regressed by more than the threshold: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nOK: no regressions beyond the threshold.")
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+In-process DNS stub resolver built on dns_wire (no dig, no dnspython).
+
+query() sends one question to one server: UDP with EDNS first, then TCP if
+the answer comes back truncated. Resolver adds what bulk lookups need: a
+thread-safe answer cache that honours record TTLs (and the SOA minimum for
+negative answers), coalescing of identical lookups that are in flight at the
+same time, and resolve_many() for running many lookups concurrently.
+
+Example:
+    resolver = Resolver()  # system resolvers, or e.g. Resolver(["1.1.1.1", "127.0.0.1:5353"])
+    answer = resolver.lookup("www.example.com", "A")
+    print(answer.rcode_name, answer.values, answer.ttl)
+"""
+
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import dns_wire
+
+DEFAULT_SERVERS = ("1.1.1.1", "8.8.8.8")  # used when /etc/resolv.conf lists no servers
+DEFAULT_TIMEOUT = 3.0
+RESOLV_CONF = "/etc/resolv.conf"
+
+
+class DnsError(Exception):
+    """Raised when a DNS server cannot be queried or sends an unusable answer."""
+
+
+class DnsTimeout(DnsError):
+    """Raised when a DNS server does not answer in time."""
+
+
+def parse_server(server):
+    """
+    Parses a server spec into (ip, port).
+
+    Accepts "1.1.1.1", "127.0.0.1:5353", "[::1]:5353", "::1" or an (ip, port) tuple.
+    """
+    if isinstance(server, (tuple, list)):
+        return server[0], int(server[1])
+    if server.startswith("["):
+        host, _, port = server[1:].partition("]")
+        return host, int(port.lstrip(":") or 53)
+    if server.count(":") == 1:
+        host, port = server.split(":")
+        return host, int(port)
+    return server, 53
+
+
+def system_servers(path=RESOLV_CONF):
+    """Returns the nameservers from resolv.conf, or DEFAULT_SERVERS if there are none."""
+    servers = []
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2 and fields[0] == "nameserver":
+                    servers.append(fields[1].split("%")[0])  # drop IPv6 zone index
+    except OSError:
+        pass
+    return servers or list(DEFAULT_SERVERS)
+
+
+def _family(ip):
+    return socket.AF_INET6 if ":" in ip else socket.AF_INET
+
+
+def _udp_exchange(message, query_id, ip, port, timeout):
+    """Sends a query over UDP and returns the first reply with a matching ID."""
+    with socket.socket(_family(ip), socket.SOCK_DGRAM) as sock:
+        sock.connect((ip, port))  # a connected socket drops datagrams from other sources
+        sock.send(message)
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DnsTimeout(f"No reply from {ip}:{port} within {timeout}s")
+            sock.settimeout(remaining)
+            try:
+                data = sock.recv(65535)
+            except socket.timeout:
+                raise DnsTimeout(f"No reply from {ip}:{port} within {timeout}s")
+            except OSError as e:
+                raise DnsError(f"{ip}:{port}: {e}")
+            if len(data) >= 2 and struct.unpack_from("!H", data)[0] == query_id:
+                return data
+
+
+def _tcp_exchange(message, ip, port, timeout):
+    """Sends a query over TCP (2-byte length prefix) and returns the reply."""
+    try:
+        with socket.create_connection((ip, port), timeout=timeout) as sock:
+            sock.sendall(struct.pack("!H", len(message)) + message)
+            header = dns_wire.recv_exact(sock, 2)
+            data = dns_wire.recv_exact(sock, struct.unpack("!H", header)[0]) if header else b""
+    except socket.timeout:
+        raise DnsTimeout(f"No TCP reply from {ip}:{port} within {timeout}s")
+    except OSError as e:
+        raise DnsError(f"{ip}:{port}: {e}")
+    if not data:
+        raise DnsError(f"{ip}:{port} closed the TCP connection without an answer")
+    return data
+
+
+def query(server, name, record_type="A", timeout=DEFAULT_TIMEOUT, recursion_desired=True,
+          edns=True, options=(), tcp=False):
+    """
+    Sends one question to one DNS server.
+
+    Args:
+        server (str or tuple): "ip", "ip:port" or (ip, port).
+        name (str): Name to query.
+        record_type (str): Record type, e.g. 'A', 'NS', 'CNAME'.
+        timeout (float): Seconds to wait for each exchange.
+        recursion_desired (bool): Set the RD flag.
+        edns (bool): Send an EDNS(0) OPT record (allows UDP answers over 512 bytes).
+        options (iterable): EDNS options as (code, data) pairs (implies edns).
+        tcp (bool): Skip UDP and query over TCP directly.
+
+    Returns:
+        dict: The parsed response (see dns_wire.parse_message) plus 'elapsed'
+              (seconds) and 'transport' ('udp' or 'tcp').
+
+    Raises:
+        DnsTimeout: If the server does not answer in time.
+        DnsError: On network errors or a malformed or mismatched answer.
+    """
+    ip, port = parse_server(server)
+    additional, additional_count = b"", 0
+    if edns or options:
+        additional, additional_count = dns_wire.encode_opt_record(options=options), 1
+    message, query_id = dns_wire.build_query(name, record_type, recursion_desired=recursion_desired,
+                                             additional=additional, additional_count=additional_count)
+    start = time.perf_counter()
+    transport = "tcp" if tcp else "udp"
+    try:
+        if tcp:
+            data = _tcp_exchange(message, ip, port, timeout)
+        else:
+            data = _udp_exchange(message, query_id, ip, port, timeout)
+    except (OSError, ValueError) as e:  # unreachable network, bad address, ...
+        raise DnsError(f"{ip}:{port}: {e}")
+    try:
+        response = dns_wire.parse_message(data)
+        if response["truncated"] and not tcp:
+            transport = "tcp"
+            response = dns_wire.parse_message(_tcp_exchange(message, ip, port, timeout))
+    except dns_wire.DnsFormatError as e:
+        raise DnsError(f"Malformed answer from {ip}:{port}: {e}")
+    if response["id"] != query_id or not response["questions"] or \
+            dns_wire.normalize_name(response["questions"][0][0]) != dns_wire.normalize_name(name):
+        raise DnsError(f"Answer from {ip}:{port} does not match the question")
+    response["elapsed"] = time.perf_counter() - start
+    response["transport"] = transport
+    return response
+
+
+def format_short(record):
+    """Formats an answer record like `dig +short` (names end with a dot, TXT is quoted)."""
+    data = record["data"]
+    if isinstance(data, bytes):
+        return data.hex()
+    if record["type"] in ("NS", "CNAME", "PTR", "MX"):
+        return data + "."
+    if record["type"] == "TXT":
+        return '"' + data.replace('"', '\\"') + '"'
+    return data
+
+
+class Answer:
+    """
+    Result of one resolver lookup.
+
+    Attributes:
+        name (str): Queried name (normalised).
+        type (str): Queried type.
+        rcode (int or None): Response code, None if no server answered.
+        records (list): Answer-section records (dicts from dns_wire.parse_message), including CNAMEs.
+        ttl (int): Seconds the answer may be cached.
+        error (str or None): Why the lookup failed (timeout, network error, ...).
+        server (str or None): The server that answered.
+    """
+
+    __slots__ = ("name", "type", "rcode", "records", "ttl", "error", "server", "expires")
+
+    def __init__(self, name, record_type, rcode=None, records=(), ttl=0, error=None, server=None):
+        self.name = name
+        self.type = record_type
+        self.rcode = rcode
+        self.records = list(records)
+        self.ttl = ttl
+        self.error = error
+        self.server = server
+        self.expires = time.monotonic() + ttl
+
+    @property
+    def rcode_name(self):
+        """'NOERROR', 'NXDOMAIN', ... or 'ERROR' if no server answered."""
+        return dns_wire.RCODE_NAMES.get(self.rcode, str(self.rcode)) if self.rcode is not None else "ERROR"
+
+    @property
+    def nxdomain(self):
+        """True if the name does not exist."""
+        return self.rcode == dns_wire.RCODE_NXDOMAIN
+
+    @property
+    def values(self):
+        """Data of the answer records of the queried type (CNAME chain entries left out)."""
+        return [r["data"] for r in self.records if r["type"] == self.type]
+
+    def __repr__(self):
+        return f"Answer({self.name!r}, {self.type!r}, {self.rcode_name}, {self.values!r}, ttl={self.ttl})"
+
+
+def _negative_ttl(response, default):
+    """TTL for caching an answer without data: the SOA minimum (RFC 2308), else the default."""
+    for record in response["authority"]:
+        if record["type"] == "SOA" and isinstance(record["data"], str):
+            fields = record["data"].split()
+            if len(fields) == 7 and fields[6].isdigit():
+                return min(record["ttl"], int(fields[6]))
+    return default
+
+
+class Resolver:
+    """
+    Thread-safe caching stub resolver over one or more recursive servers.
+
+    Args:
+        servers (list, optional): Server specs (see parse_server), tried in order on failure
+            (default: the system resolvers from /etc/resolv.conf).
+        timeout (float): Seconds per query.
+        negative_ttl (int): Cache time for answers without data when no SOA is given.
+        max_ttl (int): Upper bound for cache times.
+        cache (bool): Cache answers (errors are never cached).
+    """
+
+    def __init__(self, servers=None, timeout=DEFAULT_TIMEOUT, negative_ttl=60, max_ttl=86400, cache=True):
+        self.servers = [parse_server(server) for server in (servers or system_servers())]
+        self.timeout = timeout
+        self.negative_ttl = negative_ttl
+        self.max_ttl = max_ttl
+        self.cache_enabled = cache
+        self._cache = {}        # (name, type) -> Answer
+        self._inflight = {}     # (name, type) -> [Event, Answer] of a lookup in progress
+        self._lock = threading.Lock()
+        self.queries_sent = 0
+        self.cache_hits = 0
+
+    def lookup(self, name, record_type="A"):
+        """
+        Resolves a name, from the cache when an unexpired answer exists.
+
+        Concurrent lookups of the same name and type share one query.
+
+        Returns:
+            Answer
+        """
+        key = (dns_wire.normalize_name(name), record_type.upper())
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached.expires > time.monotonic():
+                self.cache_hits += 1
+                return cached
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = [threading.Event(), None]
+            else:
+                self.cache_hits += 1
+        if not owner:
+            pending[0].wait()  # another thread is resolving this key; share its answer
+            return pending[1]
+
+        try:
+            answer = pending[1] = self._resolve(*key)
+            if self.cache_enabled and answer.rcode is not None:
+                with self._lock:
+                    self._cache[key] = answer
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            pending[0].set()
+        return answer
+
+    def _resolve(self, name, record_type):
+        error = None
+        for server in self.servers:
+            with self._lock:
+                self.queries_sent += 1
+            try:
+                response = query(server, name, record_type, timeout=self.timeout)
+            except DnsError as e:
+                error = str(e)
+                continue
+            if response["rcode"] in (dns_wire.RCODE_SERVFAIL, dns_wire.RCODE_REFUSED) and server != self.servers[-1]:
+                error = f"{dns_wire.RCODE_NAMES[response['rcode']]} from {server[0]}"
+                continue
+            records = [r for r in response["answers"] if r["type"] != "OPT"]
+            if records:
+                ttl = min(r["ttl"] for r in records)
+            else:
+                ttl = _negative_ttl(response, self.negative_ttl)
+            return Answer(name, record_type, response["rcode"], records, min(ttl, self.max_ttl),
+                          server=f"{server[0]}:{server[1]}")
+        return Answer(name, record_type, error=error or "no servers")
+
+    def resolve_many(self, queries, concurrency=32):
+        """
+        Resolves many (name, type) pairs concurrently; duplicates are looked up once.
+
+        Returns:
+            dict: (normalised name, TYPE) -> Answer
+        """
+        keys = list(dict.fromkeys((dns_wire.normalize_name(name), record_type.upper())
+                                  for name, record_type in queries))
+        if not keys:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(keys)))) as executor:
+            answers = executor.map(lambda key: self.lookup(*key), keys)
+            return dict(zip(keys, answers))
+
+    def clear_cache(self):
+        """Drops all cached answers."""
+        with self._lock:
+            self._cache.clear()
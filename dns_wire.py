@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Minimal DNS wire-format (RFC 1035) encoding and decoding.
+
+Enough of the protocol for the local stub DNS server and in-process queries:
+headers, questions, and resource records of the common types (A, AAAA, NS,
+CNAME, PTR, MX, TXT, SOA). Unknown record types are kept as raw bytes. EDNS OPT
+records and the Client Subnet option (RFC 7871) can be encoded and decoded.
+"""
+
+import ipaddress
+import random
+import socket
+import struct
+
+# Record types by name and number
+TYPES = {
+    "A": 1, "NS": 2, "CNAME": 5, "SOA": 6, "PTR": 12, "MX": 15, "TXT": 16,
+    "AAAA": 28, "SRV": 33, "OPT": 41, "CAA": 257, "ANY": 255,
+}
+TYPE_NAMES = {number: name for name, number in TYPES.items()}
+
+CLASS_IN = 1
+
+# Response codes
+RCODE_NOERROR = 0
+RCODE_FORMERR = 1
+RCODE_SERVFAIL = 2
+RCODE_NXDOMAIN = 3
+RCODE_REFUSED = 5
+RCODE_NAMES = {0: "NOERROR", 1: "FORMERR", 2: "SERVFAIL", 3: "NXDOMAIN", 4: "NOTIMP", 5: "REFUSED"}
+
+# Header flag bits
+FLAG_QR = 0x8000
+FLAG_AA = 0x0400
+FLAG_TC = 0x0200
+FLAG_RD = 0x0100
+FLAG_RA = 0x0080
+
+MAX_UDP_PAYLOAD = 512  # without EDNS
+EDNS_UDP_PAYLOAD = 1232  # advertised with EDNS; avoids IP fragmentation (DNS flag day 2020)
+EDNS_CLIENT_SUBNET = 8   # EDNS option code of Client Subnet (RFC 7871)
+
+
+class DnsFormatError(ValueError):
+    """Raised when a DNS message cannot be parsed."""
+
+
+def type_number(record_type):
+    """Returns the numeric type for 'A', 'NS', ... or passes numbers through."""
+    if isinstance(record_type, int):
+        return record_type
+    try:
+        return TYPES[record_type.upper()]
+    except KeyError:
+        raise ValueError(f"Unsupported DNS record type: {record_type}")
+
+
+def normalize_name(name):
+    """Lower-cases a domain name and strips the trailing dot."""
+    return name.rstrip(".").lower()
+
+
+def encode_name(name):
+    """Encodes a domain name as a sequence of length-prefixed labels (no compression)."""
+    name = name.rstrip(".")
+    out = bytearray()
+    if name:
+        for label in name.split("."):
+            encoded = label.encode("idna") if not label.isascii() else label.encode("ascii")
+            if not 0 < len(encoded) < 64:
+                raise ValueError(f"Invalid label in domain name: {name!r}")
+            out.append(len(encoded))
+            out += encoded
+    out.append(0)
+    return bytes(out)
+
+
+def decode_name(data, offset):
+    """
+    Decodes a possibly compressed domain name.
+
+    Args:
+        data (bytes): The whole DNS message.
+        offset (int): Where the name starts.
+
+    Returns:
+        tuple: (name without trailing dot, offset just past the name)
+    """
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        if offset >= len(data):
+            raise DnsFormatError("Name runs past end of message")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(data):
+                raise DnsFormatError("Truncated compression pointer")
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            jumps += 1
+            if jumps > 64:
+                raise DnsFormatError("Compression loop")
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(data[offset:offset + length].decode("ascii", "replace"))
+        offset += length
+    return ".".join(labels), (end if end is not None else offset)
+
+
+def encode_rdata(record_type, value):
+    """
+    Encodes record data from its presentation form.
+
+    Args:
+        record_type (str): Record type name.
+        value: str for most types; (preference, exchange) or "10 mx.example.com" for MX;
+               bytes are passed through unchanged.
+
+    Returns:
+        bytes: The RDATA.
+    """
+    if isinstance(value, bytes):
+        return value
+    record_type = record_type.upper()
+    if record_type == "A":
+        return socket.inet_pton(socket.AF_INET, value)
+    if record_type == "AAAA":
+        return socket.inet_pton(socket.AF_INET6, value)
+    if record_type in ("NS", "CNAME", "PTR"):
+        return encode_name(value)
+    if record_type == "MX":
+        if isinstance(value, str):
+            preference, exchange = value.split(None, 1)
+        else:
+            preference, exchange = value
+        return struct.pack("!H", int(preference)) + encode_name(exchange)
+    if record_type == "TXT":
+        raw = value.encode("utf-8")
+        chunks = [raw[i:i + 255] for i in range(0, len(raw), 255)] or [b""]
+        return b"".join(bytes([len(chunk)]) + chunk for chunk in chunks)
+    raise ValueError(f"Cannot encode RDATA for type {record_type}")
+
+
+def decode_rdata(record_type, data, offset, length):
+    """Decodes RDATA into a presentation string (or raw bytes for unknown types)."""
+    end = offset + length
+    if record_type == TYPES["A"] and length == 4:
+        return socket.inet_ntop(socket.AF_INET, data[offset:end])
+    if record_type == TYPES["AAAA"] and length == 16:
+        return socket.inet_ntop(socket.AF_INET6, data[offset:end])
+    if record_type in (TYPES["NS"], TYPES["CNAME"], TYPES["PTR"]):
+        return decode_name(data, offset)[0]
+    if record_type == TYPES["MX"]:
+        preference = struct.unpack_from("!H", data, offset)[0]
+        return f"{preference} {decode_name(data, offset + 2)[0]}"
+    if record_type == TYPES["TXT"]:
+        parts = []
+        pos = offset
+        while pos < end:
+            size = data[pos]
+            parts.append(data[pos + 1:pos + 1 + size].decode("utf-8", "replace"))
+            pos += 1 + size
+        return "".join(parts)
+    if record_type == TYPES["SOA"]:
+        mname, pos = decode_name(data, offset)
+        rname, pos = decode_name(data, pos)
+        serial, refresh, retry, expire, minimum = struct.unpack_from("!IIIII", data, pos)
+        return f"{mname} {rname} {serial} {refresh} {retry} {expire} {minimum}"
+    return bytes(data[offset:end])
+
+
+def build_query(name, record_type="A", query_id=None, recursion_desired=True, additional=b"", additional_count=0):
+    """
+    Builds a DNS query message.
+
+    Args:
+        name (str): Name to query.
+        record_type (str or int): Record type.
+        query_id (int, optional): Message ID (random if not given).
+        recursion_desired (bool): Set the RD flag.
+        additional (bytes): Pre-encoded additional records (e.g. an EDNS OPT record).
+        additional_count (int): Number of records in `additional`.
+
+    Returns:
+        tuple: (message bytes, query id)
+    """
+    if query_id is None:
+        query_id = random.randint(0, 0xFFFF)
+    flags = FLAG_RD if recursion_desired else 0
+    header = struct.pack("!HHHHHH", query_id, flags, 1, 0, 0, additional_count)
+    question = encode_name(name) + struct.pack("!HH", type_number(record_type), CLASS_IN)
+    return header + question + additional, query_id
+
+
+def encode_opt_record(udp_payload=EDNS_UDP_PAYLOAD, options=()):
+    """
+    Encodes an EDNS(0) OPT pseudo-record (RFC 6891) for the additional section.
+
+    Args:
+        udp_payload (int): Largest UDP response the sender accepts.
+        options (iterable): (option code, option data bytes) pairs.
+
+    Returns:
+        bytes: The encoded record (count it in additional_count).
+    """
+    rdata = b"".join(struct.pack("!HH", code, len(data)) + data for code, data in options)
+    return b"\x00" + struct.pack("!HHIH", TYPES["OPT"], udp_payload, 0, len(rdata)) + rdata
+
+
+def parse_edns_options(rdata):
+    """
+    Splits OPT record data into options.
+
+    Returns:
+        list: (option code, option data bytes) pairs.
+
+    Raises:
+        DnsFormatError: If an option runs past the end of the data.
+    """
+    options = []
+    offset = 0
+    while offset + 4 <= len(rdata):
+        code, length = struct.unpack_from("!HH", rdata, offset)
+        offset += 4
+        if offset + length > len(rdata):
+            raise DnsFormatError("Truncated EDNS option")
+        options.append((code, bytes(rdata[offset:offset + length])))
+        offset += length
+    return options
+
+
+def edns_options(message):
+    """Returns the EDNS options of a parsed message as (code, data) pairs (empty without an OPT record)."""
+    for record in message["additional"]:
+        if record["type"] == "OPT":
+            return parse_edns_options(record["data"])
+    return []
+
+
+def encode_client_subnet(subnet, scope_prefix=0):
+    """
+    Encodes the data of an EDNS Client Subnet option (RFC 7871).
+
+    Args:
+        subnet (str): Client network, e.g. '198.51.100.0/24' or '2001:db8::/56'.
+        scope_prefix (int): Scope prefix length (0 in queries; set by the server in responses).
+
+    Returns:
+        tuple: (EDNS_CLIENT_SUBNET, option data) for encode_opt_record(options=...).
+    """
+    network = ipaddress.ip_network(subnet, strict=False)
+    family = 1 if network.version == 4 else 2
+    address = network.network_address.packed[:(network.prefixlen + 7) // 8]
+    return EDNS_CLIENT_SUBNET, struct.pack("!HBB", family, network.prefixlen, scope_prefix) + address
+
+
+def decode_client_subnet(data):
+    """
+    Decodes the data of an EDNS Client Subnet option.
+
+    Returns:
+        tuple: (ipaddress network, scope prefix length)
+
+    Raises:
+        DnsFormatError: If the option is malformed.
+    """
+    if len(data) < 4:
+        raise DnsFormatError("Client Subnet option too short")
+    family, source_prefix, scope_prefix = struct.unpack_from("!HBB", data)
+    size = {1: 4, 2: 16}.get(family)
+    if size is None or source_prefix > size * 8 or len(data) - 4 > size:
+        raise DnsFormatError(f"Invalid Client Subnet option (family {family}, prefix {source_prefix})")
+    address = data[4:].ljust(size, b"\x00")
+    try:
+        network = ipaddress.ip_network((address, source_prefix), strict=False)
+    except ValueError as e:
+        raise DnsFormatError(f"Invalid Client Subnet option: {e}")
+    return network, scope_prefix
+
+
+def client_subnet(message):
+    """Returns (network, scope prefix) from a parsed message's Client Subnet option, or None."""
+    for code, data in edns_options(message):
+        if code == EDNS_CLIENT_SUBNET:
+            return decode_client_subnet(data)
+    return None
+
+
+def encode_record(name, record_type, ttl, rdata, record_class=CLASS_IN):
+    """Encodes one resource record (RDATA already encoded)."""
+    return encode_name(name) + struct.pack("!HHIH", type_number(record_type), record_class, ttl, len(rdata)) + rdata
+
+
+def build_response(query, answers=(), rcode=RCODE_NOERROR, authoritative=True, truncated=False,
+                   additional=b"", additional_count=0):
+    """
+    Builds a response to a parsed query.
+
+    Args:
+        query (dict): Result of parse_message() for the query.
+        answers (list): (name, type, ttl, value) tuples; value in presentation form.
+        rcode (int): Response code.
+        authoritative (bool): Set the AA flag.
+        truncated (bool): Set the TC flag (answers are dropped).
+        additional (bytes): Pre-encoded additional records.
+        additional_count (int): Number of records in `additional`.
+
+    Returns:
+        bytes: The response message.
+    """
+    flags = FLAG_QR | FLAG_RA | (query["flags"] & FLAG_RD) | (rcode & 0xF)
+    if authoritative:
+        flags |= FLAG_AA
+    if truncated:
+        flags |= FLAG_TC
+        answers = ()
+    body = bytearray()
+    for qname, qtype, qclass in query["questions"]:
+        body += encode_name(qname) + struct.pack("!HH", qtype, qclass)
+    for name, record_type, ttl, value in answers:
+        body += encode_record(name, record_type, ttl, encode_rdata(record_type, value))
+    header = struct.pack("!HHHHHH", query["id"], flags, len(query["questions"]), len(answers), 0, additional_count)
+    return header + bytes(body) + additional
+
+
+def _parse_records(data, offset, count):
+    records = []
+    for _ in range(count):
+        name, offset = decode_name(data, offset)
+        if offset + 10 > len(data):
+            raise DnsFormatError("Truncated resource record")
+        record_type, record_class, ttl, length = struct.unpack_from("!HHIH", data, offset)
+        offset += 10
+        if offset + length > len(data):
+            raise DnsFormatError("Truncated RDATA")
+        if record_type == TYPES["OPT"]:
+            value = bytes(data[offset:offset + length])
+        else:
+            value = decode_rdata(record_type, data, offset, length)
+        records.append({
+            "name": name,
+            "type": TYPE_NAMES.get(record_type, str(record_type)),
+            "class": record_class,
+            "ttl": ttl,
+            "data": value,
+        })
+        offset += length
+    return records, offset
+
+
+def parse_message(data):
+    """
+    Parses a DNS message.
+
+    Args:
+        data (bytes): The raw message.
+
+    Returns:
+        dict: id, flags, rcode, truncated, questions [(name, type, class)],
+              answers/authority/additional [{name, type, class, ttl, data}]
+
+    Raises:
+        DnsFormatError: If the message is malformed.
+    """
+    if len(data) < 12:
+        raise DnsFormatError("Message shorter than a DNS header")
+    query_id, flags, qdcount, ancount, nscount, arcount = struct.unpack_from("!HHHHHH", data, 0)
+    offset = 12
+    questions = []
+    for _ in range(qdcount):
+        name, offset = decode_name(data, offset)
+        if offset + 4 > len(data):
+            raise DnsFormatError("Truncated question")
+        qtype, qclass = struct.unpack_from("!HH", data, offset)
+        offset += 4
+        questions.append((name, qtype, qclass))
+    answers, offset = _parse_records(data, offset, ancount)
+    authority, offset = _parse_records(data, offset, nscount)
+    additional, offset = _parse_records(data, offset, arcount)
+    return {
+        "id": query_id,
+        "flags": flags,
+        "rcode": flags & 0xF,
+        "truncated": bool(flags & FLAG_TC),
+        "questions": questions,
+        "answers": answers,
+        "authority": authority,
+        "additional": additional,
+    }
+
+
+def recv_exact(conn, size):
+    """Reads exactly size bytes from a stream socket, or returns b'' on EOF."""
+    chunks = []
+    while size:
+        chunk = conn.recv(size)
+        if not chunk:
+            return b""
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Local stand-in for the Porkbun API v3, for exercising the client without real
+credentials: load tests, benchmarks and retry/rate-limit behaviour.
+
+Implements the endpoints the scripts use (ping, domain/listAll with paging,
+dns/create, dns/retrieve, dns/retrieveByNameType, dns/delete, domain/getNs,
+domain/updateNs, domain/checkDomain, domain/getUrlForwarding, domain/addUrlForward,
+domain/deleteUrlForward, ssl/retrieve, pricing/get) on top of an in-memory zone store. Response bodies follow the
+shapes documented by Porkbun. Latency, error injection and rate limiting are
+configurable. checkDomain has its own, much stricter limit (1 check per 10 s
+per key by default), reported in the `limits` object of each answer.
+
+Usage: ./fake_porkbun_server.py [--port 8080] [--domains 50] [--records 20]
+                                [--latency lognormal:3.0,0.5] [--error-rate 0.01]
+                                [--rate-limit 10 --burst 20] [--accounts 2]
+                                [--check-limit 1 --check-window 10]
+Then point the client at it:
+    export PORKBUN_API_URL=http://127.0.0.1:8080/api/json/v3
+    export PORKBUN_API_KEY=pk1_fake PORKBUN_SECRET_KEY=sk1_fake
+"""
+
+import argparse
+import collections
+import hashlib
+import json
+import math
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+API_PREFIX = "/api/json/v3"
+FAKE_API_KEY = "pk1_fake"
+FAKE_SECRET_KEY = "sk1_fake"
+LIST_ALL_PAGE_SIZE = 1000  # Porkbun returns at most 1000 domains per listAll call
+DEFAULT_NS = ["curitiba.ns.porkbun.com", "fortaleza.ns.porkbun.com",
+              "maceio.ns.porkbun.com", "salvador.ns.porkbun.com"]
+
+
+def build_pricing(num_tlds=900, seed=0):
+    """
+    Builds a /pricing/get style catalog: the seeded TLDs plus synthetic ones.
+
+    Returns:
+        dict: tld -> {"registration", "renewal", "transfer", "coupons"} with prices as strings.
+    """
+    rng = random.Random(seed)
+    tlds = ["com", "net", "org", "io", "dev", "app", "xyz"]
+    tlds += [f"tld{index:04d}" for index in range(max(num_tlds - len(tlds), 0))]
+    pricing = {}
+    for tld in tlds:
+        renewal = round(rng.uniform(2, 80), 2)
+        pricing[tld] = {
+            "registration": f"{round(renewal * rng.uniform(0.3, 1.0), 2):.2f}",
+            "renewal": f"{renewal:.2f}",
+            "transfer": f"{renewal:.2f}",
+            "coupons": [],
+        }
+    return pricing
+
+
+class ApiError(Exception):
+    """An error returned to the client as {"status": "ERROR", "message": ...}."""
+
+    def __init__(self, message, http_status=400):
+        super().__init__(message)
+        self.message = message
+        self.http_status = http_status
+
+
+class ZoneStore:
+    """Thread-safe in-memory store of domains, their DNS records and nameservers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._domains = {}      # domain -> {"info": dict, "records": {id: record}, "ns": list, "forwards": {id: forward}}
+        self._next_id = 100000000
+        self._next_forward_id = 20000000
+
+    def add_domain(self, domain, records=(), ns=None, account=FAKE_API_KEY, forwards=()):
+        """Adds a domain owned by account (an API key) with optional records (dicts with name/type/content/ttl/prio)
+        and URL forwards (dicts with subdomain/location/type/includePath/wildcard)."""
+        tld = domain.rsplit(".", 1)[-1]
+        with self._lock:
+            self._domains[domain] = {
+                "account": account,
+                "info": {
+                    "domain": domain, "status": "ACTIVE", "tld": tld,
+                    "createDate": "2020-01-01 00:00:00", "expireDate": "2030-01-01 00:00:00",
+                    "securityLock": "1", "whoisPrivacy": "1", "autoRenew": 1, "notLocal": 0,
+                },
+                "records": {},
+                "ns": list(ns or DEFAULT_NS),
+                "forwards": {},
+                "ssl_serial": 1,
+            }
+        for record in records:
+            self.create_record(domain, record)
+        for forward in forwards:
+            self.add_forward(domain, forward)
+
+    def seed(self, num_domains, records_per_domain, seed=0, accounts=(FAKE_API_KEY,)):
+        """Fills the store with synthetic domains and records, spread round-robin over accounts (API keys)."""
+        rng = random.Random(seed)
+        tlds = ["com", "net", "org", "io", "dev", "app", "xyz"]
+        for index in range(num_domains):
+            domain = f"example{index:05d}.{tlds[index % len(tlds)]}"
+            records = [{"name": "", "type": "A", "content": f"192.0.2.{index % 254 + 1}", "ttl": "600"}]
+            for r in range(max(records_per_domain - 1, 0)):
+                kind = rng.choice(["A", "CNAME", "TXT", "MX"])
+                if kind == "A":
+                    records.append({"name": f"host{r}", "type": "A", "content": f"198.51.100.{r % 254 + 1}", "ttl": "600"})
+                elif kind == "CNAME":
+                    records.append({"name": f"alias{r}", "type": "CNAME", "content": f"target{r}.example.net", "ttl": "3600"})
+                elif kind == "TXT":
+                    records.append({"name": f"_txt{r}", "type": "TXT", "content": f"v=spf1 include:_spf{r}.example.net ~all", "ttl": "300"})
+                else:
+                    records.append({"name": "", "type": "MX", "content": f"mx{r}.example.net", "ttl": "3600", "prio": "10"})
+            forwards = []
+            if index % 2 == 0:  # every other domain forwards its apex
+                forwards.append({"subdomain": "", "location": f"https://www.example{index:05d}.net",
+                                 "type": "permanent", "includePath": "no", "wildcard": "yes"})
+            self.add_domain(domain, records, account=accounts[index % len(accounts)], forwards=forwards)
+
+    def _zone(self, domain):
+        zone = self._domains.get(domain)
+        if zone is None:
+            raise ApiError(f"Invalid domain. ({domain})")
+        return zone
+
+    def owner(self, domain):
+        """Returns the account (API key) that owns a domain, or None if it does not exist."""
+        with self._lock:
+            zone = self._domains.get(domain)
+            return zone["account"] if zone else None
+
+    def list_domains(self, start=0, account=None):
+        """Returns one page of domain info dicts starting at the given offset (only account's, if given)."""
+        with self._lock:
+            names = sorted(name for name, zone in self._domains.items() if account in (None, zone["account"]))
+            page = names[start:start + LIST_ALL_PAGE_SIZE]
+            return [dict(self._domains[name]["info"]) for name in page]
+
+    def create_record(self, domain, payload):
+        """Creates a record and returns its ID."""
+        record_type = str(payload.get("type", "")).upper()
+        if not record_type or "content" not in payload:
+            raise ApiError("Create error: type and content are required.")
+        name = str(payload.get("name", "")).strip(".")
+        with self._lock:
+            zone = self._zone(domain)
+            record_id = str(self._next_id)
+            self._next_id += 1
+            zone["records"][record_id] = {
+                "id": record_id,
+                "name": f"{name}.{domain}" if name else domain,
+                "type": record_type,
+                "content": str(payload["content"]),
+                "ttl": str(payload.get("ttl", "600")),
+                "prio": str(payload.get("prio", "0")),
+                "notes": "",
+            }
+        return int(record_id)
+
+    def edit_record(self, domain, record_id, payload):
+        """Replaces the name, type, content, TTL and priority of a record by ID."""
+        record_type = str(payload.get("type", "")).upper()
+        if not record_type or "content" not in payload:
+            raise ApiError("Edit error: type and content are required.")
+        name = str(payload.get("name", "")).strip(".")
+        with self._lock:
+            records = self._zone(domain)["records"]
+            if record_id not in records:
+                raise ApiError("Edit error: Invalid record ID.")
+            records[record_id].update({
+                "name": f"{name}.{domain}" if name else domain,
+                "type": record_type,
+                "content": str(payload["content"]),
+                "ttl": str(payload.get("ttl", "600")),
+                "prio": str(payload.get("prio", "0")),
+                "notes": str(payload.get("notes", "")),
+            })
+
+    def retrieve(self, domain, record_id=None):
+        """Returns all records of a domain, or the one with the given ID."""
+        with self._lock:
+            records = self._zone(domain)["records"]
+            if record_id is not None:
+                return [dict(records[record_id])] if record_id in records else []
+            return [dict(record) for record in records.values()]
+
+    def retrieve_by_name_type(self, domain, record_type, subdomain=""):
+        """Returns the records matching a type and subdomain."""
+        fqdn = f"{subdomain}.{domain}" if subdomain else domain
+        with self._lock:
+            records = self._zone(domain)["records"].values()
+            return [dict(r) for r in records if r["type"] == record_type.upper() and r["name"] == fqdn]
+
+    def delete_record(self, domain, record_id):
+        """Deletes a record by ID."""
+        with self._lock:
+            records = self._zone(domain)["records"]
+            if record_id not in records:
+                raise ApiError("Delete error: Invalid record ID.")
+            del records[record_id]
+
+    def get_ns(self, domain):
+        """Returns the nameservers of a domain."""
+        with self._lock:
+            return list(self._zone(domain)["ns"])
+
+    def update_ns(self, domain, nameservers):
+        """Replaces the nameservers of a domain."""
+        if not isinstance(nameservers, list) or not nameservers:
+            raise ApiError("Update error: ns must be a non-empty list.")
+        with self._lock:
+            self._zone(domain)["ns"] = [str(ns) for ns in nameservers]
+
+    def get_forwards(self, domain):
+        """Returns the URL forwards of a domain."""
+        with self._lock:
+            return [dict(forward) for forward in self._zone(domain)["forwards"].values()]
+
+    def add_forward(self, domain, payload):
+        """Adds a URL forward; like the real API, a subdomain can only have one."""
+        location = str(payload.get("location", "")).strip()
+        forward_type = str(payload.get("type", "")).lower()
+        if not location or forward_type not in ("temporary", "permanent"):
+            raise ApiError("Forward error: location and type (temporary or permanent) are required.")
+        subdomain = str(payload.get("subdomain", "")).strip(".").lower()
+        with self._lock:
+            forwards = self._zone(domain)["forwards"]
+            if any(forward["subdomain"] == subdomain for forward in forwards.values()):
+                raise ApiError(f"Forward error: a forward for '{subdomain or domain}' already exists.")
+            forward_id = str(self._next_forward_id)
+            self._next_forward_id += 1
+            forwards[forward_id] = {
+                "id": forward_id,
+                "subdomain": subdomain,
+                "location": location,
+                "type": forward_type,
+                "includePath": "yes" if str(payload.get("includePath", "no")).lower() == "yes" else "no",
+                "wildcard": "yes" if str(payload.get("wildcard", "no")).lower() == "yes" else "no",
+            }
+
+    def delete_forward(self, domain, forward_id):
+        """Deletes a URL forward by ID."""
+        with self._lock:
+            forwards = self._zone(domain)["forwards"]
+            if forward_id not in forwards:
+                raise ApiError("Delete error: Invalid forward ID.")
+            del forwards[forward_id]
+
+    def ssl_bundle(self, domain):
+        """Returns a synthetic SSL bundle; its content changes when the certificate is renewed."""
+        with self._lock:
+            serial = self._zone(domain)["ssl_serial"]
+        return {
+            "certificatechain": _fake_pem("CERTIFICATE", f"{domain}/{serial}/leaf", 1200)
+                                + _fake_pem("CERTIFICATE", f"{domain}/{serial}/intermediate", 1100),
+            "privatekey": _fake_pem("PRIVATE KEY", f"{domain}/{serial}/key", 1700),
+            "publickey": _fake_pem("PUBLIC KEY", f"{domain}/{serial}/pub", 450),
+        }
+
+    def renew_certificate(self, domain):
+        """Simulates a certificate renewal: the next /ssl/retrieve returns a new bundle."""
+        with self._lock:
+            self._zone(domain)["ssl_serial"] += 1
+
+
+def _fake_pem(label, seed, size):
+    """Deterministic PEM block of pseudo-random bytes (not a real certificate)."""
+    import base64
+    import hashlib
+
+    data = bytearray()
+    counter = 0
+    while len(data) < size:
+        data += hashlib.sha256(f"{seed}/{counter}".encode("utf-8")).digest()
+        counter += 1
+    encoded = base64.b64encode(bytes(data[:size])).decode("ascii")
+    lines = [encoded[i:i + 64] for i in range(0, len(encoded), 64)]
+    return f"-----BEGIN {label}-----\n" + "\n".join(lines) + f"\n-----END {label}-----\n"
+
+
+class LatencyModel:
+    """
+    Samples artificial response latency in milliseconds from a distribution spec:
+
+        none | fixed:MS | uniform:MIN,MAX | normal:MEAN,STDDEV | lognormal:MU,SIGMA
+
+    (lognormal parameters are of the underlying normal distribution of ln(ms)).
+    """
+
+    def __init__(self, spec="none", seed=None):
+        self.spec = spec
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",")] if params else []
+        expected = {"none": 0, "fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(self.params) != expected[kind]:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+
+    def sample_ms(self):
+        """Returns one latency sample in milliseconds (never negative)."""
+        with self._lock:
+            if self.kind == "fixed":
+                value = self.params[0]
+            elif self.kind == "uniform":
+                value = self._rng.uniform(*self.params)
+            elif self.kind == "normal":
+                value = self._rng.gauss(*self.params)
+            elif self.kind == "lognormal":
+                value = math.exp(self._rng.gauss(*self.params))
+            else:
+                value = 0.0
+        return max(value, 0.0)
+
+
+class RateLimiter:
+    """Token bucket per API key: `rate` requests per second with bursts up to `burst`."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst if burst else max(rate, 1)
+        self._buckets = {}  # key -> (tokens, last refill time)
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        """Takes a token for the key; returns False if none are available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+        return allowed
+
+
+class WindowLimiter:
+    """Sliding window per API key: at most `limit` calls within any `window` seconds."""
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self._calls = {}  # key -> deque of call times
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        """Records a call for the key; returns (allowed, calls used in the current window)."""
+        now = time.monotonic()
+        with self._lock:
+            calls = self._calls.setdefault(key, collections.deque())
+            while calls and calls[0] <= now - self.window:
+                calls.popleft()
+            if len(calls) >= self.limit:
+                return False, len(calls)
+            calls.append(now)
+            return True, len(calls)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    # The default accept queue of 5 overflows when many clients open connections at
+    # once; the dropped SYNs are retried after a second and stall load tests.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class FakePorkbunServer:
+    """
+    Runs the stand-in API on a background thread.
+
+    Example:
+        server = FakePorkbunServer(port=0)
+        server.store.seed(10, 5)
+        server.start()
+        ... requests to server.api_url ...
+        server.stop()
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency="none", error_rate=0.0,
+                 error_status=500, drop_rate=0.0, rate_limit=0.0, burst=None,
+                 api_key=FAKE_API_KEY, secret_key=FAKE_SECRET_KEY, seed=None, accounts=1,
+                 check_limit=1, check_window=10.0):
+        self.store = ZoneStore()
+        self.pricing = build_pricing()
+        self.latency = LatencyModel(latency, seed)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.drop_rate = drop_rate
+        self.rate_limiter = RateLimiter(rate_limit, burst) if rate_limit > 0 else None
+        self.check_limiter = WindowLimiter(check_limit, check_window)
+        self.checks_rejected = 0
+        self.credentials = {api_key: secret_key}
+        for number in range(2, accounts + 1):  # extra accounts pk2_fake/sk2_fake, pk3_fake/sk3_fake, ...
+            self.credentials[f"pk{number}_fake"] = f"sk{number}_fake"
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self.httpd = _HTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def api_url(self):
+        """Base URL to use as PORKBUN_API_URL."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self):
+        """Starts serving on a daemon thread and returns self."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-porkbun", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server and closes the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _chance(self, probability):
+        if probability <= 0:
+            return False
+        with self._rng_lock:
+            return self._rng.random() < probability
+
+    def handle_api(self, path, payload):
+        """
+        Dispatches one API call.
+
+        Args:
+            path (str): Endpoint path without the /api/json/v3 prefix (e.g. '/dns/retrieve/x.com').
+            payload (dict): Decoded JSON body including the API keys.
+
+        Returns:
+            dict: Response body on success.
+
+        Raises:
+            ApiError: For authentication, validation and lookup errors.
+        """
+        parts = [part for part in path.split("/") if part]
+        route = "/".join(parts[:2])
+        args = parts[2:]
+        store = self.store
+
+        if route == "pricing/get":  # the only endpoint that needs no API keys
+            return {"status": "SUCCESS", "pricing": self.pricing}
+        account = payload.get("apikey")
+        if self.credentials.get(account) != payload.get("secretapikey"):
+            raise ApiError("Invalid API key. (002)", 403)
+        if route == "domain/checkDomain" and len(args) == 1:
+            return self.check_domain(args[0].lower(), account)
+        if args and store.owner(args[0]) not in (None, account):
+            raise ApiError(f"Invalid domain. ({args[0]})")  # the domain belongs to another account
+
+        if route == "ping":
+            return {"status": "SUCCESS", "yourIp": "127.0.0.1"}
+        if route == "domain/listAll":
+            try:
+                start = int(payload.get("start", 0) or 0)
+            except (TypeError, ValueError):
+                raise ApiError("Invalid start value.")
+            return {"status": "SUCCESS", "domains": store.list_domains(start, account)}
+        if route == "dns/create" and len(args) == 1:
+            return {"status": "SUCCESS", "id": store.create_record(args[0], payload)}
+        if route == "dns/edit" and len(args) == 2:
+            store.edit_record(args[0], args[1], payload)
+            return {"status": "SUCCESS"}
+        if route == "dns/retrieve" and len(args) in (1, 2):
+            record_id = args[1] if len(args) == 2 else None
+            return {"status": "SUCCESS", "cloudflare": "enabled", "records": store.retrieve(args[0], record_id)}
+        if route == "dns/retrieveByNameType" and len(args) in (2, 3):
+            subdomain = args[2] if len(args) == 3 else ""
+            return {"status": "SUCCESS", "cloudflare": "enabled",
+                    "records": store.retrieve_by_name_type(args[0], args[1], subdomain)}
+        if route == "dns/delete" and len(args) == 2:
+            store.delete_record(args[0], args[1])
+            return {"status": "SUCCESS"}
+        if route == "domain/getNs" and len(args) == 1:
+            return {"status": "SUCCESS", "ns": store.get_ns(args[0])}
+        if route == "domain/updateNs" and len(args) == 1:
+            store.update_ns(args[0], payload.get("ns"))
+            return {"status": "SUCCESS"}
+        if route == "domain/getUrlForwarding" and len(args) == 1:
+            return {"status": "SUCCESS", "forwards": store.get_forwards(args[0])}
+        if route == "domain/addUrlForward" and len(args) == 1:
+            store.add_forward(args[0], payload)
+            return {"status": "SUCCESS"}
+        if route == "domain/deleteUrlForward" and len(args) == 2:
+            store.delete_forward(args[0], args[1])
+            return {"status": "SUCCESS"}
+        if route == "ssl/retrieve" and len(args) == 1:
+            return {"status": "SUCCESS", **store.ssl_bundle(args[0])}
+        raise ApiError(f"Invalid endpoint: {path}", 404)
+
+    def check_domain(self, domain, account):
+        """Answers /domain/checkDomain: taken if in the store, else available for most names."""
+        limiter = self.check_limiter
+        allowed, used = limiter.allow(account)
+        limits = {"TTL": f"{limiter.window:g}", "limit": str(limiter.limit), "used": used,
+                  "naturalLanguage": f"{used} out of {limiter.limit} checks within {limiter.window:g} seconds used."}
+        if not allowed:
+            with self._count_lock:
+                self.checks_rejected += 1
+            raise ApiError(f"Domain check limit exceeded: {limits['naturalLanguage']}", 503)
+        tld = domain.rsplit(".", 1)[-1]
+        prices = self.pricing.get(tld)
+        if prices is None or "." not in domain:
+            raise ApiError(f"Invalid domain or unsupported TLD. ({domain})")
+        digest = hashlib.sha256(domain.encode("utf-8")).digest()
+        taken = self.store.owner(domain) is not None or digest[0] % 3 == 0
+        premium = digest[1] % 17 == 0
+        factor = 20 if premium else 1
+        return {
+            "status": "SUCCESS",
+            "response": {
+                "avail": "no" if taken else "yes",
+                "type": "registration",
+                "price": f"{float(prices['registration']) * factor:.2f}",
+                "firstYearPromo": "yes" if prices["registration"] != prices["renewal"] else "no",
+                "regularPrice": f"{float(prices['renewal']) * factor:.2f}",
+                "premium": "yes" if premium else "no",
+                "additional": {
+                    "renewal": {"type": "renewal", "price": prices["renewal"]},
+                    "transfer": {"type": "transfer", "price": prices["transfer"]},
+                },
+            },
+            "limits": limits,
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+            disable_nagle_algorithm = True  # avoid delayed-ACK stalls on small responses
+
+            def do_POST(self):
+                with server._count_lock:
+                    server.request_count += 1
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+
+                if not self.path.startswith(API_PREFIX):
+                    self._reply(404, {"status": "ERROR", "message": "Not found"})
+                    return
+
+                delay = server.latency.sample_ms()
+                if delay:
+                    time.sleep(delay / 1000.0)
+
+                if server._chance(server.drop_rate):
+                    # Simulate a dropped connection: no response at all
+                    self.close_connection = True
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    return
+                try:
+                    payload = json.loads(raw or b"{}")
+                except ValueError:
+                    self._reply(400, {"status": "ERROR", "message": "Invalid JSON body."})
+                    return
+                if server.rate_limiter and not server.rate_limiter.allow(payload.get("apikey")):
+                    self._reply(503, {"status": "ERROR", "message": "Rate limit exceeded. Please slow down."})
+                    return
+                if server._chance(server.error_rate):
+                    self._reply(server.error_status, {"status": "ERROR", "message": "Injected error."})
+                    return
+                try:
+                    body = server.handle_api(self.path[len(API_PREFIX):], payload)
+                    self._reply(200, body)
+                except ApiError as e:
+                    self._reply(e.http_status, {"status": "ERROR", "message": e.message})
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # Quiet by default; load tests generate a lot of requests
+
+        return Handler
+
+
+def add_server_arguments(parser):
+    """Adds the stand-in server options to an argparse parser (shared with load_test.py)."""
+    parser.add_argument("--latency", default="none",
+                        help="Latency distribution: none | fixed:MS | uniform:MIN,MAX | normal:MEAN,SD | lognormal:MU,SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status for injected errors (default: 500)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of connections closed without a response")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="Requests per second allowed per API key; excess gets HTTP 503 (default: off)")
+    parser.add_argument("--burst", type=float, default=None, help="Token bucket burst size (default: the rate)")
+    parser.add_argument("--domains", type=int, default=50, help="Number of synthetic domains to create")
+    parser.add_argument("--records", type=int, default=20, help="Records per synthetic domain")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for latency and error injection")
+    parser.add_argument("--accounts", type=int, default=1,
+                        help="Accounts to spread the domains over (keys pk1_fake/sk1_fake, pk2_fake/sk2_fake, ...)")
+    parser.add_argument("--check-limit", type=int, default=1,
+                        help="domain/checkDomain calls allowed per key per --check-window (default: 1)")
+    parser.add_argument("--check-window", type=float, default=10.0,
+                        help="Window of the checkDomain limit in seconds (default: 10)")
+
+
+def server_from_args(args, port=0):
+    """Builds and seeds a FakePorkbunServer from parsed add_server_arguments() options."""
+    server = FakePorkbunServer(
+        port=port, latency=args.latency, error_rate=args.error_rate, error_status=args.error_status,
+        drop_rate=args.drop_rate, rate_limit=args.rate_limit, burst=args.burst, seed=args.seed,
+        accounts=args.accounts, check_limit=args.check_limit, check_window=args.check_window,
+    )
+    server.store.seed(args.domains, args.records, accounts=list(server.credentials))
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Porkbun API v3.")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_args(args, port=args.port)
+    print(f"Fake Porkbun API listening on {server.api_url}")
+    print(f"  export PORKBUN_API_URL={server.api_url}")
+    print(f"  export PORKBUN_API_KEY={FAKE_API_KEY} PORKBUN_SECRET_KEY={FAKE_SECRET_KEY}")
+    for number in range(2, args.accounts + 1):
+        print(f"  export PORKBUN_ACCOUNT{number}_API_KEY=pk{number}_fake PORKBUN_ACCOUNT{number}_SECRET_KEY=sk{number}_fake")
+    print(f"  {args.domains} domains x {args.records} records, latency={args.latency}, "
+          f"error-rate={args.error_rate}, rate-limit={args.rate_limit or 'off'}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        server.httpd.server_close()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Load generator for the Porkbun API client.
+
+Drives make_porkbun_request (or another registered client) from N concurrent
+worker threads against fake_porkbun_server.py or any URL in PORKBUN_API_URL,
+and reports p50/p95/p99 latency and throughput.
+
+Usage:
+    # Spawn an in-process stand-in server with 20 ms median latency and 1% errors
+    ./load_test.py --spawn-server --latency lognormal:3.0,0.5 --error-rate 0.01 \\
+        --concurrency 16 --requests 2000 --endpoint /ping --endpoint "/dns/retrieve/{domain}"
+
+    # Against an already running server (PORKBUN_API_URL / keys taken from the environment)
+    ./load_test.py --concurrency 8 --duration 30
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import fake_porkbun_server
+from porkbun_profiling import percentile
+
+
+def _function_client():
+    """The module-level make_porkbun_request function."""
+    from porkbun_api import make_porkbun_request
+    return make_porkbun_request
+
+
+def _pooled_client():
+    """A shared PorkbunClient (keep-alive connection pool, no retries so errors stay visible)."""
+    from porkbun_api import PorkbunClient
+    return PorkbunClient(pool_size=64, retries=0)
+
+
+# Client name -> factory returning a callable(endpoint, payload)
+CLIENTS = {
+    "function": _function_client,
+    "pooled": _pooled_client,
+}
+
+
+def run_load_test(call, endpoints, concurrency, total_requests=None, duration=None):
+    """
+    Calls the API from `concurrency` threads until `total_requests` calls have been
+    made or `duration` seconds have passed, cycling through `endpoints`.
+
+    Args:
+        call (callable): Client function taking (endpoint, payload).
+        endpoints (list): Concrete endpoint paths to request in rotation.
+        concurrency (int): Number of worker threads.
+        total_requests (int, optional): Stop after this many calls.
+        duration (float, optional): Stop after this many seconds.
+
+    Returns:
+        dict: requests, errors (by exception type), elapsed seconds, throughput
+              (req/s) and latency percentiles in milliseconds.
+    """
+    if total_requests is None and duration is None:
+        raise ValueError("Either total_requests or duration is required")
+
+    counter = itertools.count()
+    endpoint_cycle = itertools.cycle(endpoints)
+    lock = threading.Lock()
+    latencies = []
+    errors = {}
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+
+    def worker():
+        local_latencies = []
+        local_errors = {}
+        while True:
+            with lock:
+                index = next(counter)
+                endpoint = next(endpoint_cycle)
+            if total_requests is not None and index >= total_requests:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            call_start = time.perf_counter()
+            try:
+                call(endpoint, {})
+                local_latencies.append((time.perf_counter() - call_start) * 1000)
+            except Exception as e:
+                kind = type(e).__name__
+                local_errors[kind] = local_errors.get(kind, 0) + 1
+        with lock:
+            latencies.extend(local_latencies)
+            for kind, count in local_errors.items():
+                errors[kind] = errors.get(kind, 0) + count
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(worker)
+
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    completed = len(latencies) + sum(errors.values())
+    return {
+        "requests": completed,
+        "ok": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "throughput_rps": completed / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0,
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+        },
+    }
+
+
+def expand_endpoints(templates, call):
+    """
+    Replaces {domain} in endpoint templates with domains from /domain/listAll.
+
+    Args:
+        templates (list): Endpoint paths, optionally containing {domain}.
+        call (callable): Client function used for the one listAll call.
+
+    Returns:
+        list: Concrete endpoint paths.
+    """
+    if not any("{domain}" in template for template in templates):
+        return list(templates)
+    domains = [d["domain"] for d in call("/domain/listAll", {}).get("domains", [])]
+    if not domains:
+        raise ValueError("No domains returned by /domain/listAll to fill {domain}")
+    endpoints = []
+    for domain in domains:
+        for template in templates:
+            endpoints.append(template.replace("{domain}", domain))
+    return endpoints
+
+
+def format_report(stats):
+    """Formats run_load_test() results for the terminal."""
+    latency = stats["latency_ms"]
+    lines = [
+        f"Requests:    {stats['requests']} ({stats['ok']} ok, {sum(stats['errors'].values())} errors)",
+        f"Concurrency: {stats['concurrency']}",
+        f"Duration:    {stats['elapsed_s']:.2f} s",
+        f"Throughput:  {stats['throughput_rps']:.1f} req/s",
+        f"Latency ms:  p50 {latency['p50']:.1f}  p95 {latency['p95']:.1f}  p99 {latency['p99']:.1f}"
+        f"  max {latency['max']:.1f}  mean {latency['mean']:.1f}",
+    ]
+    for kind, count in sorted(stats["errors"].items()):
+        lines.append(f"  {kind}: {count}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Porkbun API client.")
+    parser.add_argument("--client", choices=sorted(CLIENTS), default="function", help="Client implementation to drive")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of concurrent workers (default: 8)")
+    parser.add_argument("--requests", type=int, default=None, help="Total number of calls (default: 1000 unless --duration)")
+    parser.add_argument("--duration", type=float, default=None, help="Run for this many seconds instead")
+    parser.add_argument("--endpoint", action="append", default=None,
+                        help="Endpoint to call; repeatable; {domain} is filled from listAll (default: /ping)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--spawn-server", action="store_true", help="Run fake_porkbun_server in-process and target it")
+    fake_porkbun_server.add_server_arguments(parser)
+    args = parser.parse_args()
+
+    if args.requests is None and args.duration is None:
+        args.requests = 1000
+
+    server = None
+    if args.spawn_server:
+        server = fake_porkbun_server.server_from_args(args).start()
+        # porkbun_api reads these when it is first imported by the client factory
+        os.environ["PORKBUN_API_URL"] = server.api_url
+        os.environ["PORKBUN_API_KEY"] = fake_porkbun_server.FAKE_API_KEY
+        os.environ["PORKBUN_SECRET_KEY"] = fake_porkbun_server.FAKE_SECRET_KEY
+        print(f"Spawned fake Porkbun API at {server.api_url}", file=sys.stderr)
+
+    try:
+        call = CLIENTS[args.client]()
+        endpoints = expand_endpoints(args.endpoint or ["/ping"], call)
+        stats = run_load_test(call, endpoints, args.concurrency, args.requests, args.duration)
+    finally:
+        if server:
+            server.stop()
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print(format_report(stats))
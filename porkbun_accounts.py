@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Client pool for domains spread over several Porkbun accounts.
+
+Credential profiles are read from the environment (and ~/.env):
+
+    PORKBUN_API_KEY / PORKBUN_SECRET_KEY                 profile "default"
+    PORKBUN_<NAME>_API_KEY / PORKBUN_<NAME>_SECRET_KEY   profile "<name>" (lower-cased)
+    PORKBUN_<NAME>_RATE / PORKBUN_<NAME>_BURST           optional calls/s budget of that account
+
+Each profile gets its own PorkbunClient (connection pool) and, if a rate is
+set, its own token bucket, so accounts never slow each other down. The map of
+which account owns which domain is built once from every account's
+/domain/listAll (in parallel) and cached on disk for a day; it is rebuilt when
+the profiles change or a domain is not found in it.
+
+AccountPool.request() picks the account from the domain in the endpoint path
+(/dns/retrieve/{domain}, ...), so the pool can be passed anywhere a
+PorkbunClient is accepted (porkbun_ssl, porkbun_zone, porkbun_audit).
+
+Usage (also available as `porkbun accounts ...`):
+    ./porkbun_accounts.py list
+    ./porkbun_accounts.py owner example.com example.net
+    ./porkbun_accounts.py refresh
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAP_PATH = os.environ.get(
+    "PORKBUN_ACCOUNT_MAP",
+    os.path.join(os.path.expanduser("~"), ".cache", "porkbun", "accounts.json"),
+)
+DEFAULT_MAP_TTL = 24 * 3600   # seconds
+MIN_REFRESH_INTERVAL = 60     # an unknown domain triggers at most one rebuild per minute
+DEFAULT_PROFILE = "default"
+_PROFILE_KEY = re.compile(r"^PORKBUN_(.+)_API_KEY$")
+
+
+class Profile:
+    """One account's credentials and optional rate budget."""
+
+    __slots__ = ("name", "api_key", "secret_key", "rate", "burst")
+
+    def __init__(self, name, api_key, secret_key, rate=None, burst=None):
+        self.name = name
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.rate = rate
+        self.burst = burst
+
+    @property
+    def key_id(self):
+        """Short fingerprint of the API key, so the cached map notices changed keys without storing them."""
+        import porkbun_broker
+
+        return porkbun_broker.key_id(self.api_key)
+
+    def __repr__(self):
+        return f"Profile({self.name!r}, key_id={self.key_id!r}, rate={self.rate})"
+
+
+def load_profiles(environ=None):
+    """
+    Reads the credential profiles from the environment (loading ~/.env first).
+
+    Returns:
+        dict: name -> Profile, "default" first if present.
+    """
+    if environ is None:
+        from porkbun_api import load_credentials
+        load_credentials()  # loads ~/.env into os.environ
+        environ = os.environ
+
+    def number(value):
+        return float(value) if value else None
+
+    profiles = {}
+    if environ.get("PORKBUN_API_KEY") and environ.get("PORKBUN_SECRET_KEY"):
+        profiles[DEFAULT_PROFILE] = Profile(DEFAULT_PROFILE, environ["PORKBUN_API_KEY"], environ["PORKBUN_SECRET_KEY"],
+                                            number(environ.get("PORKBUN_RATE")), number(environ.get("PORKBUN_BURST")))
+    for key in sorted(environ):
+        match = _PROFILE_KEY.match(key)
+        if not match:
+            continue
+        prefix = f"PORKBUN_{match.group(1)}_"
+        secret = environ.get(prefix + "SECRET_KEY")
+        if not environ[key] or not secret:
+            continue
+        name = match.group(1).lower()
+        profiles[name] = Profile(name, environ[key], secret, number(environ.get(prefix + "RATE")),
+                                 number(environ.get(prefix + "BURST")))
+    return profiles
+
+
+def endpoint_domain(endpoint):
+    """The domain an endpoint path is about (its third segment), or None (e.g. /ping, /domain/listAll)."""
+    parts = [part for part in endpoint.split("/") if part]
+    return parts[2].lower() if len(parts) >= 3 else None
+
+
+class AccountPool:
+    """
+    Routes API calls to the account that owns the domain.
+
+    Thread-safe; share one instance between worker threads.
+
+    Args:
+        profiles (dict, optional): name -> Profile (default: load_profiles()).
+        pool_size (int): Keep-alive connections per account.
+        retries (int): Retries per call (see PorkbunClient).
+        map_path (str, optional): Domain -> account cache file (default: DEFAULT_MAP_PATH).
+        map_ttl (float): Rebuild the cached map when it is older than this many seconds.
+    """
+
+    def __init__(self, profiles=None, pool_size=10, retries=2, map_path=None, map_ttl=DEFAULT_MAP_TTL):
+        from porkbun_api import PorkbunClient, TokenBucket
+
+        self.profiles = profiles if profiles is not None else load_profiles()
+        if not self.profiles:
+            raise ValueError("No credential profiles found (set PORKBUN_API_KEY or PORKBUN_<NAME>_API_KEY "
+                             "and the matching SECRET_KEY)")
+        self.clients = {
+            name: PorkbunClient(pool_size=pool_size, retries=retries, credentials=(p.api_key, p.secret_key),
+                                rate_limiter=TokenBucket(p.rate, p.burst) if p.rate else None)
+            for name, p in self.profiles.items()
+        }
+        self.map_path = map_path or DEFAULT_MAP_PATH
+        self.map_ttl = map_ttl
+        self._owners = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    # --- Domain map ---
+
+    def _fingerprint(self):
+        return {name: profile.key_id for name, profile in self.profiles.items()}
+
+    def _load_cached_map(self):
+        import porkbun_codec
+
+        try:
+            with open(self.map_path, "rb") as f:
+                cached = porkbun_codec.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if cached.get("profiles") != self._fingerprint() or time.time() - cached.get("built_at", 0) > self.map_ttl:
+            return None
+        return cached
+
+    def build_map(self):
+        """
+        Lists every account's domains in parallel and caches the domain -> account map.
+
+        Returns:
+            dict: domain -> profile name
+
+        Raises:
+            requests.exceptions.RequestException, ValueError: If an account cannot be listed.
+        """
+        import porkbun_codec
+        from porkbun_api import iter_domain_pages
+        from porkbun_files import write_atomic
+
+        def list_account(name):
+            client = self.clients[name]
+            return name, [info["domain"].lower() for page in iter_domain_pages(request=client)
+                          for info in page if info.get("domain")]
+
+        owners = {}
+        with ThreadPoolExecutor(max_workers=len(self.clients)) as executor:
+            for name, domains in executor.map(list_account, list(self.clients)):
+                for domain in domains:
+                    if domain in owners:
+                        print(f"Warning: {domain} is listed by accounts {owners[domain]} and {name}; "
+                              f"using {owners[domain]}", file=sys.stderr)
+                        continue
+                    owners[domain] = name
+        built_at = time.time()
+        os.makedirs(os.path.dirname(os.path.abspath(self.map_path)), exist_ok=True)
+        write_atomic(self.map_path, porkbun_codec.dumps(
+            {"built_at": built_at, "profiles": self._fingerprint(), "domains": owners}))
+        self._owners, self._built_at = owners, built_at
+        return owners
+
+    def owners(self, refresh=False):
+        """Returns the domain -> profile name map, from memory, the cache file or the API."""
+        with self._lock:
+            if self._owners is None and not refresh:
+                cached = self._load_cached_map()
+                if cached is not None:
+                    self._owners, self._built_at = cached["domains"], cached["built_at"]
+            if self._owners is None or refresh:
+                self.build_map()
+            return self._owners
+
+    def owner(self, domain):
+        """
+        Returns the profile name that owns a domain.
+
+        A domain missing from the map causes one rebuild (at most once per MIN_REFRESH_INTERVAL),
+        so domains added to an account are found without waiting for the cache to expire.
+
+        Raises:
+            ValueError: If no account owns the domain.
+        """
+        domain = domain.lower()
+        name = self.owners().get(domain)
+        if name is None and time.time() - self._built_at > MIN_REFRESH_INTERVAL:
+            name = self.owners(refresh=True).get(domain)
+        if name is None:
+            raise ValueError(f"{domain} is not in any account ({', '.join(self.profiles)})")
+        return name
+
+    def client_for(self, domain):
+        """The PorkbunClient of the account that owns a domain."""
+        return self.clients[self.owner(domain)]
+
+    def domains(self, refresh=False):
+        """All domains of all accounts, sorted."""
+        return sorted(self.owners(refresh))
+
+    # --- Calls ---
+
+    def request(self, endpoint, payload, account=None):
+        """
+        Sends one API call through the owning account's client (see make_porkbun_request).
+
+        Args:
+            account (str, optional): Profile to use; required for endpoints without a domain
+                when there is more than one profile.
+        """
+        if account is None:
+            domain = endpoint_domain(endpoint)
+            if domain is not None:
+                account = self.owner(domain)
+            elif len(self.clients) == 1:
+                account = next(iter(self.clients))
+            else:
+                raise ValueError(f"{endpoint} is not about a domain; pass account= (one of {', '.join(self.clients)})")
+        return self.clients[account].request(endpoint, payload)
+
+    __call__ = request
+
+    def close(self):
+        for client in self.clients.values():
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def portfolio(domains=(), all_domains=False, accounts=False, pool_size=16):
+    """
+    Sets up the client and domain list of a bulk command (--all / --accounts options).
+
+    Args:
+        domains (iterable): Domains given on the command line.
+        all_domains (bool): Add every domain of the account (of all accounts with accounts=True).
+        accounts (bool): Use an AccountPool over all credential profiles instead of one client.
+        pool_size (int): Keep-alive connections (per account).
+
+    Returns:
+        tuple: (PorkbunClient or AccountPool, deduplicated list of domains). Close the client when done.
+
+    Raises:
+        requests.exceptions.RequestException, ValueError: If the domains cannot be listed.
+    """
+    from porkbun_api import PorkbunClient, iter_domain_pages
+
+    client = AccountPool(pool_size=pool_size) if accounts else PorkbunClient(pool_size=pool_size, retries=2)
+    domains = list(domains)
+    try:
+        if all_domains and accounts:
+            domains.extend(client.domains())
+        elif all_domains:
+            domains.extend(info["domain"] for page in iter_domain_pages(request=client)
+                           for info in page if info.get("domain"))
+    except BaseException:
+        client.close()
+        raise
+    return client, list(dict.fromkeys(domains))
+
+
+# --- Command line (argument parsing lives in porkbun_cli) ---
+
+def run_command(args):
+    """Runs an `accounts` subcommand parsed by porkbun_cli."""
+    import requests
+
+    try:
+        pool = AccountPool(map_path=args.map)
+    except ValueError as e:
+        print(e)
+        return 2
+    try:
+        if args.action == "owner":
+            status = 0
+            for domain in args.domains:
+                try:
+                    print(f"{domain:<40} {pool.owner(domain)}")
+                except ValueError:
+                    print(f"{domain:<40} (no account)")
+                    status = 1
+            return status
+
+        start = time.perf_counter()
+        owners = pool.owners(refresh=args.action == "refresh")
+        counts = {name: 0 for name in pool.profiles}
+        for name in owners.values():
+            counts[name] = counts.get(name, 0) + 1
+        for name, profile in pool.profiles.items():
+            rate = f"{profile.rate:g}/s" if profile.rate else "unlimited"
+            print(f"{name:<16} key {profile.key_id}  {counts[name]:>6} domains  budget {rate}")
+        age = time.time() - pool._built_at
+        print(f"{len(owners)} domains in {len(pool.profiles)} accounts; map built {age:.0f}s ago "
+              f"({pool.map_path}), {time.perf_counter() - start:.1f}s")
+        return 0
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"API Call Error while listing domains: {e}")
+        return 1
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    import porkbun_cli
+    sys.exit(porkbun_cli.main(["accounts"] + sys.argv[1:]))
@@ -4,38 +4,135 @@
 # #autonomous-ai #cursor
 # SPDX-License-Identifier: MIT
 
+# Heavy dependencies (requests, python-dotenv) and the ~/.env file are loaded
+# lazily on the first API call, so importing this module stays cheap for
+# --help, usage errors and commands that never reach the API.
+
 import os
-import json
-import requests # Use requests for HTTP calls
+import random
+import threading
+import time
+
+import porkbun_codec # JSON codec (orjson/msgspec when installed, else stdlib)
+import porkbun_metrics # Optional metrics; disabled unless configured
+import porkbun_profiling # Optional per-phase request timing (--profile)
 
-from dotenv import load_dotenv
 from pathlib import Path
 
 # --- Configuration ---
-# Load environment variables from ~/.env
+# Environment variables are loaded from ~/.env on first use (see load_credentials)
 dotenv_path = Path.home() / '.env'
-load_dotenv(dotenv_path=dotenv_path)
 
-# Load API keys from environment
-API_KEY = os.environ.get("PORKBUN_API_KEY")
-SECRET_KEY = os.environ.get("PORKBUN_SECRET_KEY")
+# Base URL can be overridden, e.g. to point at fake_porkbun_server.py
+PORKBUN_API_URL = os.environ.get("PORKBUN_API_URL", "https://api.porkbun.com/api/json/v3")
+
+# Turn on metrics if PORKBUN_METRICS_PORT or PORKBUN_METRICS_TEXTFILE is set
+porkbun_metrics.enable_from_env()
 
-PORKBUN_API_URL = "https://api.porkbun.com/api/json/v3"
+def load_credentials():
+    """Loads ~/.env and reads the API keys from the environment (only once).
+
+    Keys already assigned to API_KEY / SECRET_KEY (e.g. by tests or tools) are kept.
+    Returns:
+        tuple: (API_KEY, SECRET_KEY), either of which may be None.
+    """
+    module_globals = globals()
+    if "API_KEY" not in module_globals or "SECRET_KEY" not in module_globals:
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path=dotenv_path)
+        module_globals.setdefault("API_KEY", os.environ.get("PORKBUN_API_KEY"))
+        module_globals.setdefault("SECRET_KEY", os.environ.get("PORKBUN_SECRET_KEY"))
+    return module_globals["API_KEY"], module_globals["SECRET_KEY"]
+
+def __getattr__(name):
+    """Loads the credentials the first time porkbun_api.API_KEY / SECRET_KEY is read."""
+    if name in ("API_KEY", "SECRET_KEY"):
+        load_credentials()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --- Helper Function for API Calls ---
 def make_porkbun_request(endpoint, payload):
-    """Sends a POST request to the Porkbun API.
+    """Sends a POST request to the Porkbun API, recording metrics if they are enabled.
+    When the daemon (porkbun_daemon.py) is running, the call goes through its warm
+    connections and read cache instead (set PORKBUN_BROKER=off to always call directly).
+    /dns/retrieve and /domain/getNs are served from the cache shared by all processes
+    on the host for a few seconds (see porkbun_shared_cache.py).
     Args:
         endpoint (str): The API endpoint (e.g., '/ping').
         payload (dict): The JSON payload for the request.
     Returns:
-        dict: The JSON response from the API.
+        dict: The JSON response from the API (a porkbun_codec.PorkbunResponse,
+            whose .raw attribute holds the undecoded response body).
     Raises:
         requests.exceptions.RequestException: If the request fails.
         ValueError: If the response is not valid JSON or indicates an error.
         SystemExit: If API keys are missing.
     """
-    if not API_KEY or not SECRET_KEY:
+    return _send_shared(endpoint, payload)
+
+def _send_shared(endpoint, payload):
+    """Sends the call through the cross-process cache (porkbun_shared_cache.py);
+    --profile always calls the API to time the phases."""
+    if porkbun_profiling.ENABLED:
+        return _send_direct(endpoint, payload)
+    import porkbun_shared_cache
+    return porkbun_shared_cache.call(endpoint, payload, load_credentials(), _send_brokered_or_direct)
+
+def _send_brokered_or_direct(endpoint, payload):
+    """Sends the call through a running daemon's connections (see porkbun_broker.py),
+    or directly when none is listening. --profile always calls directly to time the phases."""
+    if not porkbun_profiling.ENABLED:
+        import porkbun_broker
+        if porkbun_broker.enabled():
+            response = porkbun_broker.request(endpoint, payload, load_credentials())
+            if response is not None:
+                return response
+    return _send_direct(endpoint, payload)
+
+def _send_direct(endpoint, payload):
+    """Calls the API over HTTP. Only these calls are counted in the API metrics; cache hits
+    and brokered calls are not (the daemon records the calls it makes for others)."""
+    return _call_with_metrics(endpoint, _send_porkbun_request, endpoint, payload)
+
+def _call_with_metrics(endpoint, send, *args, **kwargs):
+    """Calls send(*args, **kwargs), recording call, error and latency metrics for the endpoint."""
+    if not porkbun_metrics.ENABLED:
+        return send(*args, **kwargs)
+
+    template = porkbun_metrics.endpoint_template(endpoint)
+    porkbun_metrics.API_CALLS.inc(template)
+    start = time.perf_counter()
+    try:
+        return send(*args, **kwargs)
+    except Exception as e:
+        porkbun_metrics.API_ERRORS.inc(template, _classify_error(e))
+        raise
+    finally:
+        porkbun_metrics.API_LATENCY.observe(time.perf_counter() - start, template)
+
+def _classify_error(error):
+    """Returns a short error kind for metrics labels."""
+    import requests
+    if isinstance(error, requests.exceptions.HTTPError):
+        return "http"
+    if isinstance(error, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "connection"
+    if isinstance(error, requests.exceptions.RequestException):
+        return "request"
+    if isinstance(error, ValueError):
+        return "decode" if str(error).startswith("Invalid JSON") else "api"
+    return "other"
+
+def _send_porkbun_request(endpoint, payload, session=None, timeout=None, credentials=None):
+    """Performs the authenticated POST for make_porkbun_request (over session if given,
+    with the (API_KEY, SECRET_KEY) pair in credentials instead of the module's keys if given)."""
+    import requests # Imported on first use to keep module import fast
+
+    api_key, secret_key = credentials or load_credentials()
+    if not api_key or not secret_key:
         print("Error: PORKBUN_API_KEY or PORKBUN_SECRET_KEY not found.")
         print(f"Ensure they are set in your environment or in {dotenv_path}")
         print("You can get keys from: https://app.porkbun.com/account/apikeys")
@@ -46,18 +143,23 @@ def make_porkbun_request(endpoint, payload):
 
     # Add authentication keys to the payload
     auth_payload = {
-        "apikey": API_KEY,
-        "secretapikey": SECRET_KEY
+        "apikey": api_key,
+        "secretapikey": secret_key
     }
     full_payload = {**auth_payload, **payload}
 
-    response = requests.post(url, headers=headers, json=full_payload)
-    response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+    if porkbun_profiling.ENABLED:
+        response_json = _send_profiled_request(endpoint, url, headers, full_payload)
+    else:
+        post = session.post if session is not None else requests.post
+        response = post(url, headers=headers, data=porkbun_codec.dumps(full_payload), timeout=timeout)
+        response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
 
-    try:
-        response_json = response.json()
-    except json.JSONDecodeError:
-        raise ValueError(f"Invalid JSON received from API: {response.text}")
+        # Decode straight from the body bytes; the body is kept for raw output
+        try:
+            response_json = porkbun_codec.decode_response(response.content)
+        except ValueError:
+            raise ValueError(f"Invalid JSON received from API: {response.text}")
 
     if response_json.get("status") != "SUCCESS":
         error_message = response_json.get("message", "Unknown API error")
@@ -65,6 +167,268 @@ def make_porkbun_request(endpoint, payload):
 
     return response_json
 
+def _send_profiled_request(endpoint, url, headers, full_payload):
+    """
+    Sends the request through porkbun_profiling.timed_post so the DNS, connect, TLS,
+    server, transfer and decode phases are recorded. Raises the same exception types
+    as the requests-based path.
+    """
+    import http.client
+    import socket
+
+    import requests
+    body = porkbun_codec.dumps(full_payload)
+    try:
+        status, reason, response_body, timings = porkbun_profiling.timed_post(
+            url, body, headers, cafile=requests.certs.where()
+        )
+    except socket.timeout as e:  # an OSError too, so it is checked first
+        raise requests.exceptions.Timeout(e) from e
+    except (OSError, http.client.HTTPException) as e:
+        raise requests.exceptions.ConnectionError(e) from e
+
+    try:
+        if status >= 400:
+            response = requests.models.Response()
+            response.status_code, response.reason, response.url = status, reason, url
+            raise requests.exceptions.HTTPError(f"{status} {reason} for url: {url}", response=response)
+
+        decode_start = time.perf_counter()
+        try:
+            response_json = porkbun_codec.decode_response(response_body)
+        except ValueError:
+            raise ValueError(f"Invalid JSON received from API: {response_body.decode('utf-8', 'replace')}")
+        timings["decode"] = time.perf_counter() - decode_start
+        timings["total"] += timings["decode"]
+    finally:
+        porkbun_profiling.record(porkbun_metrics.endpoint_template(endpoint), timings)
+
+    return response_json
+
+def _request_not_sent(error):
+    """True if the request certainly never reached the server (connect timeout or refused connection)."""
+    import requests
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError) or isinstance(error, requests.exceptions.Timeout):
+        return False
+    # requests wraps the cause: ConnectionError(MaxRetryError(reason=NewConnectionError(...)))
+    pending, seen = [error], set()
+    while pending:
+        cause = pending.pop()
+        if cause is None or id(cause) in seen:
+            continue
+        seen.add(id(cause))
+        if isinstance(cause, ConnectionRefusedError) or type(cause).__name__ == "NewConnectionError":
+            return True
+        pending.extend([getattr(cause, "reason", None), cause.__cause__, cause.__context__])
+        pending.extend(arg for arg in getattr(cause, "args", ()) if isinstance(arg, BaseException))
+    return False
+
+# --- Pooled Client ---
+class TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a call is allowed.
+    Args:
+        rate (float): Calls per second refilled.
+        burst (float, optional): Bucket size (default: rate, at least 1).
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = max(float(burst if burst is not None else rate), 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1.0):
+        """Takes tokens from the bucket, sleeping until enough have been refilled.
+        Returns:
+            float: Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                # Sleep in slices so that a set_rate() from another thread applies to waiting callers
+                delay = min((tokens - self.tokens) / self.rate, 0.5)
+            time.sleep(delay)
+            waited += delay
+
+    def set_rate(self, rate, burst=None):
+        """Changes the refill rate and bucket size (e.g. to limits reported by the API), keeping the fill level."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.rate = float(rate)
+            self.capacity = max(float(burst if burst is not None else rate), 1.0)
+            self.tokens = min(self.tokens, self.capacity)
+
+class PorkbunClient:
+    """API client with a pooled keep-alive session, retries and optional rate limiting.
+
+    Thread-safe; share one instance between worker threads so connections are reused.
+    Calls behave like make_porkbun_request (same return value and exceptions).
+
+    Example:
+        with PorkbunClient(pool_size=16, retries=2) as client:
+            client.request("/ping", {})
+    Args:
+        pool_size (int): Maximum keep-alive connections (set to the number of worker threads).
+        timeout (float, optional): Per-request timeout in seconds.
+        retries (int): Retries on connection errors, timeouts and HTTP 429/503.
+        backoff (float): Base delay in seconds, doubled per attempt (with jitter).
+        rate_limiter (TokenBucket, optional): Shared limiter each call must pass.
+        credentials (tuple, optional): (API_KEY, SECRET_KEY) of another account
+            (default: the keys from the environment / ~/.env).
+    """
+
+    RETRY_STATUSES = (429, 503)
+
+    def __init__(self, pool_size=10, timeout=30, retries=2, backoff=0.5, rate_limiter=None, credentials=None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.rate_limiter = rate_limiter
+        self.credentials = credentials
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The pooled requests.Session, created on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def request(self, endpoint, payload):
+        """Sends one API call (see make_porkbun_request). Writes invalidate the shared cache."""
+        try:
+            return _call_with_metrics(endpoint, self._send_with_retries, endpoint, payload)
+        finally:
+            import porkbun_shared_cache
+            porkbun_shared_cache.invalidate(endpoint, self.credentials or load_credentials())
+
+    __call__ = request  # usable wherever a make_porkbun_request-style callable is expected
+
+    def _send_with_retries(self, endpoint, payload):
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                return _send_porkbun_request(endpoint, payload, session=self.session, timeout=self.timeout,
+                                             credentials=self.credentials)
+            except Exception as e:
+                if attempt >= self.retries or not self._is_retryable(e, endpoint):
+                    raise
+            attempt += 1
+            if porkbun_metrics.ENABLED:
+                porkbun_metrics.API_RETRIES.inc(porkbun_metrics.endpoint_template(endpoint))
+            delay = self.backoff * (2 ** (attempt - 1))
+            time.sleep(delay * random.uniform(0.5, 1.5))
+
+    def _is_retryable(self, error, endpoint):
+        """Reads are retried on any transient error. Writes are only retried when the server certainly
+        did not process them (no connection, 429/503): after a read timeout the write may have been
+        applied, and sending it again could e.g. create a duplicate record."""
+        import requests
+        import porkbun_broker
+        response = getattr(error, "response", None)
+        if isinstance(error, requests.exceptions.HTTPError):
+            return response is not None and response.status_code in self.RETRY_STATUSES
+        if porkbun_broker.is_read(endpoint):
+            return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+        return _request_not_sent(error)
+
+    def close(self):
+        """Closes the pooled connections."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# --- Paging Helpers ---
+LIST_ALL_PAGE_SIZE = 1000 # /domain/listAll returns at most 1000 domains per call
+
+def iter_domain_pages(include_labels=False, request=None):
+    """Yields /domain/listAll results one page at a time, using the 'start' offset.
+    Args:
+        include_labels (bool): Ask the API to include domain labels.
+        request (callable, optional): Call to use instead of make_porkbun_request (e.g. a PorkbunClient).
+    Yields:
+        list: Domain info dicts of one page (up to LIST_ALL_PAGE_SIZE).
+    Raises:
+        requests.exceptions.RequestException, ValueError: As make_porkbun_request.
+    """
+    request = request or make_porkbun_request
+    start = 0
+    while True:
+        payload = {"start": str(start)}
+        if include_labels:
+            payload["includeLabels"] = "yes"
+        domains = request("/domain/listAll", payload).get("domains") or []
+        if domains:
+            yield domains
+        if len(domains) < LIST_ALL_PAGE_SIZE:
+            return
+        start += len(domains)
+
+# --- URL Forwarding Helpers ---
+URL_FORWARD_FIELDS = ("subdomain", "location", "type", "includePath", "wildcard")
+
+def get_url_forwards(domain, request=None):
+    """Returns the URL forwards of a domain (/domain/getUrlForwarding).
+    Args:
+        domain (str): The domain.
+        request (callable, optional): Call to use instead of make_porkbun_request (e.g. a PorkbunClient).
+    Returns:
+        list: Forward dicts with id, subdomain, location, type, includePath and wildcard.
+    Raises:
+        requests.exceptions.RequestException, ValueError: As make_porkbun_request.
+    """
+    request = request or make_porkbun_request
+    return request(f"/domain/getUrlForwarding/{domain}", {}).get("forwards") or []
+
+def add_url_forward(domain, forward, request=None):
+    """Adds a URL forward (/domain/addUrlForward).
+    Args:
+        domain (str): The domain.
+        forward (dict): subdomain ('' for the domain itself), location, type ('temporary' or
+            'permanent'), includePath and wildcard ('yes' or 'no').
+        request (callable, optional): Call to use instead of make_porkbun_request.
+    Raises:
+        requests.exceptions.RequestException, ValueError: As make_porkbun_request.
+    """
+    request = request or make_porkbun_request
+    request(f"/domain/addUrlForward/{domain}", {field: forward.get(field, "") for field in URL_FORWARD_FIELDS})
+
+def delete_url_forward(domain, forward_id, request=None):
+    """Deletes a URL forward by ID (/domain/deleteUrlForward).
+    Raises:
+        requests.exceptions.RequestException, ValueError: As make_porkbun_request.
+    """
+    request = request or make_porkbun_request
+    request(f"/domain/deleteUrlForward/{domain}/{forward_id}", {})
+
 # Example of how to use this module if run directly (optional)
 # if __name__ == '__main__':
 #     try:
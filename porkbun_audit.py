@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Audit of dangling and misconfigured DNS records across all domains.
+
+Zones come from /dns/retrieve (fetched concurrently over one pooled client) or
+from the local inventory snapshot (porkbun_inventory.py) without any API calls.
+Every CNAME, ALIAS and MX target is collected first and deduplicated across
+zones, then each distinct target is resolved once (A and AAAA) with the
+in-process resolver from dns_resolver.py. Answers are cached for their TTL, so
+a target shared by hundreds of zones costs two queries.
+
+Findings:
+    nxdomain           the target does not exist (dangling record)
+    no-address         the target exists but has no A or AAAA record
+    unresolved         the resolvers failed or timed out for the target
+    outside-allowlist  an A/AAAA record, or an address a target resolves to,
+                       is not in any allowed network (only with --allow/--allowlist)
+
+Usage (also available as `porkbun audit ...`):
+    ./porkbun_audit.py --all [--allow 192.0.2.0/24 --allowlist networks.txt]
+    ./porkbun_audit.py --inventory [--db PATH] [--resolver 1.1.1.1] [--ndjson]
+    ./porkbun_audit.py example.com example.net
+"""
+
+import ipaddress
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+TARGET_TYPES = ("CNAME", "ALIAS", "MX")
+ADDRESS_TYPES = ("A", "AAAA")
+DEFAULT_CONCURRENCY = 16   # zones fetched in parallel
+DEFAULT_DNS_CONCURRENCY = 64  # targets resolved in parallel
+
+
+def record_target(record):
+    """
+    Returns the host name a CNAME/ALIAS/MX record points at (normalised), or None.
+
+    MX content may carry the preference ("10 mx.example.com"); a null MX (".") has no target.
+    """
+    import dns_wire
+
+    if record.type not in TARGET_TYPES or not record.content:
+        return None
+    target = dns_wire.normalize_name(record.content.split()[-1])
+    return target or None
+
+
+def parse_networks(specs):
+    """
+    Parses allowlist entries (CIDRs or single addresses) into ip_network objects.
+
+    Raises:
+        ValueError: For an entry that is not a network or address.
+    """
+    return [ipaddress.ip_network(spec.strip(), strict=False) for spec in specs if spec.strip()]
+
+
+def load_allowlist(networks=(), files=()):
+    """Builds the allowlist from --allow values and files with one network per line (# comments)."""
+    specs = list(networks)
+    for path in files:
+        with open(path) as f:
+            specs.extend(line.split("#", 1)[0] for line in f)
+    return parse_networks(specs)
+
+
+def ip_allowed(address, allowlist):
+    """True if the address is inside one of the allowed networks."""
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in allowlist if network.version == ip.version)
+
+
+def fetch_zones(domains, concurrency=DEFAULT_CONCURRENCY, client=None):
+    """
+    Fetches the records of many domains concurrently from /dns/retrieve.
+
+    Returns:
+        tuple: ({domain: [DnsRecord]}, {domain: error message})
+    """
+    import requests
+    from porkbun_api import PorkbunClient
+    from porkbun_models import parse_records
+
+    own_client = client is None
+    if own_client:
+        client = PorkbunClient(pool_size=concurrency, retries=2)
+
+    def fetch(domain):
+        try:
+            return domain, parse_records(client.request(f"/dns/retrieve/{domain}", {}), domain), None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return domain, None, str(e)
+
+    zones, errors = {}, {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for domain, records, error in executor.map(fetch, domains):
+                if error is None:
+                    zones[domain] = records
+                else:
+                    errors[domain] = error
+    finally:
+        if own_client:
+            client.close()
+    return zones, errors
+
+
+def load_snapshot_zones(domains=None, db_path=None):
+    """Reads zones from the local inventory instead of the API (all domains if none are given)."""
+    import porkbun_inventory
+
+    conn = porkbun_inventory.open_inventory(db_path)
+    try:
+        zones = {}
+        if domains:
+            for domain in domains:
+                zones[domain] = porkbun_inventory.find_records(conn, domain=domain)
+        else:
+            for domain, in conn.execute("SELECT domain FROM domains WHERE fetched_at IS NOT NULL ORDER BY domain"):
+                zones[domain] = []
+            for record in porkbun_inventory.find_records(conn):
+                zones.setdefault(record.domain, []).append(record)
+        return zones
+    finally:
+        conn.close()
+
+
+def _finding(record, problem, detail, target=None):
+    return {
+        "domain": record.domain,
+        "name": record.name,
+        "type": record.type,
+        "content": record.content,
+        "target": target,
+        "problem": problem,
+        "detail": detail,
+    }
+
+
+def audit_zones(zones, resolver, allowlist=(), concurrency=DEFAULT_DNS_CONCURRENCY):
+    """
+    Audits records of many zones.
+
+    Args:
+        zones (dict): domain -> list of DnsRecord.
+        resolver (dns_resolver.Resolver): Resolver to use (its cache is shared by all zones).
+        allowlist (list): ip_network objects; empty to skip address checks.
+        concurrency (int): Targets resolved in parallel.
+
+    Returns:
+        tuple: (list of finding dicts, stats dict)
+    """
+    targets = {}  # target -> records pointing at it
+    findings = []
+    address_records = 0
+    for records in zones.values():
+        for record in records:
+            target = record_target(record)
+            if target is not None:
+                targets.setdefault(target, []).append(record)
+            elif allowlist and record.type in ADDRESS_TYPES:
+                address_records += 1
+                if not ip_allowed(record.content, allowlist):
+                    findings.append(_finding(record, "outside-allowlist", f"{record.content} is not in the allowlist"))
+
+    answers = resolver.resolve_many(((target, record_type) for target in targets for record_type in ADDRESS_TYPES),
+                                    concurrency=concurrency)
+    for target, records in targets.items():
+        a, aaaa = answers[(target, "A")], answers[(target, "AAAA")]
+        problem = detail = None
+        if a.nxdomain or aaaa.nxdomain:
+            problem, detail = "nxdomain", f"{target} does not exist (NXDOMAIN)"
+        elif a.rcode is None or a.rcode != 0:
+            problem, detail = "unresolved", f"{target}: {a.error or a.rcode_name}"
+        elif not a.values and not aaaa.values:
+            problem, detail = "no-address", f"{target} has no A or AAAA record"
+        elif allowlist:
+            outside = [ip for ip in a.values + aaaa.values if not ip_allowed(ip, allowlist)]
+            if outside:
+                problem, detail = "outside-allowlist", f"{target} resolves to {', '.join(outside)} outside the allowlist"
+        if problem:
+            findings.extend(_finding(record, problem, detail, target) for record in records)
+
+    stats = {
+        "zones": len(zones),
+        "records": sum(len(records) for records in zones.values()),
+        "target_records": sum(len(records) for records in targets.values()),
+        "unique_targets": len(targets),
+        "address_records": address_records,
+        "dns_queries": resolver.queries_sent,
+        "dns_cache_hits": resolver.cache_hits,
+    }
+    return findings, stats
+
+
+# --- Command line (argument parsing lives in porkbun_cli) ---
+
+def run_command(args):
+    """Runs `porkbun audit` as parsed by porkbun_cli."""
+    import requests
+    import dns_resolver
+
+    try:
+        allowlist = load_allowlist(args.allow, args.allowlist)
+    except (OSError, ValueError) as e:
+        print(f"Invalid allowlist: {e}")
+        return 2
+
+    start = time.perf_counter()
+    errors = {}
+    if args.inventory:
+        zones = load_snapshot_zones(args.domains, args.db)
+    else:
+        import porkbun_accounts
+        try:
+            client, domains = porkbun_accounts.portfolio(args.domains, args.all, args.accounts, args.concurrency)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"API Call Error while listing domains: {e}")
+            return 1
+        if not domains:
+            client.close()
+            print("No domains given (pass domain names, --all or --inventory).")
+            return 2
+        try:
+            zones, errors = fetch_zones(domains, args.concurrency, client)
+        finally:
+            client.close()
+    fetched = time.perf_counter()
+
+    resolver = dns_resolver.Resolver(args.resolver or None, timeout=args.timeout)
+    findings, stats = audit_zones(zones, resolver, allowlist, args.dns_concurrency)
+    findings.sort(key=lambda f: (f["domain"], f["name"], f["type"]))
+
+    if args.ndjson:
+        import porkbun_codec
+        with porkbun_codec.ndjson_output() as out:
+            for domain, error in sorted(errors.items()):
+                out.write({"domain": domain, "problem": "fetch-error", "detail": error})
+            for finding in findings:
+                out.write(finding)
+    else:
+        for domain, error in sorted(errors.items()):
+            print(f"[FETCH-ERROR]       {domain}: {error}")
+        for finding in findings:
+            print(f"[{finding['problem'].upper():<17}] {finding['name']} {finding['type']} "
+                  f"{finding['content']}: {finding['detail']}")
+
+    done = time.perf_counter()
+    print(f"{stats['zones']} zones, {stats['records']} records, {stats['target_records']} CNAME/ALIAS/MX records "
+          f"-> {stats['unique_targets']} distinct targets ({stats['dns_queries']} DNS queries, "
+          f"{stats['dns_cache_hits']} cache hits); zones {fetched - start:.1f}s, DNS {done - fetched:.1f}s; "
+          f"{len(findings)} findings, {len(errors)} fetch errors")
+    return 1 if findings or errors else 0
+
+
+if __name__ == "__main__":
+    import porkbun_cli
+    sys.exit(porkbun_cli.main(["audit"] + sys.argv[1:]))
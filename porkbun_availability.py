@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Bulk domain availability checks with /domain/checkDomain.
+
+checkDomain has a much stricter limit than the other endpoints (1 check per
+10 seconds per key at the time of writing), so a long candidate list is bound
+by that limit alone. This module spends it as well as possible:
+
+    - candidates are read as a stream (arguments, files or stdin), normalised
+      (lower case, IDNA/punycode, no scheme, path or trailing dot), validated
+      and deduplicated, so no check is wasted on a repeat or a typo;
+    - answers are cached on disk (append-only NDJSON) for a TTL, so re-running
+      over the same list, or resuming after Ctrl+C, only checks what is new;
+    - calls go through a token bucket reserved for this endpoint that hands out
+      one check per interval (no bursts), so no call is rejected. The rate
+      follows the `limits` object each answer carries (limit per TTL seconds);
+    - results are written as NDJSON the moment they arrive.
+
+Usage (also available as `porkbun availability ...`):
+    ./porkbun_availability.py example.com example.net
+    ./porkbun_availability.py --input candidates.txt [--ttl 3600] > results.ndjson
+    generate-names | ./porkbun_availability.py --input - | jq 'select(.available)'
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "PORKBUN_AVAILABILITY_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "porkbun", "availability.ndjson"),
+)
+DEFAULT_TTL = 3600.0       # seconds an answer is reused
+CACHE_MAX_AGE = 30 * 86400 # answers older than this are dropped when the file is compacted
+DEFAULT_LIMIT = 1          # checks per window until the API reports its limits
+DEFAULT_WINDOW = 10.0      # seconds
+DEFAULT_CONCURRENCY = 2    # calls in flight, so a slow answer does not delay the next check
+JITTER_ALLOWANCE = 0.25    # seconds added to each window, so uneven network delays never squeeze
+                           # limit + 1 arrivals into one window
+MAX_ATTEMPTS = 4           # per name, for rejected calls and connection errors
+
+_LABEL = re.compile(r"^(?!-)[a-z0-9-]{1,63}(?<!-)$")
+
+
+def normalize_domain(text):
+    """
+    Normalises a candidate: lower case, no scheme/path/port/trailing dot, IDNA (punycode) encoded.
+
+    Returns:
+        str: The normalised name.
+
+    Raises:
+        ValueError: If the result is not a valid registrable name.
+    """
+    name = text.strip().lower()
+    if "://" in name:
+        name = name.split("://", 1)[1]
+    name = name.split("/", 1)[0].split(":", 1)[0].rstrip(".")
+    try:
+        name = name.encode("idna").decode("ascii")
+    except UnicodeError:
+        raise ValueError(f"{text.strip()!r} is not a valid domain name")
+    labels = name.split(".")
+    if len(labels) < 2 or len(name) > 253 or not all(_LABEL.match(label) for label in labels) \
+            or labels[-1].isdigit():
+        raise ValueError(f"{text.strip()!r} is not a valid domain name")
+    return name
+
+
+def read_candidates(domains=(), paths=()):
+    """Yields candidate strings from arguments, then from files ('-' is stdin), skipping blanks and # comments."""
+    yield from domains
+    for path in paths:
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            for line in stream:
+                yield from (part for part in line.split("#", 1)[0].split(",") if part.strip())
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+class AvailabilityCache:
+    """
+    Answers from earlier runs, kept in an append-only NDJSON file.
+
+    Each check is appended as soon as it arrives, so an interrupted run loses
+    nothing. When the file holds more stale lines than live ones it is
+    rewritten on load.
+
+    Args:
+        path (str): Cache file.
+        ttl (float): Seconds an answer is reused; 0 disables reads (answers are still stored).
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL):
+        self.path = path or DEFAULT_CACHE_PATH
+        self.ttl = ttl
+        self.entries = {}
+        self._file = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        import porkbun_codec
+
+        lines = 0
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = porkbun_codec.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by a crash
+                    if isinstance(entry, dict) and entry.get("domain"):
+                        self.entries[entry["domain"]] = entry
+        except FileNotFoundError:
+            return
+        now = time.time()
+        self.entries = {domain: entry for domain, entry in self.entries.items()
+                        if now - entry.get("checked_at", 0) <= CACHE_MAX_AGE}
+        if lines > 2 * len(self.entries) + 100:
+            from porkbun_files import write_atomic
+            write_atomic(self.path, b"".join(porkbun_codec.dumps(entry) + b"\n" for entry in self.entries.values()))
+
+    def get(self, domain):
+        """Returns the cached answer for a name if it is younger than the TTL, else None."""
+        entry = self.entries.get(domain)
+        if entry is None or not self.ttl or time.time() - entry["checked_at"] > self.ttl:
+            return None
+        return entry
+
+    def put(self, entry):
+        """Stores an answer and appends it to the file."""
+        import porkbun_codec
+
+        with self._lock:
+            self.entries[entry["domain"]] = entry
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = open(self.path, "ab")
+            self._file.write(porkbun_codec.dumps(entry) + b"\n")
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CheckPacer:
+    """
+    Token bucket reserved for checkDomain: one check per interval, no bursts.
+
+    Spacing every call by (window + JITTER_ALLOWANCE) / limit keeps any sliding
+    window of the API within the limit. update() adopts the limits the API reports.
+
+    Args:
+        limit (int): Checks allowed per window.
+        window (float): Window in seconds.
+    """
+
+    def __init__(self, limit=DEFAULT_LIMIT, window=DEFAULT_WINDOW):
+        from porkbun_api import TokenBucket
+
+        self.limit, self.window = limit, window
+        self.bucket = TokenBucket(self._rate(), burst=1)
+        self.waited = 0.0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def _rate(self):
+        return self.limit / (self.window + JITTER_ALLOWANCE)
+
+    @property
+    def interval(self):
+        """Seconds between two checks."""
+        return 1 / self._rate()
+
+    def acquire(self):
+        """Blocks until the next check may be sent."""
+        waited = self.bucket.acquire()
+        with self._lock:
+            self.waited += waited
+
+    def reject(self):
+        """Counts a call the API rejected for exceeding the limit (the next one waits a full interval)."""
+        with self._lock:
+            self.rejected += 1
+
+    def update(self, limits):
+        """Adopts a `limits` object from a checkDomain answer ({"TTL": "10", "limit": "1", ...})."""
+        try:
+            limit, window = int(limits["limit"]), float(limits["TTL"])
+        except (KeyError, TypeError, ValueError):
+            return
+        if limit > 0 and window > 0 and (limit, window) != (self.limit, self.window):
+            self.limit, self.window = limit, window
+            self.bucket.set_rate(self._rate(), burst=1)
+
+
+def _is_rate_limited(error):
+    import requests
+
+    response = getattr(error, "response", None)
+    if isinstance(error, requests.exceptions.HTTPError) and response is not None:
+        return response.status_code in (429, 503)
+    return isinstance(error, ValueError) and "limit" in str(error).lower()
+
+
+def check_domain(client, pacer, domain):
+    """
+    Checks one name, retrying rejected calls and connection errors after the next interval.
+
+    Returns:
+        dict: domain, available, premium, price, regular_price, first_year_promo, type, checked_at
+              (or domain and error).
+    """
+    import requests
+
+    error = None
+    for attempt in range(MAX_ATTEMPTS):
+        pacer.acquire()
+        try:
+            data = client.request(f"/domain/checkDomain/{domain}", {})
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = str(e)
+            continue
+        except (requests.exceptions.RequestException, ValueError) as e:
+            if _is_rate_limited(e):
+                error = str(e)
+                pacer.reject()
+                continue
+            return {"domain": domain, "error": str(e), "checked_at": time.time()}
+        pacer.update(data.get("limits"))
+        answer = data.get("response") or {}
+        return {
+            "domain": domain,
+            "available": answer.get("avail") == "yes",
+            "premium": answer.get("premium") == "yes",
+            "price": answer.get("price"),
+            "regular_price": answer.get("regularPrice"),
+            "first_year_promo": answer.get("firstYearPromo") == "yes",
+            "type": answer.get("type"),
+            "checked_at": time.time(),
+        }
+    return {"domain": domain, "error": f"Gave up after {MAX_ATTEMPTS} attempts: {error}", "checked_at": time.time()}
+
+
+def check_many(candidates, cache, on_result, pacer=None, concurrency=DEFAULT_CONCURRENCY, client=None):
+    """
+    Checks a stream of candidates: normalised, deduplicated, cached answers first, the rest paced.
+
+    Args:
+        candidates (iterable): Candidate strings (read lazily).
+        cache (AvailabilityCache): Disk cache (new answers are added to it).
+        on_result (callable): Called with each result dict as it arrives ("cached" is set on each).
+        pacer (CheckPacer, optional): Rate pacing (default: 1 check per 10 s until the API says otherwise).
+        concurrency (int): Checks in flight.
+        client (porkbun_api.PorkbunClient, optional): Client to use (default: a new one, without retries).
+
+    Returns:
+        dict: Counts: candidates, duplicates, invalid, cached, checked, errors, available, rejected.
+    """
+    from porkbun_api import PorkbunClient
+
+    pacer = pacer or CheckPacer()
+    own_client = client is None
+    if own_client:
+        client = PorkbunClient(pool_size=concurrency, retries=0)  # check_domain retries at the paced rate
+    stats = dict.fromkeys(("candidates", "duplicates", "invalid", "cached", "checked", "errors", "available"), 0)
+    seen = set()
+
+    def emit(result, cached):
+        stats["cached" if cached else "checked"] += 1
+        stats["errors"] += "error" in result
+        stats["available"] += bool(result.get("available"))
+        on_result({**result, "cached": cached})
+
+    def collect(done):
+        for future in done:
+            result = future.result()
+            if "error" not in result:
+                cache.put(result)
+            emit(result, False)
+
+    pending = set()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for text in candidates:
+                stats["candidates"] += 1
+                try:
+                    domain = normalize_domain(text)
+                except ValueError as e:
+                    stats["invalid"] += 1
+                    on_result({"domain": text.strip(), "error": str(e), "cached": False})
+                    continue
+                if domain in seen:
+                    stats["duplicates"] += 1
+                    continue
+                seen.add(domain)
+                entry = cache.get(domain)
+                if entry is not None:
+                    emit(entry, True)
+                    continue
+                pending.add(executor.submit(check_domain, client, pacer, domain))
+                # Keep reading ahead only a little, so a huge stream is not held in memory
+                while len(pending) >= concurrency * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+    except BaseException:
+        for future in pending:
+            future.cancel()  # do not spend checks on queued names after Ctrl+C
+        raise
+    finally:
+        if own_client:
+            client.close()
+    stats["rejected"] = pacer.rejected
+    return stats
+
+
+# --- Command line (argument parsing lives in porkbun_cli) ---
+
+def run_command(args):
+    """Runs `porkbun availability` as parsed by porkbun_cli."""
+    import porkbun_codec
+
+    paths = list(args.input)
+    if not args.domains and not paths:
+        if sys.stdin.isatty():
+            print("No candidates given (pass names, --input FILE or pipe them to stdin).")
+            return 2
+        paths = ["-"]
+    try:
+        cache = AvailabilityCache(args.cache, 0 if args.refresh else args.ttl)
+    except OSError as e:
+        print(f"Cannot read the cache {args.cache or DEFAULT_CACHE_PATH}: {e}")
+        return 1
+    pacer = CheckPacer(args.limit, args.window)
+    print(f"Checking at {pacer.limit} per {pacer.window:g}s (one every {pacer.interval:.1f}s) "
+          f"until the API reports its limits; answers cached for {args.ttl:g}s in {cache.path}", file=sys.stderr)
+
+    start = time.perf_counter()
+    out = porkbun_codec.ndjson_output(batch_size=1)  # one line per answer, as it arrives
+    try:
+        stats = check_many(read_candidates(args.domains, paths), cache, out.write, pacer, args.concurrency)
+    except OSError as e:
+        print(f"Cannot read candidates: {e}")
+        return 1
+    except KeyboardInterrupt:
+        print("Interrupted; answers so far are cached, run again to resume.")
+        return 130
+    finally:
+        out.flush()
+        cache.close()
+    print(f"{stats['candidates']} candidates ({stats['duplicates']} duplicates, {stats['invalid']} invalid): "
+          f"{stats['cached']} cached, {stats['checked']} checked in {time.perf_counter() - start:.1f}s "
+          f"({stats['rejected']} rejected calls, {stats['errors']} errors), {stats['available']} available")
+    return 1 if stats["errors"] else 0
+
+
+if __name__ == "__main__":
+    import porkbun_cli
+    sys.exit(porkbun_cli.main(["availability"] + sys.argv[1:]))
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Connection broker: short-lived scripts send their API calls to a running daemon.
+
+Every script run starts a new interpreter and, without a broker, a new TCP and
+TLS connection to the API. When the daemon (porkbun_daemon.py) is running,
+make_porkbun_request sends the call over the daemon's Unix socket instead. The
+daemon answers it with its warm keep-alive connections and its global budget
+(ahead of queued jobs), and serves repeated reads from a short-lived cache.
+When no daemon is listening, the call goes straight to the API as before.
+
+The daemon only serves callers with the same API key as its own. A caller with
+another key falls back to direct calls. The key is compared by fingerprint and
+never sent over the socket. Set PORKBUN_BROKER=off to always call the API
+directly.
+
+Protocol (one JSON object per line on the daemon socket):
+    -> {"op": "request", "endpoint": "/dns/retrieve/example.com", "payload": {}, "key_id": "..."}
+    <- {"ok": true, "body": "<raw API response>", "cached": false}
+    <- {"ok": false, "kind": "api" | "http" | "timeout" | "connection" | "request", "error": "...", "status": 503}
+    <- {"ok": false, "declined": true, "error": "..."}   (different key: call the API directly)
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+DEFAULT_SOCKET_PATH = os.environ.get(
+    "PORKBUN_DAEMON_SOCKET",
+    os.path.join(os.path.expanduser("~"), ".cache", "porkbun", "daemon.sock"),
+)
+DEFAULT_CACHE_TTL = 15.0   # seconds a read is served from the daemon's cache
+CALL_TIMEOUT = 180.0       # seconds to wait for the daemon (queueing behind the budget included)
+RETRY_INTERVAL = 5.0       # after a failed connect, call the API directly for this long
+
+# Endpoint prefixes that only read; everything else is a write and invalidates the domain's cached reads
+READ_ENDPOINTS = (
+    "/dns/retrieve/", "/dns/retrieveByNameType/", "/domain/getNs/", "/domain/getUrlForwarding/",
+    "/domain/listAll", "/ssl/retrieve/", "/pricing/get",
+)
+UNCACHED_ENDPOINTS = ("/ping", "/domain/checkDomain/")  # neither cached nor invalidating
+
+
+def key_id(api_key):
+    """Short fingerprint of an API key, so the daemon can check the caller's key without seeing it."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12] if api_key else None
+
+
+def is_read(endpoint):
+    """True for endpoints that do not change anything."""
+    return endpoint.startswith(READ_ENDPOINTS) or endpoint.startswith(UNCACHED_ENDPOINTS)
+
+
+def _scope(endpoint):
+    """Invalidation scope of an endpoint: its domain (third path segment), or '*' for account-wide ones."""
+    parts = [part for part in endpoint.split("/") if part]
+    return parts[2].lower() if len(parts) >= 3 else "*"
+
+
+class ReadCache:
+    """
+    Thread-safe TTL cache of raw read responses, kept by the daemon.
+
+    A write to a domain drops that domain's cached reads. A read that was in
+    flight during the write is not stored afterwards (per-domain generations).
+    Writes that bypass the daemon are noticed through external_generation: an
+    entry is only served while it returns what it returned before the fetch.
+
+    Args:
+        ttl (float): Seconds a response is served; 0 disables the cache.
+        max_entries (int): Oldest entries are dropped beyond this size.
+        external_generation (callable, optional): external_generation(endpoint) returns a
+            value that changes whenever the endpoint's domain is written by any process.
+    """
+
+    def __init__(self, ttl=DEFAULT_CACHE_TTL, max_entries=10000, external_generation=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.external_generation = external_generation
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}       # (endpoint, payload key) -> (expires, body, external generation)
+        self._generations = {}   # scope -> count of writes seen
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(endpoint, payload):
+        return endpoint, tuple(sorted((str(k), str(v)) for k, v in payload.items()))
+
+    def _external(self, endpoint):
+        return self.external_generation(endpoint) if self.external_generation is not None else None
+
+    def generation(self, endpoint):
+        """Current write generation of the endpoint's domain (pass it to put())."""
+        external = self._external(endpoint)
+        with self._lock:
+            return self._generations.get(_scope(endpoint), 0), self._generations.get("*", 0), external
+
+    def get(self, endpoint, payload):
+        """Returns the cached raw body of a read, or None."""
+        if not self.ttl or not endpoint.startswith(READ_ENDPOINTS):
+            return None
+        key = self._key(endpoint, payload)
+        external = self._external(endpoint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic() and entry[2] == external:
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+            self.misses += 1
+        return None
+
+    def put(self, endpoint, payload, body, generation):
+        """Stores a read's raw body unless the domain was written since generation() was taken."""
+        if not self.ttl or not endpoint.startswith(READ_ENDPOINTS):
+            return
+        with self._lock:
+            current = self._generations.get(_scope(endpoint), 0), self._generations.get("*", 0)
+            if current != generation[:2]:
+                return
+            if len(self._entries) >= self.max_entries:
+                for key in list(self._entries)[:len(self._entries) // 10 + 1]:
+                    del self._entries[key]
+            self._entries[self._key(endpoint, payload)] = (time.monotonic() + self.ttl, body, generation[2])
+
+    def invalidate(self, endpoint):
+        """Drops the cached reads a write to endpoint may have changed."""
+        if is_read(endpoint):
+            return
+        scope = _scope(endpoint)
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+            for key in [key for key in self._entries
+                        if scope == "*" or _scope(key[0]) in (scope, "*")]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def describe_error(error):
+    """Turns an exception from PorkbunClient.request into the fields of an error reply."""
+    import requests
+
+    reply = {"error": str(error)}
+    if isinstance(error, requests.exceptions.HTTPError):
+        reply["kind"] = "http"
+        response = getattr(error, "response", None)
+        if response is not None:
+            reply["status"] = response.status_code
+    elif isinstance(error, requests.exceptions.Timeout):
+        reply["kind"] = "timeout"
+    elif isinstance(error, requests.exceptions.ConnectionError):
+        reply["kind"] = "connection"
+    elif isinstance(error, requests.exceptions.RequestException):
+        reply["kind"] = "request"
+    else:
+        reply["kind"] = "api"
+    return reply
+
+
+def _raise_error(reply):
+    """Raises the exception described by an error reply (same types as a direct call)."""
+    import requests
+
+    kind, message = reply.get("kind"), reply.get("error", "Unknown broker error")
+    if kind == "http":
+        response = requests.models.Response()
+        response.status_code = reply.get("status")
+        raise requests.exceptions.HTTPError(message, response=response)
+    if kind == "timeout":
+        raise requests.exceptions.Timeout(message)
+    if kind == "connection":
+        raise requests.exceptions.ConnectionError(message)
+    if kind == "request":
+        raise requests.exceptions.RequestException(message)
+    raise ValueError(message)
+
+
+# --- Client side (used by porkbun_api.make_porkbun_request) ---
+
+_local = threading.local()      # one socket connection per thread, reused across calls
+_state = {"retry_at": 0.0, "declined": set()}
+
+
+def enabled():
+    """False if PORKBUN_BROKER is set to off/0/no."""
+    return os.environ.get("PORKBUN_BROKER", "").lower() not in ("off", "0", "no", "false")
+
+
+def _connect(socket_path):
+    import socket
+
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.settimeout(CALL_TIMEOUT)
+        conn.connect(socket_path)
+    except OSError:
+        conn.close()
+        raise
+    _local.conn, _local.reader = conn, conn.makefile("rb")
+    return conn
+
+
+def _disconnect():
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        _local.reader.close()
+        conn.close()
+    _local.conn = _local.reader = None
+
+
+def request(endpoint, payload, credentials, socket_path=None):
+    """
+    Sends one API call through the daemon if one is listening.
+
+    Args:
+        endpoint (str): API endpoint, e.g. '/ping'.
+        payload (dict): Request payload without the keys.
+        credentials (tuple): (API_KEY, SECRET_KEY) the caller would use.
+        socket_path (str, optional): Daemon socket (default: DEFAULT_SOCKET_PATH).
+
+    Returns:
+        PorkbunResponse or None: The response, or None if the call must go directly to the API
+        (no daemon, broker disabled or declined).
+
+    Raises:
+        requests.exceptions.RequestException, ValueError: As make_porkbun_request, when the daemon
+            made the call and it failed.
+    """
+    import porkbun_codec
+
+    caller_key = key_id(credentials[0])
+    socket_path = socket_path or DEFAULT_SOCKET_PATH
+    if caller_key is None or caller_key in _state["declined"] or time.monotonic() < _state["retry_at"]:
+        return None
+
+    message = porkbun_codec.dumps({"op": "request", "endpoint": endpoint, "payload": payload,
+                                   "key_id": caller_key}) + b"\n"
+    for attempt in range(2):
+        reused = getattr(_local, "conn", None) is not None
+        try:
+            conn = _local.conn if reused else _connect(socket_path)
+        except OSError:
+            _state["retry_at"] = time.monotonic() + RETRY_INTERVAL
+            return None
+        try:
+            conn.sendall(message)
+        except OSError:
+            _disconnect()
+            if reused:
+                continue  # the daemon restarted since the last call; nothing was sent
+            _state["retry_at"] = time.monotonic() + RETRY_INTERVAL
+            return None
+        try:
+            line = _local.reader.readline()
+        except OSError as e:
+            line, error = b"", e
+        else:
+            error = None
+        if line:
+            break
+        _disconnect()
+        if isinstance(error, TimeoutError):
+            import requests
+            raise requests.exceptions.Timeout(f"No answer from the daemon within {CALL_TIMEOUT:g}s")
+        if not is_read(endpoint):
+            # The daemon may have made the call before going away; do not repeat a write
+            import requests
+            raise requests.exceptions.ConnectionError(f"The daemon closed the connection during {endpoint}")
+        _state["retry_at"] = time.monotonic() + RETRY_INTERVAL
+        return None
+    else:
+        return None
+
+    reply = porkbun_codec.loads(line)
+    if reply.get("ok"):
+        return porkbun_codec.decode_response(reply["body"].encode("utf-8"))
+    if reply.get("declined") or "kind" not in reply:
+        _state["declined"].add(caller_key)  # e.g. another account's key; stop asking this daemon
+        return None
+    _raise_error(reply)
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Unified `porkbun` command line with one subcommand per numbered script.
+
+Only argparse is imported up front. A subcommand loads its script (and with it
+requests, python-dotenv and the ~/.env credentials) only when it actually runs,
+so `porkbun --help`, `porkbun <command> --help` and usage errors start fast.
+
+Usage:
+    ./porkbun --help
+    ./porkbun ping
+    ./porkbun check-record yourdomain.com --debug
+    ./porkbun verify-ns yourdomain.com --interval 300 --profile
+    ./porkbun inventory refresh && ./porkbun inventory has-record _apitest TXT
+"""
+
+import argparse
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_python_script(filename, script_args):
+    """
+    Runs a numbered Python script as if it were executed directly.
+
+    The working directory is switched to the repository so scripts find
+    08_dns_check_record_text.txt wherever `porkbun` is invoked from.
+
+    Args:
+        filename (str): Script file name in the repository directory.
+        script_args (list): Arguments passed to the script (sys.argv[1:]).
+
+    Returns:
+        int: Exit status.
+    """
+    import runpy
+
+    path = os.path.join(REPO_DIR, filename)
+    previous_cwd = os.getcwd()
+    sys.argv = [path] + list(script_args)
+    os.chdir(REPO_DIR)
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    finally:
+        os.chdir(previous_cwd)
+    return 0
+
+
+def run_shell_script(filename, script_args):
+    """Runs one of the numbered bash scripts from the repository directory."""
+    import subprocess
+
+    return subprocess.call(["bash", os.path.join(REPO_DIR, filename)] + list(script_args), cwd=REPO_DIR)
+
+
+def profile_args(args):
+    """Translates --profile/--profile-out into script arguments (paths made absolute)."""
+    extra = []
+    if getattr(args, "profile", False):
+        extra.append("--profile")
+    if getattr(args, "profile_out", None):
+        extra.append(f"--profile-out={os.path.abspath(args.profile_out)}")
+    return extra
+
+
+def add_profile_arguments(parser):
+    """Adds the --profile options understood by the numbered Python scripts."""
+    parser.add_argument("--profile", action="store_true", help="Print a per-phase latency summary of API requests")
+    parser.add_argument("--profile-out", metavar="FILE", help="Also dump cProfile stats to FILE")
+
+
+# Subcommand name -> (script, help, takes a domain argument)
+SCRIPT_COMMANDS = {
+    "ping": ("06_try_ping_endpoint.py", "Check API credentials with /ping", False),
+    "list-domains": ("07_list_all_domains.py", "List all domains in the account", False),
+    "create-check-record": ("09_create_dns_check_record.py", "Create the test record from 08_dns_check_record_text.txt", True),
+    "verify-create": ("10_verify_create_dns_check_record.sh", "Verify the test record has propagated", True),
+    "delete-check-record": ("11_delete_dns_check_record.py", "Delete the test record", True),
+    "check-record": ("12_check_delete_dns_check_record.py", "Check via the API whether the test record exists", True),
+    "verify-delete": ("13_verify_delete_dns_check_record.sh", "Verify the test record deletion has propagated", True),
+    "change-ns": ("14_change_name_servers_to_cloudflare.py", "Switch the domain's nameservers to Cloudflare", True),
+    "verify-ns": ("15_verify_name_server_propagation.py", "Monitor Cloudflare nameserver propagation worldwide", True),
+}
+
+
+def command_script(args):
+    """Handler for the script-backed subcommands."""
+    filename = SCRIPT_COMMANDS[args.command][0]
+    script_args = [args.domain] if getattr(args, "domain", None) else []
+    if getattr(args, "raw", False):
+        script_args.append("--raw")
+    if getattr(args, "ndjson", False):
+        script_args.append("--ndjson")
+    if args.command == "check-record" and args.debug:
+        script_args.append("--debug")
+    if args.command == "verify-ns":
+        script_args += [str(args.interval), str(args.timeout)]
+        if args.ecs:
+            script_args.append("--ecs")
+        script_args += [f"--ecs-resolver={resolver}" for resolver in args.ecs_resolver]
+    if filename.endswith(".sh"):
+        return run_shell_script(filename, script_args)
+    return run_python_script(filename, script_args + profile_args(args))
+
+
+def command_inventory(args):
+    """Handler for `porkbun inventory ...` (see porkbun_inventory.py)."""
+    import porkbun_inventory
+    return porkbun_inventory.run_command(args)
+
+
+def add_inventory_parser(subparsers):
+    """Adds the `inventory` subcommand and its actions."""
+    inventory = subparsers.add_parser(
+        "inventory", help="Local SQLite inventory of domains, records and nameservers",
+        description="Query a local SQLite inventory of domains, records and nameservers, "
+                    "refreshed incrementally from the API (porkbun_inventory.py).",
+    )
+    inventory.add_argument("--db", help="Database file (default: ~/.cache/porkbun/inventory.sqlite3 "
+                                        "or $PORKBUN_INVENTORY_DB)")
+    actions = inventory.add_subparsers(dest="action", metavar="<action>")
+    actions.required = True
+
+    refresh = actions.add_parser("refresh", help="Re-list domains and fetch stale zones from the API")
+    refresh.add_argument("--max-age", type=float, default=3600,
+                         help="Refetch zones older than this many seconds; 0 refetches all (default: 3600)")
+    refresh.add_argument("--concurrency", type=int, default=8, help="Zone fetches in flight (default: 8)")
+    refresh.add_argument("--limit", type=int, help="Fetch at most N zones this run (stalest first)")
+    refresh.add_argument("--no-list", action="store_true", help="Skip /domain/listAll and only refetch stale zones")
+
+    has_record = actions.add_parser("has-record", help="Domains that have a record with this subdomain and type")
+    has_record.add_argument("subdomain", help="Subdomain ('' for the apex), e.g. _apitest")
+    has_record.add_argument("type", help="Record type, e.g. TXT")
+    has_record.add_argument("--content", help="Also require this exact content")
+
+    not_on_ns = actions.add_parser("not-on-ns", help="Domains with any nameserver outside a suffix")
+    not_on_ns.add_argument("--suffix", default=".ns.cloudflare.com",
+                           help="Expected nameserver suffix (default: .ns.cloudflare.com)")
+
+    records = actions.add_parser("records", help="Find records by domain, subdomain, type and content")
+    records.add_argument("--domain")
+    records.add_argument("--subdomain")
+    records.add_argument("--type")
+    records.add_argument("--content")
+
+    stats = actions.add_parser("stats", help="Counts of domains, records, stale and failed zones")
+    stats.add_argument("--max-age", type=float, default=3600, help="Staleness threshold in seconds (default: 3600)")
+
+    for action in (refresh, has_record, not_on_ns, records, stats):
+        action.set_defaults(handler=command_inventory)
+
+
+def command_pricing(args):
+    """Handler for `porkbun pricing ...` (see porkbun_pricing.py)."""
+    import porkbun_pricing
+    return porkbun_pricing.run_command(args)
+
+
+def add_pricing_parser(subparsers):
+    """Adds the `pricing` subcommand and its actions."""
+    pricing = subparsers.add_parser(
+        "pricing", help="TLD prices from /pricing/get (cached) and renewal forecasts",
+        description="Look up registration, renewal and transfer prices from a cached copy of "
+                    "/pricing/get and total the renewal cost of the account (porkbun_pricing.py).",
+    )
+    pricing.add_argument("--cache", help="Cache file (default: ~/.cache/porkbun/pricing.json or $PORKBUN_PRICING_CACHE)")
+    pricing.add_argument("--ttl", type=float,
+                         help="Refetch the catalog when the cache is older than this many seconds "
+                              "(default: 86400 or $PORKBUN_PRICING_TTL)")
+    actions = pricing.add_subparsers(dest="action", metavar="<action>")
+    actions.required = True
+
+    get = actions.add_parser("get", help="Show prices for one or more TLDs")
+    get.add_argument("tlds", nargs="+", metavar="TLD", help="TLD, e.g. com")
+
+    renewals = actions.add_parser("renewals", help="Total renewal cost of the account's domains by TLD")
+    renewals.add_argument("--within-days", type=int, help="Only domains expiring within N days")
+    renewals.add_argument("--inventory", action="store_true",
+                          help="Read the domain list from the local inventory instead of /domain/listAll")
+    renewals.add_argument("--db", help="Inventory database for --inventory")
+
+    refresh = actions.add_parser("refresh", help="Refetch the catalog now")
+
+    for action in (get, renewals, refresh):
+        action.set_defaults(handler=command_pricing)
+
+
+def command_ssl_sync(args):
+    """Handler for `porkbun ssl-sync` (see porkbun_ssl.py)."""
+    import porkbun_ssl
+    return porkbun_ssl.run_command(args)
+
+
+def add_ssl_sync_parser(subparsers):
+    """Adds the `ssl-sync` subcommand."""
+    ssl_sync = subparsers.add_parser(
+        "ssl-sync", help="Download changed SSL bundles from /ssl/retrieve",
+        description="Fetch SSL certificate bundles concurrently and write only the ones that changed, "
+                    "atomically and with mode 0600 (porkbun_ssl.py).",
+    )
+    ssl_sync.add_argument("domains", nargs="*", metavar="DOMAIN", help="Domains to sync")
+    ssl_sync.add_argument("--all", action="store_true", help="Sync every domain in the account (/domain/listAll)")
+    ssl_sync.add_argument("--accounts", action="store_true",
+                          help="Use every credential profile (porkbun_accounts.py); --all then covers all accounts")
+    ssl_sync.add_argument("--dest", required=True, help="Directory for <domain>/fullchain.pem, privkey.pem, pubkey.pem")
+    ssl_sync.add_argument("--concurrency", type=int, default=16, help="Bundles fetched in parallel (default: 16)")
+    ssl_sync.add_argument("-v", "--verbose", action="store_true", help="Also list unchanged domains")
+    ssl_sync.set_defaults(handler=command_ssl_sync)
+
+
+def command_audit(args):
+    """Handler for `porkbun audit` (see porkbun_audit.py)."""
+    import porkbun_audit
+    return porkbun_audit.run_command(args)
+
+
+def add_audit_parser(subparsers):
+    """Adds the `audit` subcommand."""
+    audit = subparsers.add_parser(
+        "audit", help="Find dangling CNAME/ALIAS/MX targets and addresses outside an allowlist",
+        description="Resolve every CNAME, ALIAS and MX target of the given zones once with the in-process "
+                    "resolver and report NXDOMAIN targets and addresses outside the allowlist (porkbun_audit.py).",
+    )
+    audit.add_argument("domains", nargs="*", metavar="DOMAIN", help="Domains to audit")
+    audit.add_argument("--all", action="store_true", help="Audit every domain in the account (/domain/listAll)")
+    audit.add_argument("--accounts", action="store_true",
+                       help="Use every credential profile (porkbun_accounts.py); --all then covers all accounts")
+    audit.add_argument("--inventory", action="store_true",
+                       help="Read zones from the local inventory snapshot instead of /dns/retrieve")
+    audit.add_argument("--db", help="Inventory database (with --inventory)")
+    audit.add_argument("--allow", action="append", default=[], metavar="CIDR",
+                       help="Allowed network or address for A/AAAA records and targets; repeatable")
+    audit.add_argument("--allowlist", action="append", default=[], metavar="FILE",
+                       help="File with one allowed network per line; repeatable")
+    audit.add_argument("--resolver", action="append", default=[], metavar="IP[:PORT]",
+                       help="DNS server to query; repeatable (default: /etc/resolv.conf)")
+    audit.add_argument("--timeout", type=float, default=3.0, help="Seconds per DNS query (default: 3)")
+    audit.add_argument("--concurrency", type=int, default=16, help="Zones fetched in parallel (default: 16)")
+    audit.add_argument("--dns-concurrency", type=int, default=64, help="Targets resolved in parallel (default: 64)")
+    audit.add_argument("--ndjson", action="store_true", help="Write findings as NDJSON to stdout")
+    audit.set_defaults(handler=command_audit)
+
+
+def command_zone(args):
+    """Handler for `porkbun zone` (see porkbun_zone.py)."""
+    import porkbun_zone
+    return porkbun_zone.run_command(args)
+
+
+def add_zone_parser(subparsers):
+    """Adds the `zone` subcommand and its actions."""
+    zone = subparsers.add_parser(
+        "zone", help="Export zones to compressed snapshots or restore them",
+        description="Back up every zone as gzip-compressed JSON and BIND files with a manifest of content hashes, "
+                    "and restore snapshots with the minimal set of API writes (porkbun_zone.py).",
+    )
+    actions = zone.add_subparsers(dest="action", metavar="<action>")
+    actions.required = True
+
+    export = actions.add_parser("export", help="Write snapshots of changed zones")
+    export.add_argument("dest", help="Snapshot directory")
+    export.add_argument("domains", nargs="*", metavar="DOMAIN", help="Domains to export")
+    export.add_argument("--all", action="store_true", help="Export every domain in the account (/domain/listAll)")
+    export.add_argument("--accounts", action="store_true",
+                        help="Use every credential profile (porkbun_accounts.py); --all then covers all accounts")
+    export.add_argument("--nameservers", action="store_true", help="Also save nameservers from /domain/getNs")
+    export.add_argument("--concurrency", type=int, default=16, help="Zones fetched in parallel (default: 16)")
+    export.add_argument("-v", "--verbose", action="store_true", help="Also list unchanged zones")
+
+    restore = actions.add_parser("restore", help="Make zones match a snapshot")
+    restore.add_argument("dest", help="Snapshot directory")
+    restore.add_argument("domains", nargs="*", metavar="DOMAIN", help="Domains to restore (default: all in the manifest)")
+    restore.add_argument("--dry-run", action="store_true", help="Only print the changes")
+    restore.add_argument("--keep-extra", action="store_true", help="Do not delete records missing from the snapshot")
+    restore.add_argument("--nameservers", action="store_true", help="Also restore saved nameservers")
+    restore.add_argument("--accounts", action="store_true",
+                         help="Send each domain's writes with the credentials of the account that owns it")
+    restore.add_argument("--concurrency", type=int, default=16, help="API calls in parallel (default: 16)")
+    zone.set_defaults(handler=command_zone)
+
+
+def command_forwards(args):
+    """Handler for `porkbun forwards` (see porkbun_forwards.py)."""
+    import porkbun_forwards
+    return porkbun_forwards.run_command(args)
+
+
+def add_forwards_parser(subparsers):
+    """Adds the `forwards` subcommand and its actions."""
+    forwards = subparsers.add_parser(
+        "forwards", help="Sync URL forwards with a desired-state file",
+        description="Make the URL forwards of many domains match a desired-state file with only the needed "
+                    "add and delete calls, or dump the current forwards (porkbun_forwards.py).",
+    )
+    actions = forwards.add_subparsers(dest="action", metavar="<action>")
+    actions.required = True
+
+    sync = actions.add_parser("sync", help="Make forwards match the file")
+    sync.add_argument("file", help="Desired-state file (JSON: domain -> list of forwards)")
+    sync.add_argument("domains", nargs="*", metavar="DOMAIN", help="Only sync these domains of the file")
+    sync.add_argument("--dry-run", action="store_true", help="Only print the changes")
+    sync.add_argument("--accounts", action="store_true",
+                      help="Send each domain's calls with the credentials of the account that owns it")
+    sync.add_argument("--concurrency", type=int, default=16, help="API calls in parallel (default: 16)")
+
+    dump = actions.add_parser("dump", help="Write the current forwards as a desired-state file")
+    dump.add_argument("domains", nargs="*", metavar="DOMAIN", help="Domains to dump")
+    dump.add_argument("--all", action="store_true",
+                      help="Every domain in the account (/domain/listAll); domains without forwards are left out")
+    dump.add_argument("--accounts", action="store_true",
+                      help="Use every credential profile (porkbun_accounts.py); --all then covers all accounts")
+    dump.add_argument("--concurrency", type=int, default=16, help="Domains fetched in parallel (default: 16)")
+    dump.add_argument("-o", "--output", help="Write to this file (atomically, mode 0600) instead of stdout")
+    for action in (sync, dump):
+        action.add_argument("--rate", type=float,
+                            help="API calls per second shared by all workers, 0 for no limit (default: 5; with "
+                                 "--accounts none, each account keeps its own PORKBUN_<NAME>_RATE budget)")
+        action.add_argument("--burst", type=float, default=10.0, help="Calls allowed at once (default: 10)")
+    forwards.set_defaults(handler=command_forwards)
+
+
+def command_daemon(args):
+    """Handler for `porkbun daemon` (see porkbun_daemon.py)."""
+    import porkbun_daemon
+    return porkbun_daemon.run_command(args)
+
+
+def add_daemon_parser(subparsers):
+    """Adds the `daemon` subcommand and its actions."""
+    daemon = subparsers.add_parser(
+        "daemon", help="Run the reconciler daemon or send it one-off jobs",
+        description="Long-running daemon that runs scheduled and submitted jobs over one pooled client "
+                    "and one global API budget (porkbun_daemon.py).",
+    )
+    daemon.add_argument("--socket", help="Control socket (default: ~/.cache/porkbun/daemon.sock or "
+                                         "PORKBUN_DAEMON_SOCKET)")
+    actions = daemon.add_subparsers(dest="action", metavar="<action>")
+    actions.required = True
+
+    run = actions.add_parser("run", help="Run the daemon in the foreground")
+    run.add_argument("--config", help="JSON config file (workers, rate, burst, schedules, ...)")
+    run.add_argument("--workers", type=int, help="Worker threads (default: 4)")
+    run.add_argument("--rate", type=float, help="Global API budget in calls per second (default: 2)")
+    run.add_argument("--burst", type=float, help="API calls allowed in a burst (default: 10)")
+    run.add_argument("--cache-ttl", type=float,
+                     help="Seconds reads brokered for scripts are cached; 0 disables (default: 15)")
+    run.add_argument("--no-schedules", action="store_true",
+                     help="Run no periodic jobs (only broker calls and submitted jobs)")
+
+    submit = actions.add_parser("submit", help="Submit a one-off job")
+    submit.add_argument("kind", help="inventory, ssl-sync, zone-export, propagation, audit or call")
+    submit.add_argument("domains", nargs="*", metavar="DOMAIN", help="Limit the job to these domains")
+    submit.add_argument("--option", action="append", default=[], metavar="KEY=VALUE",
+                        help="Job option (value parsed as JSON if possible); repeatable")
+    submit.add_argument("--priority", type=int, default=10, help="Higher runs first (default: 10)")
+    submit.add_argument("--wait", action="store_true", help="Wait for the job and print its results")
+
+    job = actions.add_parser("job", help="Show a job and its results")
+    job.add_argument("id", type=int, help="Job ID")
+    actions.add_parser("status", help="Show queue, budget, schedules and recent jobs")
+    actions.add_parser("stop", help="Stop the daemon")
+    daemon.set_defaults(handler=command_daemon)
+
+
+def command_availability(args):
+    """Handler for `porkbun availability` (see porkbun_availability.py)."""
+    import porkbun_availability
+    return porkbun_availability.run_command(args)
+
+
+def add_availability_parser(subparsers):
+    """Adds the `availability` subcommand."""
+    availability = subparsers.add_parser(
+        "availability", help="Check many candidate names with /domain/checkDomain at its rate limit",
+        description="Normalise, deduplicate and check a stream of candidate names, paced to the checkDomain "
+                    "limit, with answers cached on disk and written as NDJSON (porkbun_availability.py).",
+    )
+    availability.add_argument("domains", nargs="*", metavar="DOMAIN", help="Names to check")
+    availability.add_argument("--input", action="append", default=[], metavar="FILE",
+                              help="File with one name per line, '-' for stdin; repeatable "
+                                   "(default: stdin when no names are given)")
+    availability.add_argument("--cache", help="Cache file (default: ~/.cache/porkbun/availability.ndjson or "
+                                              "PORKBUN_AVAILABILITY_CACHE)")
+    availability.add_argument("--ttl", type=float, default=3600, help="Reuse cached answers younger than this "
+                                                                      "many seconds (default: 3600)")
+    availability.add_argument("--refresh", action="store_true", help="Check every name again, ignoring the cache")
+    availability.add_argument("--limit", type=int, default=1,
+                              help="Checks per window until the API reports its limits (default: 1)")
+    availability.add_argument("--window", type=float, default=10.0, help="Window of --limit in seconds (default: 10)")
+    availability.add_argument("--concurrency", type=int, default=2, help="Checks in flight (default: 2)")
+    availability.set_defaults(handler=command_availability)
+
+
+def command_accounts(args):
+    """Handler for `porkbun accounts` (see porkbun_accounts.py)."""
+    import porkbun_accounts
+    return porkbun_accounts.run_command(args)
+
+
+def add_accounts_parser(subparsers):
+    """Adds the `accounts` subcommand and its actions."""
+    accounts = subparsers.add_parser(
+        "accounts", help="Show credential profiles and which account owns which domain",
+        description="Credential profiles from PORKBUN_<NAME>_API_KEY/SECRET_KEY and the cached domain -> account "
+                    "map used by --accounts (porkbun_accounts.py).",
+    )
+    accounts.add_argument("--map", help="Map cache file (default: ~/.cache/porkbun/accounts.json or "
+                                        "PORKBUN_ACCOUNT_MAP)")
+    actions = accounts.add_subparsers(dest="action", metavar="<action>")
+    actions.required = True
+    actions.add_parser("list", help="Show profiles, their budgets and domain counts")
+    owner = actions.add_parser("owner", help="Show the account that owns each domain")
+    owner.add_argument("domains", nargs="+", metavar="DOMAIN", help="Domains to look up")
+    actions.add_parser("refresh", help="Rebuild the map from every account's /domain/listAll")
+    accounts.set_defaults(handler=command_accounts)
+
+
+def build_parser():
+    """Builds the argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="porkbun",
+        description="Porkbun API v3 client tools.",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="<command>")
+    subparsers.required = True
+
+    for name, (filename, help_text, takes_domain) in SCRIPT_COMMANDS.items():
+        sub = subparsers.add_parser(name, help=help_text, description=f"{help_text} ({filename}).")
+        if takes_domain:
+            sub.add_argument("domain", help="Domain name, e.g. yourdomain.com")
+        if name in ("ping", "list-domains"):
+            sub.add_argument("--raw", action="store_true", help="Print the API response body untouched (no re-formatting)")
+        if name in ("list-domains", "check-record"):
+            sub.add_argument("--ndjson", action="store_true",
+                             help="Write one compact JSON object per domain/record per line (messages go to stderr)")
+        if name == "check-record":
+            sub.add_argument("--debug", action="store_true", help="Verbose output including the raw API response")
+        if name == "verify-ns":
+            sub.add_argument("--interval", type=int, default=0, help="Re-check every N seconds (default: single check)")
+            sub.add_argument("--timeout", type=int, default=5, help="Timeout per DNS query in seconds (default: 5)")
+            sub.add_argument("--ecs", action="store_true",
+                             help="Ask a few ECS-capable resolvers on behalf of client subnets in every region")
+            sub.add_argument("--ecs-resolver", action="append", default=[], metavar="IP[:PORT]",
+                             help="ECS resolver to use instead of the defaults; repeatable (implies --ecs)")
+        if filename.endswith(".py"):
+            add_profile_arguments(sub)
+        sub.set_defaults(handler=command_script)
+
+    add_inventory_parser(subparsers)
+    add_pricing_parser(subparsers)
+    add_ssl_sync_parser(subparsers)
+    add_audit_parser(subparsers)
+    add_zone_parser(subparsers)
+    add_daemon_parser(subparsers)
+    add_accounts_parser(subparsers)
+    add_availability_parser(subparsers)
+    add_forwards_parser(subparsers)
+    return parser
+
+
+def main(argv=None):
+    """Entry point for the `porkbun` command."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
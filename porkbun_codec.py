@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Pluggable JSON codec for API responses and script output.
+
+Uses orjson or msgspec when installed and falls back to the standard library.
+Decoding works straight from the response bytes. API responses keep their
+original body (PorkbunResponse.raw), so scripts can print it untouched rather
+than re-serialising it when no transformation is needed. NdjsonWriter streams
+one compact object per line for --ndjson output.
+
+Force a backend with PORKBUN_JSON_CODEC=orjson|msgspec|json.
+"""
+
+import os
+import sys
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+_backend = None  # (name, loads, dumps, dumps_pretty), resolved on first use
+
+
+def _load_backend(name):
+    """Returns (loads, dumps, dumps_pretty) for a backend, or raises ImportError."""
+    if name == "orjson":
+        import orjson
+
+        def dumps_pretty(obj):
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+        return orjson.loads, orjson.dumps, dumps_pretty
+
+    if name == "msgspec":
+        import msgspec
+        encoder = msgspec.json.Encoder()
+        decoder = msgspec.json.Decoder()
+
+        def loads(data):
+            try:
+                return decoder.decode(data)
+            except msgspec.DecodeError as e:
+                raise ValueError(str(e))
+
+        def dumps_pretty(obj):
+            return msgspec.json.format(encoder.encode(obj), indent=2).decode("utf-8")
+        return loads, encoder.encode, dumps_pretty
+
+    if name == "json":
+        import json
+
+        def dumps(obj):
+            return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+        def dumps_pretty(obj):
+            return json.dumps(obj, indent=2)
+        return json.loads, dumps, dumps_pretty
+
+    raise ImportError(f"Unknown JSON codec: {name}")
+
+
+def backend():
+    """
+    Resolves the codec on first use.
+
+    Returns:
+        tuple: (name, loads, dumps, dumps_pretty)
+    """
+    global _backend
+    if _backend is None:
+        forced = os.environ.get("PORKBUN_JSON_CODEC")
+        for name in ([forced] if forced else BACKENDS):
+            try:
+                _backend = (name,) + _load_backend(name)
+                break
+            except ImportError:
+                continue
+        if _backend is None:
+            _backend = ("json",) + _load_backend("json")
+    return _backend
+
+
+def backend_name():
+    """Returns the name of the active codec ('orjson', 'msgspec' or 'json')."""
+    return backend()[0]
+
+
+def loads(data):
+    """
+    Decodes JSON from bytes or str.
+
+    Raises:
+        ValueError: If the data is not valid JSON (for every backend).
+    """
+    return backend()[1](data)
+
+
+def dumps(obj):
+    """Encodes to compact JSON bytes."""
+    return backend()[2](obj)
+
+
+def dumps_pretty(obj):
+    """Encodes to indented JSON text (like json.dumps(obj, indent=2))."""
+    return backend()[3](obj)
+
+
+class PorkbunResponse(dict):
+    """
+    A decoded API response that also keeps the undecoded body in `.raw`,
+    so it can be written out untouched.
+    """
+
+    __slots__ = ("raw",)
+
+    def __init__(self, data, raw=None):
+        super().__init__(data)
+        self.raw = raw
+
+
+def decode_response(body):
+    """
+    Decodes an API response body.
+
+    Args:
+        body (bytes): Raw response body.
+
+    Returns:
+        PorkbunResponse: The decoded object (a dict) with the body kept in .raw.
+
+    Raises:
+        ValueError: If the body is not a JSON object.
+    """
+    data = loads(body)
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    return PorkbunResponse(data, raw=body)
+
+
+def print_json(data, raw=False, stream=None):
+    """
+    Prints JSON output for a script.
+
+    Args:
+        data: The object to print (a PorkbunResponse for raw passthrough).
+        raw (bool): Write the original response body unchanged when available,
+            skipping re-serialisation entirely.
+        stream: Text stream to write to (default: sys.stdout).
+    """
+    stream = stream if stream is not None else sys.stdout
+    body = getattr(data, "raw", None) if raw else None
+    if body is None:
+        stream.write(dumps_pretty(data) + "\n")
+        return
+    binary = getattr(stream, "buffer", None)
+    if binary is None:
+        stream.write(body.decode("utf-8") + "\n")
+        return
+    stream.flush()
+    binary.write(body)
+    binary.write(b"\n")
+    binary.flush()
+
+
+def pop_flag(flag):
+    """Removes a boolean flag (e.g. '--raw') from sys.argv and returns whether it was present."""
+    if flag not in sys.argv[1:]:
+        return False
+    sys.argv = [sys.argv[0]] + [arg for arg in sys.argv[1:] if arg != flag]
+    return True
+
+
+class NdjsonWriter:
+    """
+    Writes one compact JSON object per line (NDJSON), flushing every
+    batch_size lines so consumers can start work before the output ends.
+
+    Example:
+        with NdjsonWriter() as out:
+            for domain in page:
+                out.write(domain)
+    """
+
+    def __init__(self, stream=None, batch_size=500):
+        stream = stream if stream is not None else sys.stdout
+        self._binary = getattr(stream, "buffer", None)
+        self._stream = stream
+        self.batch_size = batch_size
+        self.count = 0
+        self._pending = []
+
+    def write(self, obj):
+        """Queues one object; writes the batch out when it is full."""
+        self._pending.append(dumps(obj))
+        self.count += 1
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Writes all queued lines and flushes the stream."""
+        if self._pending:
+            data = b"\n".join(self._pending) + b"\n"
+            self._pending = []
+            if self._binary is not None:
+                self._stream.flush()
+                self._binary.write(data)
+                self._binary.flush()
+            else:
+                self._stream.write(data.decode("utf-8"))
+        self._stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+
+def ndjson_output(batch_size=500):
+    """
+    Sets a script up for NDJSON output: returns a writer on stdout and sends
+    everything else the script prints to stderr, so stdout carries only NDJSON.
+    """
+    writer = NdjsonWriter(sys.stdout, batch_size)
+    sys.stdout = sys.stderr
+    return writer
@@ -0,0 +1,799 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Long-running reconciler daemon with one pooled client and a global API budget.
+
+Instead of cron starting each script cold (and overlapping runs exceeding the
+rate limit), the daemon runs every job through:
+
+    - one PorkbunClient (keep-alive connection pool, retries on 429/503),
+    - one token bucket that every API call must pass (the global budget),
+      handing out tokens to the highest-priority waiting call first,
+    - one DNS resolver cache (dns_resolver.Resolver),
+    - a scheduler with priorities and fair sharing across domains: within a
+      priority level, tasks are served round-robin by domain, so a large job
+      cannot starve a small one and one domain cannot hog the workers.
+
+Periodic jobs come from the config file (see DEFAULT_SCHEDULES) and start with
+random jitter. A periodic job is skipped while its previous run is still going,
+so runs never overlap. One-off jobs are submitted over a Unix control socket
+(newline-delimited JSON, mode 0600).
+
+The daemon is also a connection broker (porkbun_broker.py): while it runs,
+make_porkbun_request in every script sends its calls over the socket, so they
+use the warm connections and the budget (ahead of jobs), and repeated reads
+are answered from a short-lived cache that writes invalidate.
+
+Job kinds:
+    inventory    list domains and refetch stale zones into the local inventory
+    ssl-sync     sync SSL bundles (option dest, domains or all)
+    zone-export  snapshot changed zones like `porkbun zone export` (options dest, nameservers)
+    propagation  compare each domain's NS answers with the nameservers in the inventory
+    audit        porkbun_audit over the inventory snapshot (option allow: list of CIDRs)
+    call         one API call (options endpoint, payload); the response is the result
+
+Usage (also available as `porkbun daemon ...`):
+    ./porkbun_daemon.py [--socket PATH] run [--config daemon.json] [--workers 4] [--rate 2 --burst 10]
+                                            [--cache-ttl 15] [--no-schedules]
+    ./porkbun_daemon.py submit ssl-sync example.com --option dest=/etc/ssl/porkbun --wait
+    ./porkbun_daemon.py status
+    ./porkbun_daemon.py stop
+"""
+
+import heapq
+import itertools
+import os
+import random
+import signal
+import socket
+import sys
+import threading
+import time
+
+from porkbun_broker import DEFAULT_CACHE_TTL, DEFAULT_SOCKET_PATH
+
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 2.0     # API calls per second across all jobs
+DEFAULT_BURST = 10.0
+DEFAULT_JITTER = 0.1   # periodic runs are spread by +/- this fraction of their interval
+ONE_OFF_PRIORITY = 10  # submitted jobs run ahead of periodic ones by default
+BROKER_PRIORITY = 20   # calls brokered for scripts run ahead of all jobs
+KEEP_FINISHED = 100    # finished jobs kept for `status`
+ACCOUNT = "*"          # fairness key of tasks that are not about one domain
+
+# Used when no config file is given
+DEFAULT_SCHEDULES = [
+    {"kind": "inventory", "every": 3600, "priority": 1},
+    {"kind": "propagation", "every": 900, "priority": 0},
+]
+
+
+def log(message):
+    """Prints a timestamped log line."""
+    print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {message}", flush=True)
+
+
+class Scheduler:
+    """
+    Thread-safe task queue ordered by priority (higher first), fair across domains.
+
+    Within a priority, each domain has a virtual clock that advances by one per
+    queued task; tasks are served in virtual-time order, which interleaves
+    domains round-robin (start-time fair queueing). A domain that shows up late
+    starts at the current virtual time instead of jumping ahead of everyone.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._clock = {}     # domain -> virtual time of its next task
+        self._now = 0        # virtual time of the last task served
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, priority, domain, task):
+        with self._cond:
+            start = max(self._clock.get(domain, 0), self._now)
+            self._clock[domain] = start + 1
+            heapq.heappush(self._heap, (-priority, start, next(self._seq), task))
+            self._cond.notify()
+
+    def get(self):
+        """Returns the next task, blocking until there is one; None once closed."""
+        with self._cond:
+            while not self._heap and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return None
+            _, start, _, task = heapq.heappop(self._heap)
+            self._now = max(self._now, start)
+            return task
+
+    def close(self):
+        """Drops queued tasks and wakes all waiting workers (get() returns None from now on).
+
+        Returns:
+            int: Number of tasks dropped.
+        """
+        with self._cond:
+            dropped = len(self._heap)
+            self._heap.clear()
+            self._closed = True
+            self._cond.notify_all()
+        return dropped
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap)
+
+
+class PriorityBudget:
+    """
+    Global API budget: a token bucket that hands out tokens in priority order.
+
+    Callers waiting for a token are served highest priority first (FIFO within
+    a priority), so a one-off job does not queue behind a bulk refresh that is
+    already waiting on the budget. The priority is per thread (set_priority).
+    Usable as a PorkbunClient rate_limiter.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = max(float(burst if burst is not None else rate), 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._local = threading.local()
+
+    def set_priority(self, priority):
+        """Sets the priority of calls made from the current thread."""
+        self._local.priority = priority
+
+    def acquire(self, tokens=1.0):
+        """Takes tokens, waiting for higher-priority callers first.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        entry = (-getattr(self._local, "priority", 0), next(self._seq))
+        start = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self._waiters[0] == entry and self.tokens >= tokens:
+                    heapq.heappop(self._waiters)
+                    self.tokens -= tokens
+                    self._cond.notify_all()  # the next waiter becomes the head
+                    waited = now - start
+                    self.waited += waited
+                    return waited
+                if self._waiters[0] == entry:
+                    self._cond.wait((tokens - self.tokens) / self.rate)
+                else:
+                    self._cond.wait()
+
+
+class Job:
+    """
+    A unit of work made of per-domain tasks. Tasks may add further tasks.
+
+    Attributes:
+        id (int), kind (str), priority (int), options (dict), source ('schedule' or 'socket')
+        results (list): One dict per finished task.
+        errors (int): Tasks that failed.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, kind, priority=0, options=None, source="socket"):
+        self.id = next(Job._ids)
+        self.kind = kind
+        self.priority = priority
+        self.options = options or {}
+        self.source = source
+        self.results = []
+        self.errors = 0
+        self.pending = 0
+        self.tasks = 0
+        self.created = time.time()
+        self.finished = None
+        self.finish_hook = None  # called once with the job when the last task is done
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+
+    def summary(self, with_results=False):
+        with self._lock:
+            data = {
+                "id": self.id, "kind": self.kind, "priority": self.priority, "source": self.source,
+                "status": "done" if self.done.is_set() else "running",
+                "tasks": self.tasks, "pending": self.pending, "errors": self.errors,
+                "created": self.created, "finished": self.finished,
+            }
+            if with_results:
+                data["results"] = list(self.results)
+        return data
+
+
+class Daemon:
+    """
+    Owns the shared client, budget, resolver, scheduler and worker threads.
+
+    Args:
+        workers (int): Worker threads (also the connection pool size).
+        rate (float): Global API budget in calls per second.
+        burst (float): Calls allowed in a burst.
+        schedules (list): Periodic job specs: {"kind", "every" (s), "priority", "jitter", "options"}.
+        socket_path (str): Control socket path.
+        inventory_db (str, optional): Inventory database for inventory/propagation/audit jobs.
+        resolvers (list, optional): DNS servers for propagation and audit jobs.
+        cache_ttl (float): Seconds brokered reads are cached; 0 disables the cache.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, burst=DEFAULT_BURST, schedules=(),
+                 socket_path=DEFAULT_SOCKET_PATH, inventory_db=None, resolvers=None, cache_ttl=DEFAULT_CACHE_TTL):
+        import dns_resolver
+        import porkbun_broker
+        import porkbun_shared_cache
+        from porkbun_api import PorkbunClient, load_credentials
+
+        self.budget = PriorityBudget(rate, burst)
+        self.client = PorkbunClient(pool_size=workers, retries=3, rate_limiter=self.budget)
+        # Keyed on the shared-cache generations, so writes made without the daemon drop cached reads too
+        self.cache = porkbun_broker.ReadCache(cache_ttl, external_generation=lambda endpoint: (
+            porkbun_shared_cache.domain_generation(endpoint, load_credentials())))
+        self.brokered = 0
+        self.resolver = dns_resolver.Resolver(resolvers or None)
+        self.scheduler = Scheduler()
+        self.workers = workers
+        self.schedules = [dict(spec) for spec in schedules]
+        self.socket_path = socket_path
+        self.inventory_db = inventory_db
+        self.jobs = {}
+        self.started = time.time()
+        self._jobs_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+        self._server = None
+
+    # --- Jobs ---
+
+    def submit(self, kind, priority=ONE_OFF_PRIORITY, options=None, source="socket"):
+        """
+        Creates a job and queues its first tasks.
+
+        Raises:
+            ValueError: For an unknown job kind.
+        """
+        planner = JOB_KINDS.get(kind)
+        if planner is None:
+            raise ValueError(f"Unknown job kind {kind!r} (known: {', '.join(sorted(JOB_KINDS))})")
+        job = Job(kind, priority, options, source)
+        with self._jobs_lock:
+            self.jobs[job.id] = job
+            finished = [j for j in self.jobs.values() if j.done.is_set()]
+            for old in sorted(finished, key=lambda j: j.id)[:max(0, len(finished) - KEEP_FINISHED)]:
+                del self.jobs[old.id]
+        with job._lock:
+            job.pending += 1  # held while planning, so the job cannot finish early
+        try:
+            planner(self, job)
+        finally:
+            self._task_done(job, None)
+        return job
+
+    def add_task(self, job, domain, function):
+        """Queues function() as a task of job, scheduled fairly under the key domain."""
+        with job._lock:
+            job.pending += 1
+            job.tasks += 1
+        self.scheduler.put(job.priority, domain or ACCOUNT, (job, function))
+
+    def _task_done(self, job, result):
+        with job._lock:
+            if result is not None:
+                job.results.append(result)
+                if result.get("error"):
+                    job.errors += 1
+            job.pending -= 1
+            last = job.pending == 0
+        if not last:
+            return
+        if job.finish_hook is not None:
+            try:
+                job.finish_hook(job)
+            except Exception as e:
+                with job._lock:
+                    job.errors += 1
+                log(f"job {job.id} ({job.kind}) failed to finish: {e}")
+        with job._lock:
+            job.finished = time.time()
+        job.done.set()
+        log(f"job {job.id} ({job.kind}) done: {job.tasks} tasks, {job.errors} errors "
+            f"in {job.finished - job.created:.1f}s")
+
+    def _worker(self):
+        while True:
+            task = self.scheduler.get()
+            if task is None:
+                return
+            job, function = task
+            self.budget.set_priority(job.priority)
+            try:
+                result = function()
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            self._task_done(job, result)
+
+    # --- Periodic schedules ---
+
+    def _run_schedules(self):
+        now = time.monotonic()
+        for spec in self.schedules:
+            # Spread the first runs so jobs do not all start at once
+            spec["next"] = now + random.uniform(0, spec["every"] * spec.get("jitter", DEFAULT_JITTER))
+            spec["job"] = None
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for spec in self.schedules:
+                if now < spec["next"]:
+                    continue
+                jitter = spec.get("jitter", DEFAULT_JITTER)
+                spec["next"] = now + spec["every"] * random.uniform(1 - jitter, 1 + jitter)
+                if spec["job"] is not None and not spec["job"].done.is_set():
+                    log(f"skipping {spec['kind']}: job {spec['job'].id} is still running")
+                    continue
+                try:
+                    spec["job"] = self.submit(spec["kind"], spec.get("priority", 0), spec.get("options"), "schedule")
+                except Exception as e:
+                    log(f"cannot start {spec['kind']}: {e}")
+            wait = min((spec["next"] for spec in self.schedules), default=now + 60) - time.monotonic()
+            self._stop.wait(max(0.05, min(wait, 60)))
+
+    # --- Broker ---
+
+    def broker_request(self, request):
+        """Makes one API call for make_porkbun_request in another process (op 'request')."""
+        import porkbun_broker
+        from porkbun_api import load_credentials
+
+        endpoint, payload = request.get("endpoint"), request.get("payload") or {}
+        if not isinstance(endpoint, str) or not endpoint.startswith("/") or not isinstance(payload, dict):
+            return {"ok": False, "kind": "api", "error": "request needs an endpoint and a payload object"}
+        own_key = porkbun_broker.key_id(load_credentials()[0])
+        if own_key is None or request.get("key_id") != own_key:
+            return {"ok": False, "declined": True, "error": "The daemon uses a different API key"}
+        with self._jobs_lock:
+            self.brokered += 1
+        body = self.cache.get(endpoint, payload)
+        if body is not None:
+            return {"ok": True, "body": body, "cached": True}
+
+        generation = self.cache.generation(endpoint)
+        self.budget.set_priority(BROKER_PRIORITY)
+        try:
+            response = self.client.request(endpoint, payload)
+        except Exception as e:
+            return {"ok": False, **porkbun_broker.describe_error(e)}
+        finally:
+            self.cache.invalidate(endpoint)  # a failed write may still have been applied
+        body = response.raw.decode("utf-8")
+        self.cache.put(endpoint, payload, body, generation)
+        return {"ok": True, "body": body, "cached": False}
+
+    # --- Control socket ---
+
+    def status(self):
+        """Snapshot of the daemon state for the `status` request."""
+        with self._jobs_lock:
+            jobs = [job.summary() for job in self.jobs.values()]
+        return {
+            "uptime": time.time() - self.started,
+            "queued_tasks": len(self.scheduler),
+            "budget": {"rate": self.budget.rate, "burst": self.budget.capacity, "waited": self.budget.waited},
+            "dns_cache": {"queries": self.resolver.queries_sent, "hits": self.resolver.cache_hits},
+            "broker": {"calls": self.brokered, "cache_ttl": self.cache.ttl, "cache_entries": len(self.cache),
+                       "cache_hits": self.cache.hits, "cache_misses": self.cache.misses},
+            "schedules": [{"kind": spec["kind"], "every": spec["every"], "priority": spec.get("priority", 0),
+                           "next_in": max(0.0, spec.get("next", 0) - time.monotonic())}
+                          for spec in self.schedules],
+            "jobs": jobs,
+        }
+
+    def handle_request(self, request):
+        """Answers one control request (a dict); returns the response dict."""
+        op = request.get("op")
+        if op == "status":
+            return {"ok": True, **self.status()}
+        if op == "job":
+            job = self.jobs.get(request.get("id"))
+            if job is None:
+                return {"ok": False, "error": f"No job {request.get('id')}"}
+            return {"ok": True, **job.summary(with_results=True)}
+        if op == "submit":
+            try:
+                job = self.submit(request.get("kind"), int(request.get("priority", ONE_OFF_PRIORITY)),
+                                  request.get("options") or {})
+            except (ValueError, TypeError) as e:
+                return {"ok": False, "error": str(e)}
+            if request.get("wait"):
+                job.done.wait(request.get("timeout"))
+            return {"ok": True, **job.summary(with_results=bool(request.get("wait")))}
+        if op == "request":
+            return self.broker_request(request)
+        if op == "stop":
+            self._stop.set()
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown op {op!r}"}
+
+    def _serve_connection(self, conn):
+        import porkbun_codec
+
+        with conn, conn.makefile("rb") as reader:
+            for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    request = porkbun_codec.loads(line)
+                    response = self.handle_request(request if isinstance(request, dict) else {})
+                except ValueError as e:
+                    response = {"ok": False, "error": f"Invalid request: {e}"}
+                try:
+                    body = porkbun_codec.dumps(response)
+                except (TypeError, ValueError) as e:
+                    body = porkbun_codec.dumps({"ok": False, "error": f"Cannot encode the response: {e}"})
+                conn.sendall(body + b"\n")
+
+    def _serve_socket(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def _bind_socket(self):
+        directory = os.path.dirname(os.path.abspath(self.socket_path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            try:
+                send_control({"op": "status"}, self.socket_path, timeout=2)
+            except OSError:
+                os.unlink(self.socket_path)  # left behind by a daemon that died
+            else:
+                raise RuntimeError(f"Another daemon is listening on {self.socket_path}")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)  # socket file is created with mode 0600
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        self._server = server
+
+    # --- Lifecycle ---
+
+    def run(self):
+        """Runs until stop() is called, SIGTERM/SIGINT is received or a `stop` request arrives."""
+        self._bind_socket()
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        threading.Thread(target=self._serve_socket, daemon=True).start()
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: self._stop.set())
+        log(f"daemon listening on {self.socket_path}: {self.workers} workers, budget {self.budget.rate:g} "
+            f"calls/s (burst {self.budget.capacity:g}), {len(self.schedules)} schedules")
+        try:
+            self._run_schedules()
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        self._stop.set()
+
+    def shutdown(self):
+        """Stops accepting work, drops queued tasks, waits for running ones and closes connections."""
+        self._stop.set()
+        if self._server is not None:
+            self._server.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+        dropped = self.scheduler.close()
+        for thread in self._threads:
+            thread.join()
+        self.client.close()
+        log(f"daemon stopped ({dropped} queued tasks dropped)")
+
+
+# --- Job kinds: each planner queues the job's first tasks ---
+
+def _list_domains(daemon):
+    from porkbun_api import iter_domain_pages
+    return [info["domain"] for page in iter_domain_pages(request=daemon.client) for info in page if info.get("domain")]
+
+
+def _inventory_domains(daemon):
+    import porkbun_inventory
+    conn = porkbun_inventory.open_inventory(daemon.inventory_db)
+    try:
+        return [row[0] for row in conn.execute("SELECT domain FROM domains ORDER BY domain")]
+    finally:
+        conn.close()
+
+
+def plan_inventory(daemon, job):
+    """Re-lists domains, then fetches each stale zone as its own task; results are stored when all are done."""
+    import porkbun_inventory
+
+    # The fetched DnsRecord lists stay out of job.results, which must remain JSON for `daemon job <id>`
+    fetched = {}
+    fetched_lock = threading.Lock()
+    max_age = float(job.options.get("max_age", porkbun_inventory.DEFAULT_MAX_AGE))
+
+    def list_and_plan():
+        conn = porkbun_inventory.open_inventory(daemon.inventory_db)
+        try:
+            listed, added, removed = porkbun_inventory.sync_domain_list(conn, request=daemon.client)
+            stale = porkbun_inventory.stale_domains(conn, max_age, job.options.get("limit"))
+        finally:
+            conn.close()
+        for domain in stale:
+            daemon.add_task(job, domain, lambda domain=domain: fetch(domain))
+        return {"listed": listed, "added": added, "removed": removed, "stale": len(stale)}
+
+    def fetch(domain):
+        domain, records, nameservers, error = porkbun_inventory.fetch_domain(domain, request=daemon.client)
+        with fetched_lock:
+            fetched[domain] = (records, nameservers)
+        return {"domain": domain, "records": len(records or ()), "error": error}
+
+    def store(job):
+        conn = porkbun_inventory.open_inventory(daemon.inventory_db)
+        try:
+            with conn:
+                for result in job.results:
+                    if result.get("domain") in fetched:
+                        records, nameservers = fetched.pop(result["domain"])
+                        result["changed"] = porkbun_inventory.store_domain(
+                            conn, result["domain"], records, nameservers, result["error"])
+        finally:
+            conn.close()
+
+    job.finish_hook = store
+    daemon.add_task(job, ACCOUNT, list_and_plan)
+
+
+def plan_ssl_sync(daemon, job):
+    """One porkbun_ssl.sync_domain task per domain (all account domains unless 'domains' is given)."""
+    import porkbun_ssl
+
+    dest = job.options.get("dest")
+    if not dest:
+        raise ValueError("ssl-sync needs the option dest")
+    os.makedirs(dest, mode=porkbun_ssl.DIR_MODE, exist_ok=True)
+
+    def queue(domains):
+        for domain in domains:
+            daemon.add_task(job, domain, lambda domain=domain: porkbun_ssl.sync_domain(daemon.client, domain, dest))
+        return {"listed": len(domains)}
+
+    if job.options.get("domains"):
+        queue(job.options["domains"])
+    else:
+        daemon.add_task(job, ACCOUNT, lambda: queue(_list_domains(daemon)))
+
+
+def plan_zone_export(daemon, job):
+    """One porkbun_zone.export_domain task per domain; the manifest is written when all are done."""
+    import porkbun_zone
+
+    dest = job.options.get("dest")
+    if not dest:
+        raise ValueError("zone-export needs the option dest")
+    os.makedirs(dest, mode=0o700, exist_ok=True)
+    manifest = porkbun_zone.read_manifest(dest)
+    nameservers = bool(job.options.get("nameservers"))
+
+    def export(domain):
+        known = (manifest["domains"].get(domain) or {}).get("sha256")
+        return porkbun_zone.export_domain(daemon.client, domain, dest, known, nameservers)
+
+    def queue(domains):
+        for domain in domains:
+            daemon.add_task(job, domain, lambda domain=domain: export(domain))
+        return {"listed": len(domains)}
+
+    def write_manifest(job):
+        changed = [r for r in job.results if r.get("status") in ("created", "updated")]
+        for result in changed:
+            manifest["domains"][result["domain"]] = {"sha256": result["sha256"], "records": result["records"],
+                                                     "exported_at": result["exported_at"]}
+        if changed:
+            porkbun_zone.write_manifest(dest, manifest)
+
+    job.finish_hook = write_manifest
+    if job.options.get("domains"):
+        queue(job.options["domains"])
+    else:
+        daemon.add_task(job, ACCOUNT, lambda: queue(_list_domains(daemon)))
+
+
+def plan_propagation(daemon, job):
+    """Resolves each domain's NS records and compares them with the nameservers in the inventory."""
+    import porkbun_inventory
+
+    conn = porkbun_inventory.open_inventory(daemon.inventory_db)
+    try:
+        expected = {}
+        for domain, ns in conn.execute("SELECT domain, ns FROM nameservers ORDER BY domain, position"):
+            expected.setdefault(domain, set()).add(ns)
+    finally:
+        conn.close()
+    domains = job.options.get("domains") or sorted(expected)
+    override = {porkbun_inventory.normalize_ns(ns) for ns in job.options.get("nameservers") or []}
+
+    def check(domain):
+        want = override or expected.get(domain, set())
+        answer = daemon.resolver.lookup(domain, "NS")
+        if answer.rcode is None:
+            return {"domain": domain, "error": answer.error}
+        have = {porkbun_inventory.normalize_ns(ns) for ns in answer.values}
+        return {"domain": domain, "propagated": bool(want) and have == want,
+                "nameservers": sorted(have), "expected": sorted(want), "rcode": answer.rcode_name}
+
+    for domain in domains:
+        daemon.add_task(job, domain, lambda domain=domain: check(domain))
+
+
+def plan_audit(daemon, job):
+    """Runs porkbun_audit over the inventory snapshot with the daemon's resolver cache."""
+    import porkbun_audit
+
+    def audit():
+        zones = porkbun_audit.load_snapshot_zones(job.options.get("domains"), daemon.inventory_db)
+        allowlist = porkbun_audit.parse_networks(job.options.get("allow") or [])
+        findings, stats = porkbun_audit.audit_zones(zones, daemon.resolver, allowlist)
+        return {"findings": findings, **stats}
+
+    daemon.add_task(job, ACCOUNT, audit)
+
+
+def plan_call(daemon, job):
+    """One API call through the shared client and budget."""
+    endpoint = job.options.get("endpoint")
+    if not endpoint or not str(endpoint).startswith("/"):
+        raise ValueError("call needs the option endpoint, e.g. /ping")
+    payload = job.options.get("payload") or {}
+    daemon.add_task(job, job.options.get("domain") or ACCOUNT,
+                    lambda: {"endpoint": endpoint, "response": dict(daemon.client.request(endpoint, payload))})
+
+
+JOB_KINDS = {
+    "inventory": plan_inventory,
+    "ssl-sync": plan_ssl_sync,
+    "zone-export": plan_zone_export,
+    "propagation": plan_propagation,
+    "audit": plan_audit,
+    "call": plan_call,
+}
+
+
+# --- Control client ---
+
+def send_control(request, socket_path=None, timeout=None):
+    """
+    Sends one request to a running daemon and returns its response.
+
+    Raises:
+        OSError: If no daemon is listening.
+        ValueError: If the response is not valid JSON.
+    """
+    import porkbun_codec
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout)
+        conn.connect(socket_path or DEFAULT_SOCKET_PATH)
+        conn.sendall(porkbun_codec.dumps(request) + b"\n")
+        with conn.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ValueError("The daemon closed the connection without answering")
+    return porkbun_codec.loads(line)
+
+
+# --- Command line (argument parsing lives in porkbun_cli) ---
+
+def load_config(path):
+    """Reads a JSON config file: workers, rate, burst, socket, inventory_db, resolvers, cache_ttl, schedules."""
+    import porkbun_codec
+
+    with open(path, "rb") as f:
+        config = porkbun_codec.loads(f.read())
+    for spec in config.get("schedules", []):
+        if spec.get("kind") not in JOB_KINDS or float(spec.get("every", 0)) <= 0:
+            raise ValueError(f"Invalid schedule {spec!r}: needs a known kind and every > 0")
+    return config
+
+
+def _parse_option(text):
+    """KEY=VALUE from --option; the value is parsed as JSON when possible, else kept as a string."""
+    import porkbun_codec
+
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise ValueError(f"Expected KEY=VALUE, got {text!r}")
+    try:
+        return key, porkbun_codec.loads(value)
+    except ValueError:
+        return key, value
+
+
+def run_command(args):
+    """Runs a `daemon` subcommand parsed by porkbun_cli."""
+    import porkbun_codec
+
+    if args.action == "run":
+        try:
+            config = load_config(args.config) if args.config else {}
+        except (OSError, ValueError) as e:
+            print(f"Invalid config: {e}")
+            return 2
+        daemon = Daemon(
+            workers=args.workers or config.get("workers", DEFAULT_WORKERS),
+            rate=args.rate or config.get("rate", DEFAULT_RATE),
+            burst=args.burst or config.get("burst", DEFAULT_BURST),
+            schedules=[] if args.no_schedules else config.get("schedules", DEFAULT_SCHEDULES),
+            socket_path=args.socket or config.get("socket", DEFAULT_SOCKET_PATH),
+            inventory_db=config.get("inventory_db"),
+            resolvers=config.get("resolvers"),
+            cache_ttl=args.cache_ttl if args.cache_ttl is not None else config.get("cache_ttl", DEFAULT_CACHE_TTL),
+        )
+        try:
+            daemon.run()
+        except RuntimeError as e:
+            print(e)
+            return 1
+        return 0
+
+    if args.action == "submit":
+        try:
+            options = dict(_parse_option(option) for option in args.option)
+        except ValueError as e:
+            print(e)
+            return 2
+        if args.domains:
+            options["domains"] = args.domains
+        request = {"op": "submit", "kind": args.kind, "priority": args.priority, "options": options,
+                   "wait": args.wait}
+    elif args.action == "job":
+        request = {"op": "job", "id": args.id}
+    else:
+        request = {"op": args.action}
+
+    try:
+        response = send_control(request, args.socket)
+    except OSError as e:
+        print(f"Cannot reach the daemon at {args.socket or DEFAULT_SOCKET_PATH}: {e}")
+        return 1
+    except ValueError as e:
+        print(f"Invalid answer from the daemon at {args.socket or DEFAULT_SOCKET_PATH}: {e}")
+        return 1
+    porkbun_codec.print_json(response)
+    return 0 if response.get("ok") and not response.get("errors") else 1
+
+
+if __name__ == "__main__":
+    import porkbun_cli
+    sys.exit(porkbun_cli.main(["daemon"] + sys.argv[1:]))
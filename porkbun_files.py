@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+File helpers shared by the modules that keep state on disk (SSL bundles, zone
+snapshots, the pricing and availability caches, the account map, forward dumps).
+"""
+
+import os
+import tempfile
+
+FILE_MODE = 0o600
+
+
+def write_atomic(path, data, mode=FILE_MODE):
+    """
+    Writes bytes to path atomically: temporary file in the same directory, fsync, rename.
+
+    The temporary file is created with the final mode, so the content is never
+    readable with looser permissions.
+    """
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            os.fchmod(f.fileno(), mode)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
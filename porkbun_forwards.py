@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Bulk URL-forward sync from a desired-state file.
+
+The file maps each managed domain to the complete list of its forwards:
+
+    {
+      "example.com": [
+        {"subdomain": "", "location": "https://example.net", "type": "permanent", "wildcard": true},
+        {"subdomain": "blog", "location": "https://blog.example.net", "includePath": true}
+      ],
+      "example.org": []
+    }
+
+type defaults to "permanent", includePath and wildcard to "no" (booleans or
+"yes"/"no"). A domain with an empty list has all its forwards removed; domains
+missing from the file are not touched.
+
+sync fetches the current forwards of every domain in the file concurrently
+(/domain/getUrlForwarding, one read per domain), compares them with the file
+and makes only the writes needed. The API has no edit call, so a changed
+forward is deleted and added again. A subdomain can only have one forward, so
+each domain's writes run in order in one task, with a changed forward's delete
+right before its add; domains are written concurrently. Every call goes
+through one token bucket shared by all workers (with --accounts, only if --rate
+is given; otherwise each account's own budget applies). A run where nothing changed
+makes one read per domain and no writes.
+
+dump writes the current forwards in the same format, as a starting point.
+
+Usage (also available as `porkbun forwards ...`):
+    ./porkbun_forwards.py sync forwards.json [--dry-run] [--concurrency 16] [--rate 5 --burst 10]
+    ./porkbun_forwards.py sync forwards.json example.com      # only the listed domains of the file
+    ./porkbun_forwards.py dump --all -o forwards.json [--rate 5 --burst 10]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_RATE = 5.0  # API calls per second across all workers (single account)
+FORWARD_TYPES = ("permanent", "temporary")
+
+
+def _flag(value, field):
+    """Normalises an includePath/wildcard value to 'yes' or 'no'."""
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    text = str(value).strip().lower()
+    if text in ("yes", "no"):
+        return text
+    raise ValueError(f"{field} must be yes/no or true/false, not {value!r}")
+
+
+def normalize_forward(forward, domain):
+    """
+    Returns a forward in the API's form: subdomain, location, type, includePath, wildcard.
+
+    The subdomain may be given as '', '@', a label or the full name.
+
+    Raises:
+        ValueError: For a missing location or an invalid type or flag.
+    """
+    if not isinstance(forward, dict):
+        raise ValueError(f"a forward must be an object, not {forward!r}")
+    subdomain = str(forward.get("subdomain") or "").strip().strip(".").lower()
+    if subdomain in ("@", domain):
+        subdomain = ""
+    elif subdomain.endswith("." + domain):
+        subdomain = subdomain[:-len(domain) - 1]
+    location = str(forward.get("location") or "").strip()
+    if not location:
+        raise ValueError(f"forward for '{subdomain or domain}' has no location")
+    forward_type = str(forward.get("type") or "permanent").strip().lower()
+    if forward_type not in FORWARD_TYPES:
+        raise ValueError(f"forward for '{subdomain or domain}' has type {forward_type!r} "
+                         f"(expected {' or '.join(FORWARD_TYPES)})")
+    return {
+        "subdomain": subdomain,
+        "location": location,
+        "type": forward_type,
+        "includePath": _flag(forward.get("includePath", "no"), "includePath"),
+        "wildcard": _flag(forward.get("wildcard", "no"), "wildcard"),
+    }
+
+
+def _identity(forward):
+    return forward["subdomain"], forward["location"], forward["type"], forward["includePath"], forward["wildcard"]
+
+
+def load_desired(path):
+    """
+    Reads and validates a desired-state file.
+
+    Returns:
+        dict: domain -> list of normalised forwards.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If it is not valid (the message names the domain).
+    """
+    import porkbun_codec
+
+    with open(path, "rb") as f:
+        data = porkbun_codec.loads(f.read())
+    if not isinstance(data, dict):
+        raise ValueError("the file must hold an object mapping domains to lists of forwards")
+    desired = {}
+    for domain, forwards in data.items():
+        domain = domain.strip().rstrip(".").lower()
+        if not isinstance(forwards, list):
+            raise ValueError(f"{domain}: expected a list of forwards")
+        try:
+            normalized = [normalize_forward(forward, domain) for forward in forwards]
+        except ValueError as e:
+            raise ValueError(f"{domain}: {e}")
+        subdomains = [forward["subdomain"] for forward in normalized]
+        duplicates = sorted({s or "@" for s in subdomains if subdomains.count(s) > 1})
+        if duplicates:
+            raise ValueError(f"{domain}: more than one forward for {', '.join(duplicates)}")
+        desired[domain] = normalized
+    return desired
+
+
+def plan_forwards(desired, current):
+    """
+    Computes the writes that turn the current forwards into the desired ones.
+
+    Args:
+        desired (list): Normalised forwards.
+        current (list): Forwards from /domain/getUrlForwarding (with IDs).
+
+    Returns:
+        list: Operations ('delete', current forward, None) and ('add', None, desired forward).
+    """
+    unmatched = {}
+    for forward in current:
+        unmatched.setdefault(_identity(normalize_forward(forward, "")), []).append(forward)
+    adds = []
+    for forward in desired:
+        candidates = unmatched.get(_identity(forward))
+        if candidates:
+            candidates.pop()
+        else:
+            adds.append(("add", None, forward))
+    deletes = [("delete", forward, None) for forwards in unmatched.values() for forward in forwards]
+    return deletes + adds
+
+
+def _limited(client, rate_limiter):
+    """A request callable that passes the shared rate limiter before every call."""
+    if rate_limiter is None:
+        return client
+
+    def request(endpoint, payload):
+        rate_limiter.acquire()
+        return client(endpoint, payload)
+    return request
+
+
+def fetch_forwards(domains, concurrency=DEFAULT_CONCURRENCY, client=None, rate_limiter=None):
+    """
+    Fetches the forwards of many domains concurrently (one read per domain).
+
+    Returns:
+        tuple: ({domain: [forward dicts]}, {domain: error message})
+    """
+    import requests
+    from porkbun_api import PorkbunClient, get_url_forwards
+
+    own_client = client is None
+    if own_client:
+        client = PorkbunClient(pool_size=concurrency, retries=2)
+    request = _limited(client, rate_limiter)
+
+    def fetch(domain):
+        try:
+            return domain, get_url_forwards(domain, request), None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return domain, None, str(e)
+
+    forwards, errors = {}, {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for domain, current, error in executor.map(fetch, domains):
+                if error is None:
+                    forwards[domain] = current
+                else:
+                    errors[domain] = error
+    finally:
+        if own_client:
+            client.close()
+    return forwards, errors
+
+
+def _apply(request, domain, operation):
+    """Makes one write; returns the error message, or None."""
+    import requests
+    from porkbun_api import add_url_forward, delete_url_forward
+
+    action, old, new = operation
+    try:
+        if action == "delete":
+            delete_url_forward(domain, old["id"], request)
+        else:
+            add_url_forward(domain, new, request)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return str(e)
+    return None
+
+
+def _sync_domain(request, domain, operations):
+    """
+    Applies one domain's plan in order and returns its errors.
+
+    A replaced forward is deleted right before its new version is added, so it is
+    only missing between those two calls. If the delete fails, the add is skipped
+    (the subdomain still has its old forward). If the add fails, the old forward
+    is added back.
+    """
+    deletes = [operation for operation in operations if operation[0] == "delete"]
+    replaced, fresh = [], []
+    for add in (operation for operation in operations if operation[0] == "add"):
+        delete = next((d for d in deletes if normalize_forward(d[1], "")["subdomain"] == add[2]["subdomain"]), None)
+        if delete is None:
+            fresh.append(add)
+        else:
+            deletes.remove(delete)
+            replaced.append((delete, add))
+
+    errors = []
+    for operation in deletes:
+        error = _apply(request, domain, operation)
+        if error is not None:
+            errors.append((domain, operation, error))
+    for delete, add in replaced:
+        error = _apply(request, domain, delete)
+        if error is not None:
+            errors.append((domain, delete, error))
+            errors.append((domain, add, "skipped: the old forward could not be deleted"))
+            continue
+        error = _apply(request, domain, add)
+        if error is not None:
+            restore = ("add", None, normalize_forward(delete[1], ""))
+            restore_error = _apply(request, domain, restore)
+            errors.append((domain, add, error + ("; the old forward was restored" if restore_error is None
+                                                 else f"; restoring the old forward failed too: {restore_error}")))
+    for operation in fresh:
+        error = _apply(request, domain, operation)
+        if error is not None:
+            errors.append((domain, operation, error))
+    return errors
+
+
+def sync_forwards(desired, concurrency=DEFAULT_CONCURRENCY, client=None, rate_limiter=None, dry_run=False):
+    """
+    Makes the forwards of every domain in desired match it.
+
+    Args:
+        desired (dict): domain -> list of normalised forwards (see load_desired).
+        concurrency (int): Domains fetched and written in parallel.
+        client (PorkbunClient or AccountPool, optional): Client to use (closed only if created here).
+        rate_limiter (TokenBucket, optional): Limiter every call passes, shared by all workers.
+        dry_run (bool): Only compute the plans.
+
+    Returns:
+        tuple: (plans {domain: [operations]}, errors [(domain, operation or None, message)])
+    """
+    from porkbun_api import PorkbunClient
+
+    own_client = client is None
+    if own_client:
+        client = PorkbunClient(pool_size=concurrency, retries=2)
+    request = _limited(client, rate_limiter)
+
+    try:
+        current, fetch_errors = fetch_forwards(list(desired), concurrency, client, rate_limiter)
+        errors = [(domain, None, error) for domain, error in fetch_errors.items()]
+        plans = {}
+        for domain, forwards in current.items():
+            try:
+                plans[domain] = plan_forwards(desired[domain], forwards)
+            except ValueError as e:
+                errors.append((domain, None, f"Unexpected forward from the API: {e}"))
+        if not dry_run:
+            # One task per domain, so each domain's writes run in order (see _sync_domain)
+            work = [(domain, operations) for domain, operations in plans.items() if operations]
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                for domain_errors in executor.map(lambda item: _sync_domain(request, *item), work):
+                    errors.extend(domain_errors)
+    finally:
+        if own_client:
+            client.close()
+    return plans, errors
+
+
+# --- Command line (argument parsing lives in porkbun_cli) ---
+
+def _describe(operation):
+    action, old, new = operation
+    forward = normalize_forward(old, "") if action == "delete" else new
+    options = [forward["type"]] + [name for name in ("includePath", "wildcard") if forward[name] == "yes"]
+    sign = "-" if action == "delete" else "+"
+    return f"{sign} {forward['subdomain'] or '@'} -> {forward['location']} ({', '.join(options)})"
+
+
+def _rate_limiter(args):
+    """The shared bucket for --rate. With --accounts there is none unless --rate is given, so the
+    per-account budgets of the AccountPool apply instead of one budget for all accounts."""
+    from porkbun_api import TokenBucket
+
+    rate = args.rate if args.rate is not None else (0 if args.accounts else DEFAULT_RATE)
+    return TokenBucket(rate, args.burst) if rate > 0 else None
+
+
+def _run_sync(args, start):
+    import requests
+    import porkbun_accounts
+
+    try:
+        desired = load_desired(args.file)
+    except (OSError, ValueError) as e:
+        print(f"Invalid desired-state file {args.file}: {e}")
+        return 2
+    if args.domains:
+        missing = [domain for domain in args.domains if domain.lower() not in desired]
+        if missing:
+            print(f"Not in {args.file}: {', '.join(missing)}")
+            return 2
+        desired = {domain.lower(): desired[domain.lower()] for domain in args.domains}
+    if not desired:
+        print(f"No domains in {args.file}.")
+        return 2
+
+    try:
+        client, _ = porkbun_accounts.portfolio((), False, args.accounts, args.concurrency)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(e)
+        return 2
+    try:
+        plans, errors = sync_forwards(desired, args.concurrency, client, _rate_limiter(args), args.dry_run)
+    finally:
+        client.close()
+
+    writes = 0
+    for domain in sorted(plans):
+        if plans[domain]:
+            print(f"{domain}:")
+            for operation in plans[domain]:
+                print(f"  {_describe(operation)}")
+        writes += len(plans[domain])
+    for domain, operation, error in errors:
+        what = f" ({_describe(operation)})" if operation else ""
+        print(f"[ERROR] {domain}{what}: {error}")
+    verb = "would be made" if args.dry_run else "made"
+    changed = sum(1 for operations in plans.values() if operations)
+    print(f"{len(plans)} domains compared, {changed} differ: {writes} writes {verb}, {len(errors)} errors "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 1 if errors else 0
+
+
+def _run_dump(args, start):
+    import requests
+    import porkbun_accounts
+    import porkbun_codec
+
+    try:
+        client, domains = porkbun_accounts.portfolio(args.domains, args.all, args.accounts, args.concurrency)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"API Call Error while listing domains: {e}")
+        return 1
+    if not domains:
+        client.close()
+        print("No domains given (pass domain names or --all).")
+        return 2
+    try:
+        current, errors = fetch_forwards(domains, args.concurrency, client, _rate_limiter(args))
+    finally:
+        client.close()
+
+    state = {}
+    for domain, forwards in sorted(current.items()):
+        try:
+            state[domain] = [normalize_forward(forward, domain) for forward in forwards]
+        except ValueError as e:
+            errors[domain] = f"Unexpected forward from the API: {e}"
+    if args.all:
+        state = {domain: forwards for domain, forwards in state.items() if forwards}
+    data = porkbun_codec.dumps_pretty(state).encode("utf-8") + b"\n"
+    if args.output:
+        from porkbun_files import write_atomic
+        write_atomic(args.output, data)
+    else:
+        sys.stdout.buffer.write(data)
+        sys.stdout.flush()
+    for domain, error in sorted(errors.items()):
+        print(f"[ERROR] {domain}: {error}", file=sys.stderr)
+    print(f"{sum(len(forwards) for forwards in state.values())} forwards of {len(state)} domains dumped "
+          f"in {time.perf_counter() - start:.1f}s, {len(errors)} errors", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def run_command(args):
+    """Runs a `forwards` subcommand parsed by porkbun_cli."""
+    start = time.perf_counter()
+    if args.action == "sync":
+        return _run_sync(args, start)
+    return _run_dump(args, start)
+
+
+if __name__ == "__main__":
+    import porkbun_cli
+    sys.exit(porkbun_cli.main(["forwards"] + sys.argv[1:]))
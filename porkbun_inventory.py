@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Local SQLite inventory of domains, DNS records and nameservers.
+
+`refresh` fills the database from /domain/listAll, /dns/retrieve and
+/domain/getNs. Each refresh re-lists the domains and then fetches the zones of
+stale domains only (never fetched first, then the oldest), a bounded number at
+a time. A content hash per domain means unchanged zones are not rewritten.
+Queries are answered from indexed local tables without any API traffic.
+
+The database uses WAL journaling, so queries can run while a refresh writes.
+Default location: ~/.cache/porkbun/inventory.sqlite3 (PORKBUN_INVENTORY_DB or
+--db to override).
+
+Usage (also available as `porkbun inventory ...`):
+    ./porkbun_inventory.py refresh [--max-age 3600] [--concurrency 8] [--limit N]
+    ./porkbun_inventory.py has-record _apitest TXT
+    ./porkbun_inventory.py not-on-ns [--suffix .ns.cloudflare.com]
+    ./porkbun_inventory.py records [--domain D] [--subdomain S] [--type T] [--content C]
+    ./porkbun_inventory.py stats
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+DEFAULT_DB_PATH = os.environ.get(
+    "PORKBUN_INVENTORY_DB",
+    os.path.join(os.path.expanduser("~"), ".cache", "porkbun", "inventory.sqlite3"),
+)
+DEFAULT_MAX_AGE = 3600      # seconds before a domain's zone is considered stale
+DEFAULT_CONCURRENCY = 8     # zones fetched in parallel
+COMMIT_EVERY = 100          # domains written per transaction during a refresh
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS domains (
+    domain       TEXT PRIMARY KEY,
+    tld          TEXT,
+    status       TEXT,
+    expire_date  TEXT,
+    auto_renew   TEXT,
+    listed_at    REAL NOT NULL,   -- last seen in /domain/listAll
+    fetched_at   REAL,            -- last zone fetch attempt
+    refreshed_at REAL,            -- last successful zone fetch
+    changed_at   REAL,            -- last time content_hash changed
+    content_hash TEXT,            -- sha256 of the records and nameservers
+    error        TEXT             -- error of the last fetch attempt, if it failed
+);
+CREATE INDEX IF NOT EXISTS domains_fetched ON domains (fetched_at);
+
+CREATE TABLE IF NOT EXISTS records (
+    domain    TEXT NOT NULL REFERENCES domains (domain) ON DELETE CASCADE,
+    id        TEXT,
+    name      TEXT,               -- full name as returned by the API
+    subdomain TEXT,               -- name relative to the domain ('' for the apex)
+    type      TEXT,
+    content   TEXT,
+    ttl       TEXT,
+    prio      TEXT,
+    notes     TEXT
+);
+CREATE INDEX IF NOT EXISTS records_type_subdomain ON records (type, subdomain);
+CREATE INDEX IF NOT EXISTS records_domain ON records (domain);
+
+CREATE TABLE IF NOT EXISTS nameservers (
+    domain   TEXT NOT NULL REFERENCES domains (domain) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    ns       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS nameservers_domain ON nameservers (domain);
+CREATE INDEX IF NOT EXISTS nameservers_ns ON nameservers (ns);
+"""
+
+
+def open_inventory(path=None):
+    """
+    Opens (creating if needed) the inventory database in WAL mode.
+
+    Args:
+        path (str, optional): Database file (default: DEFAULT_DB_PATH).
+
+    Returns:
+        sqlite3.Connection
+    """
+    path = path or DEFAULT_DB_PATH
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # durable enough for a cache, much faster commits
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def content_hash(records, nameservers):
+    """
+    Hashes a domain's zone so unchanged zones can be detected without comparing rows.
+
+    Args:
+        records (list): DnsRecord objects.
+        nameservers (list): Nameserver host names.
+
+    Returns:
+        str: Hex sha256 digest, independent of record and nameserver order.
+    """
+    import porkbun_codec
+
+    rows = sorted((r.type or "", r.name or "", r.content or "", r.ttl or "", r.prio or "", r.notes or "", r.id or "")
+                  for r in records)
+    return hashlib.sha256(porkbun_codec.dumps([rows, sorted(nameservers)])).hexdigest()
+
+
+def normalize_ns(name):
+    """Lower-cases a nameserver host name and strips the trailing dot."""
+    return str(name).rstrip(".").lower()
+
+
+def sync_domain_list(conn, now=None, request=None):
+    """
+    Updates the domains table from /domain/listAll (all pages).
+
+    Domains no longer in the account are removed along with their records.
+    request is an optional make_porkbun_request-style callable (e.g. a shared PorkbunClient).
+
+    Returns:
+        tuple: (domains listed, domains added, domains removed)
+    """
+    from porkbun_api import iter_domain_pages
+
+    now = now if now is not None else time.time()
+    known = {row[0] for row in conn.execute("SELECT domain FROM domains")}
+    seen = set()
+    with conn:
+        for page in iter_domain_pages(request=request):
+            rows = []
+            for info in page:
+                domain = info.get("domain")
+                if not domain:
+                    continue
+                seen.add(domain)
+                rows.append((domain, info.get("tld"), info.get("status"), info.get("expireDate"),
+                             str(info.get("autoRenew", "")), now))
+            conn.executemany(
+                "INSERT INTO domains (domain, tld, status, expire_date, auto_renew, listed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (domain) DO UPDATE SET tld = excluded.tld, status = excluded.status, "
+                "expire_date = excluded.expire_date, auto_renew = excluded.auto_renew, listed_at = excluded.listed_at",
+                rows,
+            )
+        removed = known - seen
+        conn.executemany("DELETE FROM domains WHERE domain = ?", [(domain,) for domain in removed])
+    return len(seen), len(seen - known), len(removed)
+
+
+def stale_domains(conn, max_age=DEFAULT_MAX_AGE, limit=None, now=None):
+    """
+    Lists domains whose zone needs fetching: never fetched first, then oldest first.
+
+    Args:
+        conn (sqlite3.Connection): The inventory.
+        max_age (float): Zones fetched within this many seconds are fresh (0 = everything is stale).
+        limit (int, optional): Return at most this many domains.
+
+    Returns:
+        list: Domain names.
+    """
+    now = now if now is not None else time.time()
+    query = ("SELECT domain FROM domains WHERE fetched_at IS NULL OR fetched_at <= ? "
+             "ORDER BY fetched_at IS NOT NULL, fetched_at, domain")
+    params = [now - max_age]
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    return [row[0] for row in conn.execute(query, params)]
+
+
+def fetch_domain(domain, request=None):
+    """
+    Fetches one domain's records and nameservers from the API
+    (with request, e.g. a shared PorkbunClient, if given).
+
+    Returns:
+        tuple: (domain, records as DnsRecord list or None, nameservers list or None, error message or None)
+    """
+    import requests
+    from porkbun_api import make_porkbun_request
+    from porkbun_models import parse_records
+
+    request = request or make_porkbun_request
+    try:
+        records = parse_records(request(f"/dns/retrieve/{domain}", {}), domain)
+        nameservers = request(f"/domain/getNs/{domain}", {}).get("ns") or []
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return domain, None, None, str(e)
+    return domain, records, [normalize_ns(ns) for ns in nameservers], None
+
+
+def store_domain(conn, domain, records, nameservers, error=None, now=None):
+    """
+    Writes one fetch result. Rows are only rewritten when the content hash changed.
+
+    Must be called inside a transaction owned by the caller.
+
+    Returns:
+        bool: True if the zone content changed.
+    """
+    now = now if now is not None else time.time()
+    if error is not None:
+        conn.execute("UPDATE domains SET fetched_at = ?, error = ? WHERE domain = ?", (now, error, domain))
+        return False
+
+    digest = content_hash(records, nameservers)
+    row = conn.execute("SELECT content_hash FROM domains WHERE domain = ?", (domain,)).fetchone()
+    if row is not None and row[0] == digest:
+        conn.execute("UPDATE domains SET fetched_at = ?, refreshed_at = ?, error = NULL WHERE domain = ?",
+                     (now, now, domain))
+        return False
+
+    conn.execute("DELETE FROM records WHERE domain = ?", (domain,))
+    conn.execute("DELETE FROM nameservers WHERE domain = ?", (domain,))
+    conn.executemany(
+        "INSERT INTO records (domain, id, name, subdomain, type, content, ttl, prio, notes) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [(domain, r.id, r.name, r.subdomain, r.type, r.content, r.ttl, r.prio, r.notes) for r in records],
+    )
+    conn.executemany("INSERT INTO nameservers (domain, position, ns) VALUES (?, ?, ?)",
+                     [(domain, position, ns) for position, ns in enumerate(nameservers)])
+    conn.execute(
+        "UPDATE domains SET fetched_at = ?, refreshed_at = ?, changed_at = ?, content_hash = ?, error = NULL "
+        "WHERE domain = ?",
+        (now, now, now, digest, domain),
+    )
+    return True
+
+
+def refresh(conn, max_age=DEFAULT_MAX_AGE, concurrency=DEFAULT_CONCURRENCY, limit=None, list_domains=True):
+    """
+    Incrementally refreshes the inventory.
+
+    Args:
+        conn (sqlite3.Connection): The inventory.
+        max_age (float): Refetch zones older than this many seconds (0 = all).
+        concurrency (int): Maximum zone fetches in flight.
+        limit (int, optional): Fetch at most this many zones in this run.
+        list_domains (bool): Re-list the account's domains first.
+
+    Returns:
+        dict: listed, added, removed, fetched, changed, errors, seconds
+    """
+    start = time.perf_counter()
+    stats = {"listed": None, "added": 0, "removed": 0, "fetched": 0, "changed": 0, "errors": 0}
+    if list_domains:
+        stats["listed"], stats["added"], stats["removed"] = sync_domain_list(conn)
+
+    domains = stale_domains(conn, max_age, limit)
+    pending = 0
+    conn.execute("BEGIN")
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = [executor.submit(fetch_domain, domain) for domain in domains]
+            for future in as_completed(futures):
+                domain, records, nameservers, error = future.result()
+                if store_domain(conn, domain, records, nameservers, error):
+                    stats["changed"] += 1
+                stats["fetched"] += 1
+                if error is not None:
+                    stats["errors"] += 1
+                pending += 1
+                if pending >= COMMIT_EVERY:
+                    conn.commit()  # let readers see progress on long refreshes
+                    conn.execute("BEGIN")
+                    pending = 0
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+# --- Local queries (no API traffic) ---
+
+def domains_with_record(conn, subdomain, record_type, content=None):
+    """
+    Lists domains that have a record with the given subdomain and type.
+
+    Args:
+        subdomain (str): Name relative to the domain ('' for the apex), e.g. '_apitest'.
+        record_type (str): Record type, e.g. 'TXT'.
+        content (str, optional): Also require this exact content.
+
+    Returns:
+        list: Domain names, sorted.
+    """
+    query = "SELECT DISTINCT domain FROM records WHERE type = ? AND subdomain = ?"
+    params = [record_type.upper(), subdomain]
+    if content is not None:
+        query += " AND content = ?"
+        params.append(content)
+    return [row[0] for row in conn.execute(query + " ORDER BY domain", params)]
+
+
+def domains_not_on_nameservers(conn, suffix=".ns.cloudflare.com"):
+    """
+    Lists fetched domains with no nameservers or any nameserver not ending in suffix.
+
+    Returns:
+        list: (domain, comma-separated nameservers) tuples, sorted by domain.
+    """
+    suffix = suffix.lower().rstrip(".")
+    rows = conn.execute(
+        "SELECT d.domain, group_concat(n.ns, ',') FROM domains d "
+        "LEFT JOIN nameservers n ON n.domain = d.domain "
+        "WHERE d.refreshed_at IS NOT NULL "
+        "GROUP BY d.domain "
+        "HAVING count(n.ns) = 0 OR sum(substr(n.ns, -length(?)) != ?) > 0 "
+        "ORDER BY d.domain",
+        (suffix, suffix),
+    )
+    return [(domain, nameservers or "") for domain, nameservers in rows]
+
+
+def find_records(conn, domain=None, subdomain=None, record_type=None, content=None):
+    """
+    Finds records by any combination of domain, subdomain, type and exact content.
+
+    Returns:
+        list: DnsRecord objects.
+    """
+    from porkbun_models import DnsRecord
+
+    clauses, params = [], []
+    for column, value in (("domain", domain), ("subdomain", subdomain),
+                          ("type", record_type.upper() if record_type else None), ("content", content)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    query = "SELECT id, name, type, content, ttl, prio, notes, domain FROM records"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    return [DnsRecord(*row) for row in conn.execute(query + " ORDER BY domain, name, type", params)]
+
+
+def inventory_stats(conn, max_age=DEFAULT_MAX_AGE, now=None):
+    """Returns counts of domains, records, stale and failed domains."""
+    now = now if now is not None else time.time()
+    domains, never, stale, failed = conn.execute(
+        "SELECT count(*), sum(fetched_at IS NULL), sum(fetched_at IS NULL OR fetched_at <= ?), "
+        "sum(error IS NOT NULL) FROM domains",
+        (now - max_age,),
+    ).fetchone()
+    records = conn.execute("SELECT count(*) FROM records").fetchone()[0]
+    return {"domains": domains, "records": records, "never_fetched": never or 0,
+            "stale": stale or 0, "errors": failed or 0}
+
+
+# --- Command line (argument parsing lives in porkbun_cli) ---
+
+def run_command(args):
+    """Runs an `inventory` subcommand parsed by porkbun_cli."""
+    import requests
+
+    conn = open_inventory(args.db)
+    try:
+        if args.action == "refresh":
+            try:
+                stats = refresh(conn, args.max_age, args.concurrency, args.limit, list_domains=not args.no_list)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"API Call Error while listing domains: {e}")
+                return 1
+            listed = f"{stats['listed']} domains listed ({stats['added']} new, {stats['removed']} removed), " \
+                if stats["listed"] is not None else ""
+            print(f"{listed}{stats['fetched']} zones fetched, {stats['changed']} changed, "
+                  f"{stats['errors']} errors in {stats['seconds']:.1f}s")
+            return 1 if stats["errors"] else 0
+
+        if args.action == "stats":
+            for key, value in inventory_stats(conn, args.max_age).items():
+                print(f"{key}: {value}")
+            return 0
+
+        start = time.perf_counter()
+        if args.action == "has-record":
+            results = domains_with_record(conn, args.subdomain, args.type, args.content)
+            for domain in results:
+                print(domain)
+        elif args.action == "not-on-ns":
+            results = domains_not_on_nameservers(conn, args.suffix)
+            for domain, nameservers in results:
+                print(f"{domain}\t{nameservers}")
+        else:
+            results = find_records(conn, args.domain, args.subdomain, args.type, args.content)
+            for r in results:
+                print(f"{r.domain}\t{r.name}\t{r.type}\t{r.ttl}\t{r.content}")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"{len(results)} result(s) in {elapsed_ms:.1f} ms (local inventory, no API calls)", file=sys.stderr)
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    import porkbun_cli
+    sys.exit(porkbun_cli.main(["inventory"] + sys.argv[1:]))
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Optional in-process metrics registry (Prometheus text exposition format).
+
+Metrics are disabled by default; instrumented code checks the module-level
+ENABLED flag before doing any work, so the cost when disabled is one attribute
+lookup per call. Enable them with environment variables:
+
+    PORKBUN_METRICS_PORT=9464             # serve /metrics on 127.0.0.1:9464
+    PORKBUN_METRICS_ADDR=0.0.0.0          # optional bind address for the port
+    PORKBUN_METRICS_TEXTFILE=/var/lib/node_exporter/textfile/porkbun.prom
+                                          # written atomically at exit
+
+or programmatically with enable(port=..., textfile=...).
+"""
+
+import atexit
+import os
+import sys
+import threading
+
+ENABLED = False
+
+API_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DNS_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    """Formats a label set as {a="x",b="y"} with Prometheus escaping."""
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value):
+    """Formats a sample value the way Prometheus expects."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """A monotonically increasing counter with optional labels."""
+
+    metric_type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        """Increments the counter for the given label values."""
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def get(self, *labelvalues):
+        """Returns the current value for the given label values."""
+        return self._values.get(labelvalues, 0)
+
+    def samples(self):
+        """Yields (suffix, labels, value) tuples for exposition."""
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            yield "", _format_labels(self.labelnames, labelvalues), value
+
+
+class Histogram:
+    """A cumulative histogram with fixed buckets and optional labels."""
+
+    metric_type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=API_LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values = {}   # labelvalues -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        """Records one observation for the given label values."""
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                state = [0] * len(self.buckets) + [0.0, 0]
+                self._values[labelvalues] = state
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self):
+        """Yields (suffix, labels, value) tuples for exposition."""
+        with self._lock:
+            items = sorted((labels, list(state)) for labels, state in self._values.items())
+        for labelvalues, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                yield "_bucket", _format_labels(self.labelnames, labelvalues, ("le", _format_value(bound))), cumulative
+            yield "_sum", _format_labels(self.labelnames, labelvalues), state[-2]
+            yield "_count", _format_labels(self.labelnames, labelvalues), state[-1]
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, documentation, labelnames=()):
+        """Creates and registers a Counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=API_LATENCY_BUCKETS):
+        """Creates and registers a Histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """
+        Renders every registered metric.
+
+        Returns:
+            str: Metrics in the Prometheus text exposition format (version 0.0.4).
+        """
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics)
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# --- Porkbun API client metrics ---
+API_CALLS = REGISTRY.counter(
+    "porkbun_api_calls_total", "Porkbun API calls made.", ("endpoint",))
+API_ERRORS = REGISTRY.counter(
+    "porkbun_api_errors_total", "Porkbun API calls that failed, by error kind.", ("endpoint", "kind"))
+API_RETRIES = REGISTRY.counter(
+    "porkbun_api_retries_total", "Porkbun API calls that were retried.", ("endpoint",))
+API_LATENCY = REGISTRY.histogram(
+    "porkbun_api_request_duration_seconds", "Porkbun API call latency.", ("endpoint",),
+    API_LATENCY_BUCKETS)
+
+# --- DNS propagation check metrics ---
+DNS_QUERY_LATENCY = REGISTRY.histogram(
+    "porkbun_dns_query_duration_seconds", "DNS query latency per resolver.", ("resolver", "region"),
+    DNS_LATENCY_BUCKETS)
+DNS_QUERY_TIMEOUTS = REGISTRY.counter(
+    "porkbun_dns_query_timeouts_total", "DNS queries that timed out per resolver.", ("resolver", "region"))
+
+
+def endpoint_template(endpoint):
+    """
+    Collapses an endpoint path to a low-cardinality template for use as a label.
+
+    Example: '/dns/retrieveByNameType/example.com/TXT/_apitest'
+             -> '/dns/retrieveByNameType/{domain}/{arg}/{arg}'
+
+    Args:
+        endpoint (str): The API endpoint path.
+
+    Returns:
+        str: The endpoint template.
+    """
+    parts = [part for part in endpoint.split("/") if part]
+    if len(parts) <= 2:
+        return "/" + "/".join(parts)
+    return "/" + "/".join(parts[:2] + ["{domain}"] + ["{arg}"] * (len(parts) - 3))
+
+
+def write_textfile(path, registry=REGISTRY):
+    """
+    Writes the metrics to a file for the node_exporter textfile collector.
+    The file is written to a temporary name and renamed so it is never read half-written.
+
+    Args:
+        path (str): Destination .prom file.
+        registry (MetricsRegistry): Registry to render.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(registry.render())
+    os.replace(tmp_path, path)
+
+
+def start_http_server(port, addr="127.0.0.1", registry=REGISTRY):
+    """
+    Serves the metrics on http://addr:port/metrics from a daemon thread.
+
+    Args:
+        port (int): TCP port to listen on.
+        addr (str): Address to bind (default: localhost only).
+        registry (MetricsRegistry): Registry to serve.
+
+    Returns:
+        ThreadingHTTPServer: The running server.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep scrapes out of the script output
+
+    server = ThreadingHTTPServer((addr, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="porkbun-metrics", daemon=True)
+    thread.start()
+    return server
+
+
+def enable(port=None, textfile=None, addr="127.0.0.1"):
+    """
+    Turns metric collection on and optionally exposes the metrics.
+
+    Args:
+        port (int, optional): Serve metrics over HTTP on this port.
+        textfile (str, optional): Write metrics to this file when the process exits.
+        addr (str): Bind address for the HTTP endpoint.
+    """
+    global ENABLED
+    ENABLED = True
+    if textfile:
+        atexit.register(write_textfile, textfile)
+    if port:
+        start_http_server(int(port), addr)
+
+
+def enable_from_env():
+    """
+    Enables metrics if PORKBUN_METRICS_PORT or PORKBUN_METRICS_TEXTFILE is set.
+
+    Runs when porkbun_api is imported, so it never raises: if the port cannot be
+    bound (typically another script already serves it), a warning is printed and
+    only the textfile is written (or metrics stay off if none is set).
+    """
+    global ENABLED
+    port = os.environ.get("PORKBUN_METRICS_PORT")
+    textfile = os.environ.get("PORKBUN_METRICS_TEXTFILE")
+    if (port or textfile) and not ENABLED:
+        addr = os.environ.get("PORKBUN_METRICS_ADDR", "127.0.0.1")
+        try:
+            enable(port=port, textfile=textfile, addr=addr)
+        except (OSError, ValueError) as e:
+            fallback = f"writing only {textfile}" if textfile else "metrics are off"
+            print(f"Warning: cannot serve metrics on {addr}:{port} ({e}); {fallback}", file=sys.stderr)
+            ENABLED = bool(textfile)
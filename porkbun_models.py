@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Compact typed models for DNS records and domains returned by the Porkbun API.
+
+DnsRecord and Domain use __slots__ (no per-instance __dict__), and their
+low-cardinality fields (record type, TTL, priority, status, TLD, ...) are
+interned, so a whole portfolio's zones can be held in memory cheaply. Values
+are kept as the strings the API returns; to_dict() gives back the API form.
+
+Example:
+    response = make_porkbun_request(f"/dns/retrieve/{domain}", {})
+    for record in parse_records(response, domain):
+        if record.matches("_apitest", "TXT", domain):
+            print(record.id, record.content)
+"""
+
+import sys
+
+_intern = sys.intern
+
+
+def _intern_value(value):
+    """Interns strings; other values (None, numbers, lists) pass through unchanged."""
+    return _intern(value) if isinstance(value, str) else value
+
+
+class DnsRecord:
+    """
+    One DNS record as returned by /dns/retrieve and /dns/retrieveByNameType.
+
+    Attributes:
+        id (str): Record ID.
+        name (str): Full record name as returned by the API (e.g. 'www.example.com').
+        type (str): Record type, upper-case (interned).
+        content (str): Record content.
+        ttl (str): TTL in seconds, as returned by the API (interned).
+        prio (str): Priority (interned; '0' or None for types without one).
+        notes (str): Notes (interned; usually empty).
+        domain (str): The zone the record belongs to, when known (interned).
+    """
+
+    __slots__ = ("id", "name", "type", "content", "ttl", "prio", "notes", "domain")
+
+    def __init__(self, id, name, type, content, ttl=None, prio=None, notes=None, domain=None):
+        self.id = id
+        self.name = name
+        self.type = _intern_value(type.upper() if isinstance(type, str) else type)
+        self.content = content
+        self.ttl = _intern_value(ttl)
+        self.prio = _intern_value(prio)
+        self.notes = _intern_value(notes)
+        self.domain = _intern_value(domain)
+
+    @classmethod
+    def from_api(cls, data, domain=None):
+        """
+        Builds a record from one entry of an API 'records' list.
+
+        Args:
+            data (dict): The record as decoded from the API response.
+            domain (str, optional): The zone the record was retrieved from.
+
+        Returns:
+            DnsRecord
+        """
+        get = data.get
+        return cls(get("id"), get("name"), get("type"), get("content"),
+                   get("ttl"), get("prio"), get("notes"), domain)
+
+    def to_dict(self):
+        """Returns the record in the API's dict form."""
+        return {"id": self.id, "name": self.name, "type": self.type, "content": self.content,
+                "ttl": self.ttl, "prio": self.prio, "notes": self.notes}
+
+    @property
+    def subdomain(self):
+        """The name relative to the zone ('' for the apex), or the full name if the zone is unknown."""
+        if self.domain and self.name:
+            if self.name == self.domain:
+                return ""
+            suffix = "." + self.domain
+            if self.name.endswith(suffix):
+                return self.name[:-len(suffix)]
+        return self.name
+
+    def matches(self, name, record_type, domain=None, content=None):
+        """
+        Checks whether this is the record with the given name, type and (optionally) content.
+
+        The API may return the name with or without the trailing domain, so both
+        the subdomain part and the full name are accepted.
+
+        Args:
+            name (str): Subdomain part ('' for the apex) or full name.
+            record_type (str): Record type, e.g. 'TXT' (case-insensitive, like the API's filter).
+            domain (str, optional): The zone (defaults to the record's own).
+            content (str, optional): Exact content to match; not checked if None.
+
+        Returns:
+            bool
+        """
+        if self.type != (record_type or "").upper() or (content is not None and self.content != content):
+            return False
+        domain = domain or self.domain
+        full_name = f"{name}.{domain}" if name and domain else (name or domain)
+        return self.name == name or self.name == full_name
+
+    def __eq__(self, other):
+        if not isinstance(other, DnsRecord):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"DnsRecord(id={self.id!r}, name={self.name!r}, type={self.type!r}, content={self.content!r}, ttl={self.ttl!r})"
+
+
+class Domain:
+    """
+    One domain as returned by /domain/listAll.
+
+    Attributes map the API's camelCase keys to snake_case (createDate ->
+    create_date, ...). Flags such as auto_renew are kept as the API strings.
+    """
+
+    __slots__ = ("domain", "status", "tld", "create_date", "expire_date", "security_lock",
+                 "whois_privacy", "auto_renew", "not_local", "labels")
+
+    # Attribute -> API key
+    API_KEYS = {
+        "domain": "domain", "status": "status", "tld": "tld", "create_date": "createDate",
+        "expire_date": "expireDate", "security_lock": "securityLock", "whois_privacy": "whoisPrivacy",
+        "auto_renew": "autoRenew", "not_local": "notLocal", "labels": "labels",
+    }
+
+    def __init__(self, domain, status=None, tld=None, create_date=None, expire_date=None,
+                 security_lock=None, whois_privacy=None, auto_renew=None, not_local=None, labels=None):
+        self.domain = _intern_value(domain)  # shared with DnsRecord.domain
+        self.status = _intern_value(status)
+        self.tld = _intern_value(tld)
+        self.create_date = create_date
+        self.expire_date = expire_date
+        self.security_lock = _intern_value(security_lock)
+        self.whois_privacy = _intern_value(whois_privacy)
+        self.auto_renew = _intern_value(auto_renew)
+        self.not_local = _intern_value(not_local)
+        self.labels = labels
+
+    @classmethod
+    def from_api(cls, data):
+        """Builds a domain from one entry of the /domain/listAll 'domains' list."""
+        get = data.get
+        return cls(get("domain"), get("status"), get("tld"), get("createDate"), get("expireDate"),
+                   get("securityLock"), get("whoisPrivacy"), get("autoRenew"), get("notLocal"), get("labels"))
+
+    def to_dict(self):
+        """Returns the domain in the API's dict form."""
+        return {key: getattr(self, attribute) for attribute, key in self.API_KEYS.items()}
+
+    def __eq__(self, other):
+        if not isinstance(other, Domain):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Domain(domain={self.domain!r}, status={self.status!r}, expire_date={self.expire_date!r})"
+
+
+def parse_records(response, domain=None):
+    """
+    Converts the 'records' list of a /dns/retrieve* response into DnsRecord objects.
+
+    Args:
+        response (dict): Decoded API response.
+        domain (str, optional): The zone the records were retrieved from.
+
+    Returns:
+        list: DnsRecord objects (empty if the response has no records).
+    """
+    from_api = DnsRecord.from_api
+    return [from_api(record, domain) for record in response.get("records") or ()]
+
+
+def parse_domains(response):
+    """
+    Converts the 'domains' list of a /domain/listAll response into Domain objects.
+
+    Args:
+        response (dict): Decoded API response.
+
+    Returns:
+        list: Domain objects (empty if the response has no domains).
+    """
+    from_api = Domain.from_api
+    return [from_api(domain) for domain in response.get("domains") or ()]
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+TLD pricing catalog from /pricing/get, cached on disk and indexed by TLD.
+
+The /pricing/get response covers every TLD Porkbun sells and is large, so it
+is fetched at most once per TTL (default 24 h) into a cache file. /pricing/get
+needs no API keys; they are only sent when they are configured.
+
+When the TTL has expired the catalog is requested again. If an earlier answer
+carried an ETag or Last-Modified header, the request is conditional
+(If-None-Match / If-Modified-Since) and a 304 answer costs no download.
+Porkbun does not document validators for this POST endpoint, so usually the
+whole catalog is downloaded; the cache file is then only rewritten if the body
+actually changed, otherwise just its timestamp is bumped. If a refresh fails,
+the stale cache is used with a warning.
+
+Lookups go through an in-memory dict keyed by TLD. Renewal forecasts group the
+domain list by TLD and multiply each group's count by its renewal price, so
+pricing N domains costs one pass over the list and one lookup per distinct TLD.
+
+Usage (also available as `porkbun pricing ...`):
+    ./porkbun_pricing.py get com net io
+    ./porkbun_pricing.py renewals [--within-days 90] [--inventory]
+    ./porkbun_pricing.py refresh
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "PORKBUN_PRICING_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "porkbun", "pricing.json"),
+)
+DEFAULT_TTL = 24 * 3600.0  # seconds; PORKBUN_PRICING_TTL overrides it (see default_ttl)
+CACHE_FILE_MODE = 0o644  # public price list
+
+
+def _price(value):
+    """Parses a price string from the API; None if missing or malformed."""
+    try:
+        return Decimal(str(value)) if value not in (None, "") else None
+    except InvalidOperation:
+        return None
+
+
+class TldPrice:
+    """Registration, renewal and transfer price of one TLD (Decimal, or None if not offered)."""
+
+    __slots__ = ("tld", "registration", "renewal", "transfer")
+
+    def __init__(self, tld, registration, renewal, transfer):
+        self.tld = tld
+        self.registration = registration
+        self.renewal = renewal
+        self.transfer = transfer
+
+    def __repr__(self):
+        return (f"TldPrice(tld={self.tld!r}, registration={self.registration}, "
+                f"renewal={self.renewal}, transfer={self.transfer})")
+
+
+class PricingCatalog:
+    """
+    In-memory pricing index.
+
+    Attributes:
+        prices (dict): tld -> TldPrice
+        fetched_at (float): When the catalog was fetched (epoch seconds).
+    """
+
+    def __init__(self, prices, fetched_at=None):
+        self.prices = prices
+        self.fetched_at = fetched_at
+
+    @classmethod
+    def from_response(cls, response, fetched_at=None):
+        """Builds the index from a decoded /pricing/get response."""
+        prices = {}
+        for tld, entry in (response.get("pricing") or {}).items():
+            tld = tld.lower().lstrip(".")
+            prices[tld] = TldPrice(tld, _price(entry.get("registration")), _price(entry.get("renewal")),
+                                   _price(entry.get("transfer")))
+        return cls(prices, fetched_at)
+
+    def __len__(self):
+        return len(self.prices)
+
+    def get(self, tld):
+        """Returns the TldPrice for a TLD (with or without leading dot), or None."""
+        return self.prices.get(tld.lower().lstrip("."))
+
+    def renewal_total(self, tlds):
+        """
+        Totals the renewal cost of a list of domains given by their TLDs.
+
+        Args:
+            tlds (iterable): One TLD per domain (repeats expected).
+
+        Returns:
+            tuple: (total Decimal, {tld: (count, subtotal)}, {tld: count} of TLDs with no renewal price)
+        """
+        counts = Counter(tld.lower().lstrip(".") for tld in tlds)
+        total = Decimal("0")
+        breakdown = {}
+        missing = {}
+        for tld, count in counts.items():
+            price = self.prices.get(tld)
+            if price is None or price.renewal is None:
+                missing[tld] = count
+                continue
+            subtotal = price.renewal * count
+            breakdown[tld] = (count, subtotal)
+            total += subtotal
+        return total, breakdown, missing
+
+
+def fetch_pricing_body(validators=None, timeout=30):
+    """
+    Fetches /pricing/get, with the API keys only if they are configured (the endpoint needs none).
+
+    Args:
+        validators (dict, optional): {"etag": ..., "last_modified": ...} of the cached copy;
+            sent as If-None-Match / If-Modified-Since.
+        timeout (float): Request timeout in seconds.
+
+    Returns:
+        tuple: (raw response body as bytes, or None if the server answered 304 Not Modified;
+                validators of the answer as a dict, empty if the server sent none)
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails.
+        ValueError: If the response is not valid JSON or indicates an error.
+    """
+    import requests
+    import porkbun_api
+    import porkbun_codec
+
+    api_key, secret_key = porkbun_api.load_credentials()
+    payload = {"apikey": api_key, "secretapikey": secret_key} if api_key and secret_key else {}
+    headers = {"Content-Type": "application/json"}
+    validators = validators or {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = requests.post(porkbun_api.PORKBUN_API_URL + "/pricing/get", headers=headers,
+                             data=porkbun_codec.dumps(payload), timeout=timeout)
+    if response.status_code == 304:
+        return None, validators
+    response.raise_for_status()
+    try:
+        decoded = porkbun_codec.loads(response.content)
+    except ValueError:
+        raise ValueError(f"Invalid JSON received from API: {response.text}")
+    if decoded.get("status") != "SUCCESS":
+        raise ValueError(f"Porkbun API Error: {decoded.get('message', 'Unknown API error')}")
+    answer = {key: response.headers[header] for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified"))
+              if response.headers.get(header)}
+    return response.content, answer
+
+
+def _validators_path(cache_path):
+    return cache_path + ".validators"
+
+
+def _read_validators(cache_path):
+    import porkbun_codec
+
+    try:
+        with open(_validators_path(cache_path), "rb") as f:
+            validators = porkbun_codec.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return validators if isinstance(validators, dict) else {}
+
+
+def _write_validators(cache_path, validators):
+    import porkbun_codec
+    import porkbun_files
+
+    path = _validators_path(cache_path)
+    if validators:
+        porkbun_files.write_atomic(path, porkbun_codec.dumps(validators), mode=CACHE_FILE_MODE)
+    elif os.path.exists(path):
+        os.unlink(path)
+
+
+def default_ttl():
+    """
+    Cache TTL in seconds: PORKBUN_PRICING_TTL if set, else DEFAULT_TTL.
+
+    Raises:
+        ValueError: If PORKBUN_PRICING_TTL is not a number.
+    """
+    value = os.environ.get("PORKBUN_PRICING_TTL", "").strip()
+    if not value:
+        return DEFAULT_TTL
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"PORKBUN_PRICING_TTL must be a number of seconds, got {value!r}") from None
+
+
+def load_catalog(cache_path=None, ttl=None, force_refresh=False):
+    """
+    Returns the pricing catalog, refreshing the on-disk cache when it is older than ttl.
+
+    Args:
+        cache_path (str, optional): Cache file (default: DEFAULT_CACHE_PATH).
+        ttl (float, optional): Maximum cache age in seconds (default: default_ttl()).
+        force_refresh (bool): Refetch even if the cache is fresh.
+
+    Returns:
+        PricingCatalog
+
+    Raises:
+        requests.exceptions.RequestException, ValueError: If fetching fails and there is no cache to fall back to.
+    """
+    import requests
+    import porkbun_codec
+
+    cache_path = cache_path or DEFAULT_CACHE_PATH
+    ttl = default_ttl() if ttl is None else ttl
+    try:
+        cached_at = os.path.getmtime(cache_path)
+    except OSError:
+        cached_at = None
+
+    if cached_at is not None and not force_refresh and time.time() - cached_at < ttl:
+        with open(cache_path, "rb") as f:
+            return PricingCatalog.from_response(porkbun_codec.loads(f.read()), cached_at)
+
+    validators = _read_validators(cache_path) if cached_at is not None else {}
+    try:
+        body, validators = fetch_pricing_body(validators)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        if cached_at is None:
+            raise
+        print(f"Warning: could not refresh pricing ({e}); using cached copy from "
+              f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(cached_at))}", file=sys.stderr)
+        with open(cache_path, "rb") as f:
+            return PricingCatalog.from_response(porkbun_codec.loads(f.read()), cached_at)
+
+    import porkbun_files
+
+    unchanged = False
+    if cached_at is not None:
+        with open(cache_path, "rb") as f:
+            cached = f.read()
+        if body is None:  # 304 Not Modified
+            body = cached
+        unchanged = cached == body
+    if unchanged:
+        os.utime(cache_path)  # same catalog: only mark it fresh
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        porkbun_files.write_atomic(cache_path, body, mode=CACHE_FILE_MODE)
+    _write_validators(cache_path, validators)
+    return PricingCatalog.from_response(porkbun_codec.loads(body), time.time())
+
+
+def _domain_tld(info):
+    """TLD of a /domain/listAll entry (its 'tld' field, else everything after the first label)."""
+    tld = info.get("tld")
+    if tld:
+        return tld
+    return info.get("domain", "").partition(".")[2]
+
+
+def _expires_within(expire_date, deadline):
+    """True if an expireDate string ('YYYY-MM-DD HH:MM:SS') is on or before the deadline string."""
+    return bool(expire_date) and expire_date[:19] <= deadline
+
+
+def renewal_forecast(catalog, domains, within_days=None):
+    """
+    Totals the renewal cost of an account's domains.
+
+    Args:
+        catalog (PricingCatalog): Prices.
+        domains (iterable): Domain info dicts with 'domain', 'tld' and 'expireDate'
+            (as from /domain/listAll).
+        within_days (int, optional): Only count domains expiring within this many days.
+
+    Returns:
+        tuple: As PricingCatalog.renewal_total.
+    """
+    if within_days is None:
+        tlds = (_domain_tld(info) for info in domains)
+    else:
+        deadline = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() + within_days * 86400))
+        tlds = (_domain_tld(info) for info in domains if _expires_within(info.get("expireDate"), deadline))
+    return catalog.renewal_total(tlds)
+
+
+def iter_account_domains(use_inventory=False, inventory_db=None):
+    """
+    Yields domain info dicts from /domain/listAll (paged), or from the local
+    inventory (porkbun_inventory) without any API calls if use_inventory is set.
+    """
+    if use_inventory:
+        import porkbun_inventory
+        conn = porkbun_inventory.open_inventory(inventory_db)
+        try:
+            for domain, tld, expire_date in conn.execute("SELECT domain, tld, expire_date FROM domains"):
+                yield {"domain": domain, "tld": tld, "expireDate": expire_date}
+        finally:
+            conn.close()
+        return
+
+    from porkbun_api import iter_domain_pages
+    for page in iter_domain_pages():
+        yield from page
+
+
+# --- Command line (argument parsing lives in porkbun_cli) ---
+
+def _format_price(value):
+    return f"{value:.2f}" if value is not None else "-"
+
+
+def run_command(args):
+    """Runs a `pricing` subcommand parsed by porkbun_cli."""
+    import requests
+
+    try:
+        ttl = args.ttl if args.ttl is not None else default_ttl()
+    except ValueError as e:
+        print(e)
+        return 2
+    try:
+        catalog = load_catalog(args.cache, ttl, force_refresh=args.action == "refresh")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"API Call Error while fetching pricing: {e}")
+        return 1
+
+    if args.action == "refresh":
+        print(f"Pricing for {len(catalog)} TLDs cached at {args.cache or DEFAULT_CACHE_PATH}")
+        return 0
+
+    if args.action == "get":
+        status = 0
+        print(f"{'TLD':<16}{'Registration':>14}{'Renewal':>10}{'Transfer':>10}")
+        for tld in args.tlds:
+            price = catalog.get(tld)
+            if price is None:
+                print(f"{tld:<16}  not offered")
+                status = 1
+                continue
+            print(f"{price.tld:<16}{_format_price(price.registration):>14}"
+                  f"{_format_price(price.renewal):>10}{_format_price(price.transfer):>10}")
+        return status
+
+    try:
+        domains = iter_account_domains(args.inventory, args.db)
+        total, breakdown, missing = renewal_forecast(catalog, domains, args.within_days)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"API Call Error while listing domains: {e}")
+        return 1
+    count = sum(count for count, _ in breakdown.values())
+    for tld, (tld_count, subtotal) in sorted(breakdown.items(), key=lambda item: item[1][1], reverse=True):
+        print(f"{tld:<16}{tld_count:>6} x {_format_price(catalog.get(tld).renewal):>8} = {_format_price(subtotal):>10}")
+    for tld, tld_count in sorted(missing.items()):
+        print(f"{tld:<16}{tld_count:>6} x {'?':>8}   (no renewal price)")
+    scope = f" expiring within {args.within_days} days" if args.within_days is not None else ""
+    print(f"Renewal total for {count} domains{scope}: {_format_price(total)} USD")
+    return 0
+
+
+if __name__ == "__main__":
+    import porkbun_cli
+    sys.exit(porkbun_cli.main(["pricing"] + sys.argv[1:]))
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Per-phase latency profiling for Porkbun API requests.
+
+When enabled, make_porkbun_request sends each request through timed_post(), which
+performs the same POST with the standard library so every phase can be timed:
+
+    dns       - resolving the API host name
+    connect   - TCP connect
+    tls       - TLS handshake (0 for plain http)
+    send      - writing the request
+    server    - waiting for the response headers (server processing)
+    transfer  - reading the response body
+    decode    - JSON decoding
+
+Scripts opt in with profile_from_argv(), which handles these flags:
+    --profile               print a per-phase summary to stderr on exit
+    --profile-out=FILE      also run cProfile and dump pstats data to FILE
+"""
+
+import atexit
+import sys
+import threading
+import time
+
+ENABLED = False
+
+PHASES = ("dns", "connect", "tls", "send", "server", "transfer", "decode", "total")
+
+_records = []   # (endpoint template, timings dict)
+_records_lock = threading.Lock()
+
+
+def timed_post(url, body, headers, timeout=None, cafile=None):
+    """
+    Sends a POST request over a fresh connection, timing each phase.
+
+    Args:
+        url (str): Full request URL (http or https).
+        body (bytes): Request body.
+        headers (dict): Request headers.
+        timeout (float, optional): Socket timeout in seconds.
+        cafile (str, optional): CA bundle used to verify the server certificate.
+
+    Returns:
+        tuple: (status, reason, response body bytes, timings dict in seconds)
+
+    Raises:
+        OSError: If resolving, connecting or the TLS handshake fails.
+        http.client.HTTPException: If the response is malformed.
+    """
+    # Imported here so that importing this module (via porkbun_api) stays cheap
+    import http.client
+    import socket
+    import ssl
+    import urllib.parse
+
+    parts = urllib.parse.urlsplit(url)
+    is_https = parts.scheme == "https"
+    host = parts.hostname
+    port = parts.port or (443 if is_https else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    timings = {}
+
+    start = time.perf_counter()
+    addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    resolved = time.perf_counter()
+    timings["dns"] = resolved - start
+
+    sock = None
+    last_error = None
+    for family, socktype, proto, _, sockaddr in addresses:
+        try:
+            sock = socket.socket(family, socktype, proto)
+            sock.settimeout(timeout)
+            sock.connect(sockaddr)
+            break
+        except OSError as e:
+            last_error = e
+            if sock is not None:
+                sock.close()
+            sock = None
+    if sock is None:
+        raise last_error or OSError(f"Could not connect to {host}:{port}")
+    connected = time.perf_counter()
+    timings["connect"] = connected - resolved
+
+    if is_https:
+        context = ssl.create_default_context(cafile=cafile)
+        sock = context.wrap_socket(sock, server_hostname=host)
+        conn = http.client.HTTPSConnection(host, port, timeout=timeout)
+    else:
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    handshaken = time.perf_counter()
+    timings["tls"] = handshaken - connected
+
+    # Reuse the already connected socket so the phases above are not repeated
+    conn.sock = sock
+    try:
+        request_headers = dict(headers)
+        request_headers["Connection"] = "close"
+        conn.request("POST", path, body=body, headers=request_headers)
+        sent = time.perf_counter()
+        timings["send"] = sent - handshaken
+
+        response = conn.getresponse()
+        first_byte = time.perf_counter()
+        timings["server"] = first_byte - sent
+
+        data = response.read()
+        done = time.perf_counter()
+        timings["transfer"] = done - first_byte
+    finally:
+        conn.close()
+
+    timings["total"] = done - start
+    return response.status, response.reason, data, timings
+
+
+def record(endpoint_template, timings):
+    """
+    Stores the phase timings of one request for the summary.
+
+    Args:
+        endpoint_template (str): Low-cardinality endpoint name (e.g. '/dns/retrieve/{domain}').
+        timings (dict): Phase name -> seconds.
+    """
+    with _records_lock:
+        _records.append((endpoint_template, dict(timings)))
+
+
+def get_records():
+    """Returns a copy of the recorded (endpoint template, timings) pairs."""
+    with _records_lock:
+        return list(_records)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile (fraction in 0..1) of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def format_summary(records=None):
+    """
+    Builds a per-phase latency table (milliseconds) over the recorded requests.
+
+    Args:
+        records (list, optional): (endpoint template, timings) pairs. Defaults to all recorded.
+
+    Returns:
+        str: The summary text.
+    """
+    records = get_records() if records is None else records
+    if not records:
+        return "Profile: no API requests were made."
+
+    lines = [f"Profile: {len(records)} API request(s), per-phase latency in ms"]
+    lines.append(f"  {'phase':<10}{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}{'share':>8}")
+    mean_total = sum(t.get("total", 0.0) for _, t in records) / len(records)
+    for phase in PHASES:
+        values = sorted(t.get(phase, 0.0) * 1000 for _, t in records)
+        mean = sum(values) / len(values)
+        share = f"{mean / (mean_total * 1000) * 100:.0f}%" if mean_total and phase != "total" else ""
+        lines.append(f"  {phase:<10}{mean:>10.1f}{percentile(values, 0.5):>10.1f}"
+                     f"{percentile(values, 0.95):>10.1f}{values[-1]:>10.1f}{share:>8}")
+
+    by_endpoint = {}
+    for template, timings in records:
+        by_endpoint.setdefault(template, []).append(timings.get("total", 0.0) * 1000)
+    lines.append("  per endpoint (total ms):")
+    for template, totals in sorted(by_endpoint.items()):
+        lines.append(f"    {template}: {len(totals)} call(s), mean {sum(totals) / len(totals):.1f}, max {max(totals):.1f}")
+    return "\n".join(lines)
+
+
+def enable():
+    """Turns on per-phase recording for make_porkbun_request."""
+    global ENABLED
+    ENABLED = True
+
+
+def profile_from_argv():
+    """
+    Handles --profile and --profile-out=FILE (or --profile-out FILE), removing them
+    from sys.argv so the calling script's own argument checks are unaffected.
+
+    --profile enables phase recording and prints the summary to stderr at exit.
+    --profile-out additionally runs cProfile for the rest of the process and dumps
+    the stats to FILE (inspect with `python -m pstats FILE`). Only the main thread
+    is profiled by cProfile.
+    """
+    args = sys.argv[1:]
+    profile = False
+    profile_out = None
+    remaining = []
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        if arg == "--profile":
+            profile = True
+        elif arg.startswith("--profile-out="):
+            profile_out = arg.split("=", 1)[1]
+        elif arg == "--profile-out" and index + 1 < len(args):
+            profile_out = args[index + 1]
+            index += 1
+        else:
+            remaining.append(arg)
+        index += 1
+    sys.argv = [sys.argv[0]] + remaining
+
+    if not profile and not profile_out:
+        return
+
+    enable()
+    profiler = None
+    if profile_out:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def report():
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_out)
+        print("\n" + format_summary(), file=sys.stderr)
+        if profiler is not None:
+            print(f"Profile: cProfile stats written to {profile_out} (view with: python -m pstats {profile_out})",
+                  file=sys.stderr)
+
+    atexit.register(report)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Response cache shared by every process on the host, with one lock per key.
+
+Schedulers often run several scripts against the same domains at the same
+time (12_check_delete_dns_check_record.py, 14_change_name_servers_to_cloudflare.py,
+...), and each one would call /dns/retrieve or /domain/getNs separately. With
+this cache, make_porkbun_request serves those reads from files under
+~/.cache/porkbun/shared:
+
+    - The first process to need a key takes its lock (fcntl.flock), calls the
+      API and stores the raw response. Processes asking for the same key at the
+      same time wait on the lock and then read the stored response, so only one
+      call is made.
+    - Entries expire after a TTL (PORKBUN_SHARED_CACHE_TTL, default 10 seconds;
+      0 turns the cache off).
+    - Every write to a domain (make_porkbun_request or PorkbunClient) bumps the
+      domain's generation counter. An entry is only served if it was fetched
+      at the current generation, so a read that was in flight during a write is
+      never served afterwards. The daemon's read cache (porkbun_broker.ReadCache)
+      checks the same counter, so it notices writes that bypass the daemon.
+
+Entries are kept per API key (by fingerprint), so accounts never see each
+other's data. Locks are released by the kernel when a process dies. The cache
+is off on platforms without fcntl.
+
+Layout:
+    <dir>/<key fingerprint>/<domain>/generation     write counter of the domain
+    <dir>/<key fingerprint>/<domain>/<key>.lock     per-key lock
+    <dir>/<key fingerprint>/<domain>/<key>.entry    JSON header line, then the raw response
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "PORKBUN_SHARED_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "porkbun", "shared"),
+)
+DEFAULT_TTL = 10.0  # seconds an entry is served
+SHARED_ENDPOINTS = ("/dns/retrieve/", "/domain/getNs/")
+
+
+def ttl():
+    """TTL from PORKBUN_SHARED_CACHE_TTL (0 when the cache is off or unsupported)."""
+    if fcntl is None:
+        return 0.0
+    try:
+        return max(0.0, float(os.environ.get("PORKBUN_SHARED_CACHE_TTL", DEFAULT_TTL)))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def _domain_dir(endpoint, credentials, cache_dir):
+    """Directory of the endpoint's domain for these credentials, or None if there is none."""
+    import porkbun_broker
+
+    fingerprint = porkbun_broker.key_id(credentials[0])
+    scope = porkbun_broker._scope(endpoint)
+    if fingerprint is None or scope == "*" or scope.startswith("."):
+        return None
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, fingerprint, scope)
+
+
+def _entry_name(endpoint, payload):
+    key = repr((endpoint, sorted((str(k), str(v)) for k, v in payload.items())))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+class _Locked:
+    """Context manager holding an flock on path (created if needed)."""
+
+    def __init__(self, path, operation):
+        self.path, self.operation = path, operation
+
+    def __enter__(self):
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self.fd, self.operation)
+        except BaseException:
+            os.close(self.fd)
+            raise
+        return self.fd
+
+    def __exit__(self, *exc_info):
+        os.close(self.fd)  # releases the lock
+
+
+def _read_generation(fd):
+    os.lseek(fd, 0, os.SEEK_SET)
+    try:
+        return int(os.read(fd, 32) or 0)
+    except ValueError:
+        return 0
+
+
+def generation(directory):
+    """Current write generation of a domain directory."""
+    with _Locked(os.path.join(directory, "generation"), fcntl.LOCK_SH) as fd:
+        return _read_generation(fd)
+
+
+def _load(path, current_generation):
+    """Returns the raw body of an entry if it is fresh and of the current generation, else None."""
+    import porkbun_codec
+
+    try:
+        with open(path, "rb") as f:
+            header = porkbun_codec.loads(f.readline())
+            body = f.read()
+    except (OSError, ValueError):
+        return None
+    if header.get("generation") != current_generation or header.get("expires", 0) <= time.time():
+        return None
+    return body
+
+
+def _store(path, body, fetched_generation, ttl_seconds):
+    import porkbun_codec
+
+    header = porkbun_codec.dumps({"expires": time.time() + ttl_seconds, "generation": fetched_generation})
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header + b"\n" + body)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+def call(endpoint, payload, credentials, send, cache_dir=None):
+    """
+    Makes an API call through the shared cache.
+
+    Reads of SHARED_ENDPOINTS are served from the cache or fetched once under
+    the key's lock. Writes are sent and then invalidate the domain.
+
+    Args:
+        endpoint (str): API endpoint.
+        payload (dict): Request payload without the keys.
+        credentials (tuple): (API_KEY, SECRET_KEY) of the caller.
+        send (callable): send(endpoint, payload) makes the actual call.
+        cache_dir (str, optional): Cache directory (default: DEFAULT_CACHE_DIR).
+
+    Returns:
+        dict: The response, as returned by send (a PorkbunResponse).
+    """
+    ttl_seconds = ttl()
+    if not ttl_seconds or not endpoint.startswith(SHARED_ENDPOINTS):
+        try:
+            return send(endpoint, payload)
+        finally:
+            invalidate(endpoint, credentials, cache_dir)
+
+    directory = _domain_dir(endpoint, credentials, cache_dir)
+    if directory is None:
+        return send(endpoint, payload)
+
+    import porkbun_codec
+
+    name = _entry_name(endpoint, payload)
+    entry_path = os.path.join(directory, name + ".entry")
+    lock = _Locked(os.path.join(directory, name + ".lock"), fcntl.LOCK_EX)
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        lock.__enter__()  # waits while another process fetches this key
+    except OSError:
+        return send(endpoint, payload)  # cache directory not usable
+    try:
+        try:
+            current = generation(directory)
+        except OSError:
+            return send(endpoint, payload)
+        body = _load(entry_path, current)
+        if body is not None:
+            return porkbun_codec.decode_response(body)
+        response = send(endpoint, payload)
+        raw = getattr(response, "raw", None)
+        if raw is not None:
+            _store(entry_path, raw, current, ttl_seconds)
+        return response
+    finally:
+        lock.__exit__()
+
+
+def domain_generation(endpoint, credentials, cache_dir=None):
+    """
+    Write generation of the endpoint's domain, as bumped by invalidate() in any process.
+
+    Creates the domain directory, so writes from then on are counted. Returns None
+    if there is no counter for the endpoint (account-wide endpoint, no fcntl, or an
+    unusable cache directory).
+    """
+    if fcntl is None:
+        return None
+    directory = _domain_dir(endpoint, credentials, cache_dir)
+    if directory is None:
+        return None
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        return generation(directory)
+    except OSError:
+        return None
+
+
+def invalidate(endpoint, credentials, cache_dir=None):
+    """Bumps the generation of the domain a write went to, so its cached reads are no longer served."""
+    import porkbun_broker
+
+    if fcntl is None or porkbun_broker.is_read(endpoint):
+        return
+    directory = _domain_dir(endpoint, credentials, cache_dir)
+    if directory is None or not os.path.isdir(directory):
+        return  # nothing of this domain was ever cached
+    try:
+        with _Locked(os.path.join(directory, "generation"), fcntl.LOCK_EX) as fd:
+            value = _read_generation(fd) + 1
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, str(value).encode("ascii"))
+    except (OSError, ValueError):
+        pass
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Bulk sync of the SSL certificate bundles Porkbun issues, from /ssl/retrieve/{domain}.
+
+Bundles are fetched concurrently over one pooled keep-alive client. Each
+bundle is written as three files in <dest>/<domain>/:
+
+    fullchain.pem   certificate chain (the "certificatechain" field)
+    privkey.pem     private key
+    pubkey.pem      public key
+
+A file is only written when its SHA-256 fingerprint differs from the copy
+already on disk, so a run with nothing to do reads each bundle once and touches
+no files. Writes go to a temporary file in the same directory that is then
+renamed over the old one, so readers never see a partial key. Files are created
+with mode 0600 and directories with 0700.
+
+Usage (also available as `porkbun ssl-sync ...`):
+    ./porkbun_ssl.py --dest /etc/ssl/porkbun example.com example.net
+    ./porkbun_ssl.py --dest /etc/ssl/porkbun --all [--concurrency 16]
+"""
+
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Bundle file name -> field of the /ssl/retrieve response
+BUNDLE_FILES = {
+    "fullchain.pem": "certificatechain",
+    "privkey.pem": "privatekey",
+    "pubkey.pem": "publickey",
+}
+FILE_MODE = 0o600
+DIR_MODE = 0o700
+DEFAULT_CONCURRENCY = 16
+
+
+def fingerprint(data):
+    """SHA-256 hex digest of bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_fingerprint(path):
+    """SHA-256 of a file's content, or None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return fingerprint(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def certificate_fingerprint(chain):
+    """SHA-256 fingerprint (AA:BB:...) of the first certificate in a PEM chain, or None."""
+    import ssl
+
+    end_marker = "-----END CERTIFICATE-----"
+    end = chain.find(end_marker)
+    if end < 0:
+        return None
+    try:
+        der = ssl.PEM_cert_to_DER_cert(chain[:end + len(end_marker)])
+    except ValueError:
+        return None
+    digest = hashlib.sha256(der).hexdigest().upper()
+    return ":".join(digest[i:i + 2] for i in range(0, len(digest), 2))
+
+
+def sync_domain(client, domain, dest):
+    """
+    Fetches one domain's bundle and writes the files that changed.
+
+    Args:
+        client (porkbun_api.PorkbunClient): Shared pooled client.
+        domain (str): Domain name.
+        dest (str): Base directory; files go to dest/domain/.
+
+    Returns:
+        dict: domain, status ('unchanged', 'updated', 'created' or 'error'),
+              changed (list of file names written), fingerprint, error
+    """
+    import requests
+
+    from porkbun_files import write_atomic
+
+    result = {"domain": domain, "status": "unchanged", "changed": [], "fingerprint": None, "error": None}
+    try:
+        response = client.request(f"/ssl/retrieve/{domain}", {})
+    except (requests.exceptions.RequestException, ValueError) as e:
+        result.update(status="error", error=str(e))
+        return result
+
+    domain_dir = os.path.join(dest, domain)
+    created = not os.path.isdir(domain_dir)
+    try:
+        os.makedirs(domain_dir, mode=DIR_MODE, exist_ok=True)
+        for filename, field in BUNDLE_FILES.items():
+            content = response.get(field)
+            if not content:
+                continue
+            data = content.encode("utf-8")
+            path = os.path.join(domain_dir, filename)
+            if file_fingerprint(path) == fingerprint(data):
+                continue
+            write_atomic(path, data, mode=FILE_MODE)
+            result["changed"].append(filename)
+    except OSError as e:
+        result.update(status="error", error=f"Cannot write {domain_dir}: {e}")
+        return result
+
+    if result["changed"]:
+        result["status"] = "created" if created else "updated"
+        result["fingerprint"] = certificate_fingerprint(response.get("certificatechain") or "")
+    return result
+
+
+def sync_bundles(domains, dest, concurrency=DEFAULT_CONCURRENCY, client=None, on_result=None):
+    """
+    Syncs the bundles of many domains concurrently.
+
+    Args:
+        domains (list): Domain names.
+        dest (str): Base directory.
+        concurrency (int): Bundles fetched in parallel (also the connection pool size).
+        client (porkbun_api.PorkbunClient, optional): Client to use (default: a new pooled one).
+        on_result (callable, optional): Called with each result dict as it completes.
+
+    Returns:
+        list: Result dicts (see sync_domain), in completion order.
+    """
+    from porkbun_api import PorkbunClient
+
+    own_client = client is None
+    if own_client:
+        client = PorkbunClient(pool_size=concurrency, retries=2)
+    os.makedirs(dest, mode=DIR_MODE, exist_ok=True)
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = [executor.submit(sync_domain, client, domain, dest) for domain in domains]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if on_result:
+                    on_result(result)
+    finally:
+        if own_client:
+            client.close()
+    return results
+
+
+# --- Command line (argument parsing lives in porkbun_cli) ---
+
+def run_command(args):
+    """Runs `porkbun ssl-sync` as parsed by porkbun_cli."""
+    import requests
+
+    import porkbun_accounts
+    try:
+        client, domains = porkbun_accounts.portfolio(args.domains, args.all, args.accounts, args.concurrency)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"API Call Error while listing domains: {e}")
+        return 1
+    if not domains:
+        client.close()
+        print("No domains given (pass domain names or --all).")
+        return 2
+
+    def report(result):
+        if result["status"] == "error":
+            print(f"[ERROR]     {result['domain']}: {result['error']}")
+        elif result["status"] != "unchanged":
+            fingerprint_text = f" sha256 {result['fingerprint']}" if result["fingerprint"] else ""
+            print(f"[{result['status'].upper():<9}] {result['domain']}: {', '.join(result['changed'])}{fingerprint_text}")
+        elif args.verbose:
+            print(f"[UNCHANGED] {result['domain']}")
+
+    start = time.perf_counter()
+    try:
+        results = sync_bundles(domains, args.dest, args.concurrency, client=client, on_result=report)
+    finally:
+        client.close()
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    summary = ", ".join(f"{counts.get(status, 0)} {status}" for status in ("created", "updated", "unchanged", "error"))
+    print(f"{len(results)} domains in {time.perf_counter() - start:.1f}s: {summary}")
+    return 1 if counts.get("error") else 0
+
+
+if __name__ == "__main__":
+    import porkbun_cli
+    sys.exit(porkbun_cli.main(["ssl-sync"] + sys.argv[1:]))
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Zone export (backup) and restore for all domains.
+
+export fetches every domain's records from /dns/retrieve concurrently over one
+pooled client and writes two gzip-compressed files per domain:
+
+    <dest>/<domain>.json.gz   the records as returned by the API (used by restore)
+    <dest>/<domain>.zone.gz   the same records in BIND zone file format
+
+plus <dest>/manifest.json with the SHA-256 content hash of each zone. A zone
+whose hash matches the manifest is not rewritten, so a run where nothing
+changed only reads. Files are written atomically (temporary file, fsync, rename).
+
+restore reads the JSON snapshots, fetches the current records and applies the
+smallest set of writes that makes them match: identical records are kept,
+records that differ only in content, TTL or priority are edited in place, and
+the rest are created or deleted. All deletes run first (so a CNAME can replace
+another record at the same name), then all edits and creates, concurrently
+across every domain.
+
+Usage (also available as `porkbun zone ...`):
+    ./porkbun_zone.py export /var/backups/porkbun --all [--nameservers] [--concurrency 16]
+    ./porkbun_zone.py restore /var/backups/porkbun example.com --dry-run
+    ./porkbun_zone.py restore /var/backups/porkbun [--keep-extra] [--nameservers]
+"""
+
+import gzip
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_CONCURRENCY = 16
+PRIO_TYPES = ("MX", "SRV")             # types whose priority is part of the record
+TARGET_TYPES = ("CNAME", "NS", "MX", "SRV", "ALIAS")  # content ends in a host name
+BIND_UNSUPPORTED = ("ALIAS",)          # Porkbun-only types, written as comments
+
+
+# --- Snapshot files ---
+
+def zone_paths(dest, domain):
+    """Returns (json path, BIND path) of a domain's snapshot."""
+    return os.path.join(dest, f"{domain}.json.gz"), os.path.join(dest, f"{domain}.zone.gz")
+
+
+def read_manifest(dest):
+    """Reads the manifest, or returns an empty one."""
+    import porkbun_codec
+
+    try:
+        with open(os.path.join(dest, MANIFEST_NAME), "rb") as f:
+            manifest = porkbun_codec.loads(f.read())
+    except FileNotFoundError:
+        return {"version": MANIFEST_VERSION, "domains": {}}
+    manifest.setdefault("domains", {})
+    return manifest
+
+
+def write_manifest(dest, manifest):
+    import porkbun_codec
+    from porkbun_files import write_atomic
+
+    manifest["version"] = MANIFEST_VERSION
+    manifest["domains"] = dict(sorted(manifest["domains"].items()))
+    manifest["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    write_atomic(os.path.join(dest, MANIFEST_NAME), porkbun_codec.dumps_pretty(manifest).encode("utf-8") + b"\n")
+
+
+def read_snapshot(dest, domain):
+    """
+    Reads one domain's JSON snapshot.
+
+    Returns:
+        tuple: (list of DnsRecord, nameservers list or None)
+    """
+    import porkbun_codec
+    from porkbun_models import parse_records
+
+    with gzip.open(zone_paths(dest, domain)[0], "rb") as f:
+        snapshot = porkbun_codec.loads(f.read())
+    return parse_records(snapshot, domain), snapshot.get("nameservers")
+
+
+def _quote_txt(content):
+    """Quotes TXT content for a zone file, split into 255-byte character-strings."""
+    data = content.encode("utf-8")
+    chunks = [data[i:i + 255] for i in range(0, len(data), 255)] or [b""]
+    escaped = (chunk.decode("utf-8", "replace").replace("\\", "\\\\").replace('"', '\\"') for chunk in chunks)
+    return " ".join(f'"{chunk}"' for chunk in escaped)
+
+
+def _fqdn(name):
+    return name if name.endswith(".") else name + "."
+
+
+def to_bind(domain, records, nameservers=None):
+    """
+    Renders records as a BIND zone file.
+
+    Args:
+        domain (str): The zone.
+        records (list): DnsRecord objects.
+        nameservers (list, optional): Delegation from /domain/getNs, written as a comment.
+
+    Returns:
+        str
+    """
+    lines = [f"; {domain} exported from the Porkbun API", f"$ORIGIN {domain}."]
+    if nameservers:
+        lines.append(f"; registry nameservers: {' '.join(nameservers)}")
+    for record in sorted(records, key=lambda r: (r.subdomain or "", r.type or "", r.content or "")):
+        owner = record.subdomain or "@"
+        content = record.content or ""
+        if record.type == "TXT":
+            rdata = _quote_txt(content)
+        elif record.type in TARGET_TYPES:
+            fields = content.split()
+            fields[-1:] = [_fqdn(fields[-1])] if fields else []
+            rdata = " ".join(fields)
+        else:
+            rdata = content
+        if record.type in PRIO_TYPES:
+            rdata = f"{record.prio or 0} {rdata}"
+        line = f"{owner}\t{record.ttl or 600}\tIN\t{record.type}\t{rdata}"
+        lines.append(f"; {line}" if record.type in BIND_UNSUPPORTED else line)
+    return "\n".join(lines) + "\n"
+
+
+# --- Export ---
+
+def fetch_zone(client, domain, nameservers=False):
+    """
+    Fetches one domain's records (and nameservers if asked).
+
+    Returns:
+        tuple: (records list, nameservers list or None)
+    """
+    from porkbun_inventory import normalize_ns
+    from porkbun_models import parse_records
+
+    records = parse_records(client.request(f"/dns/retrieve/{domain}", {}), domain)
+    ns = None
+    if nameservers:
+        ns = [normalize_ns(name) for name in client.request(f"/domain/getNs/{domain}", {}).get("ns") or []]
+    return records, ns
+
+
+def export_domain(client, domain, dest, known_hash=None, nameservers=False):
+    """
+    Exports one domain, writing its files only if the content hash changed.
+
+    Returns:
+        dict: domain, status ('created', 'updated', 'unchanged' or 'error'), sha256, records, error
+    """
+    import requests
+    import porkbun_codec
+    from porkbun_inventory import content_hash
+    from porkbun_files import write_atomic
+
+    result = {"domain": domain, "status": "unchanged", "sha256": known_hash, "records": 0, "error": None}
+    try:
+        records, ns = fetch_zone(client, domain, nameservers)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        result.update(status="error", error=str(e))
+        return result
+
+    digest = content_hash(records, ns or [])
+    result["records"] = len(records)
+    json_path, bind_path = zone_paths(dest, domain)
+    if digest == known_hash and os.path.exists(json_path) and os.path.exists(bind_path):
+        return result
+
+    snapshot = {"domain": domain, "sha256": digest,
+                "exported_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "records": [record.to_dict() for record in records]}
+    if ns is not None:
+        snapshot["nameservers"] = ns
+    try:
+        # mtime=0 keeps the compressed bytes identical for identical content
+        write_atomic(json_path, gzip.compress(porkbun_codec.dumps(snapshot), mtime=0))
+        write_atomic(bind_path, gzip.compress(to_bind(domain, records, ns).encode("utf-8"), mtime=0))
+    except OSError as e:
+        result.update(status="error", error=f"Cannot write {json_path}: {e}")
+        return result
+    result.update(status="created" if known_hash is None else "updated", sha256=digest,
+                  exported_at=snapshot["exported_at"])
+    return result
+
+
+def export_zones(domains, dest, concurrency=DEFAULT_CONCURRENCY, nameservers=False, client=None, on_result=None):
+    """
+    Exports many domains concurrently and updates the manifest.
+
+    Returns:
+        list: Result dicts (see export_domain), in completion order.
+    """
+    from concurrent.futures import as_completed
+    from porkbun_api import PorkbunClient
+
+    os.makedirs(dest, mode=0o700, exist_ok=True)
+    manifest = read_manifest(dest)
+    entries = manifest["domains"]
+    own_client = client is None
+    if own_client:
+        client = PorkbunClient(pool_size=concurrency, retries=2)
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = [executor.submit(export_domain, client, domain, dest,
+                                       (entries.get(domain) or {}).get("sha256"), nameservers)
+                       for domain in domains]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if result["status"] in ("created", "updated"):
+                    entries[result["domain"]] = {"sha256": result["sha256"], "records": result["records"],
+                                                 "exported_at": result["exported_at"]}
+                if on_result:
+                    on_result(result)
+    finally:
+        if own_client:
+            client.close()
+    if any(result["status"] in ("created", "updated") for result in results) or \
+            not os.path.exists(os.path.join(dest, MANIFEST_NAME)):
+        write_manifest(dest, manifest)
+    return results
+
+
+# --- Restore ---
+
+def _payload(record):
+    """The create/edit payload for a record."""
+    payload = {"name": record.subdomain or "", "type": record.type, "content": record.content or "",
+               "ttl": record.ttl or "600"}
+    if record.type in PRIO_TYPES and record.prio:
+        payload["prio"] = record.prio
+    # Always sent: an edit that omits notes keeps the live record's notes, and the restore would never converge
+    payload["notes"] = record.notes or ""
+    return payload
+
+
+def _identity(record):
+    """What makes two records the same record: name, type, content and (for MX/SRV) priority."""
+    prio = (record.prio or "0") if record.type in PRIO_TYPES else ""
+    return (record.subdomain or "", record.type, record.content or "", prio)
+
+
+def plan_restore(desired, current, delete_extra=True):
+    """
+    Computes the minimal writes that turn the current records into the desired ones.
+
+    Args:
+        desired (list): DnsRecord objects from the snapshot.
+        current (list): DnsRecord objects currently in the zone (with IDs).
+        delete_extra (bool): Delete current records that are not in the snapshot. When False they
+            are left untouched, so a changed snapshot record is created instead of edited over one.
+
+    Returns:
+        list: Operations ('delete', current record, None), ('edit', current record, desired record)
+              and ('create', None, desired record).
+    """
+    unmatched = {}
+    for record in current:
+        unmatched.setdefault(_identity(record), []).append(record)
+
+    operations = []
+    leftover = []
+    for record in desired:
+        candidates = unmatched.get(_identity(record))
+        if candidates:
+            # Prefer an exact copy; otherwise the same record with another TTL/notes is edited
+            same = next((c for c in candidates if (c.ttl, c.notes or "") == (record.ttl, record.notes or "")), None)
+            match = same or candidates[0]
+            candidates.remove(match)
+            if same is None:
+                operations.append(("edit", match, record))
+        else:
+            leftover.append(record)
+
+    if not delete_extra:
+        # Records that are not in the snapshot are left alone, so nothing is paired with them
+        operations.extend(("create", None, record) for record in leftover)
+        return operations
+
+    # Pair what is left by name and type, so a changed record costs one edit instead of delete + create
+    by_name_type = {}
+    for records in unmatched.values():
+        for record in records:
+            by_name_type.setdefault((record.subdomain or "", record.type), []).append(record)
+    for record in leftover:
+        candidates = by_name_type.get((record.subdomain or "", record.type))
+        if candidates:
+            operations.append(("edit", candidates.pop(0), record))
+        else:
+            operations.append(("create", None, record))
+    for records in by_name_type.values():
+        operations.extend(("delete", record, None) for record in records)
+    return operations
+
+
+def _apply(client, domain, operation):
+    import requests
+
+    action, old, new = operation
+    try:
+        if action == "delete":
+            client.request(f"/dns/delete/{domain}/{old.id}", {})
+        elif action == "edit":
+            client.request(f"/dns/edit/{domain}/{old.id}", _payload(new))
+        elif action == "create":
+            client.request(f"/dns/create/{domain}", _payload(new))
+        else:
+            client.request(f"/domain/updateNs/{domain}", {"ns": new})
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return domain, operation, str(e)
+    return domain, operation, None
+
+
+def restore_zones(dest, domains, concurrency=DEFAULT_CONCURRENCY, delete_extra=True, nameservers=False,
+                  dry_run=False, client=None):
+    """
+    Restores many domains from a snapshot directory.
+
+    Returns:
+        tuple: (plans {domain: [operations]}, errors [(domain, operation or None, message)])
+    """
+    import requests
+    from porkbun_api import PorkbunClient
+
+    own_client = client is None
+    if own_client:
+        client = PorkbunClient(pool_size=concurrency, retries=2)
+
+    def plan(domain):
+        try:
+            desired, desired_ns = read_snapshot(dest, domain)
+        except (OSError, ValueError) as e:
+            return domain, None, f"Cannot read snapshot: {e}"
+        try:
+            current, current_ns = fetch_zone(client, domain, nameservers and desired_ns is not None)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return domain, None, str(e)
+        operations = plan_restore(desired, current, delete_extra)
+        if nameservers and desired_ns and sorted(desired_ns) != sorted(current_ns or []):
+            operations.append(("nameservers", current_ns, desired_ns))
+        return domain, operations, None
+
+    plans, errors = {}, []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for domain, operations, error in executor.map(plan, domains):
+                if error is None:
+                    plans[domain] = operations
+                else:
+                    errors.append((domain, None, error))
+            if not dry_run:
+                # Deletes first, so a record can be replaced by one of a conflicting type (e.g. CNAME)
+                for phase in (("delete",), ("edit", "create", "nameservers")):
+                    work = [(domain, op) for domain, operations in plans.items() for op in operations if op[0] in phase]
+                    for domain, operation, error in executor.map(lambda item: _apply(client, *item), work):
+                        if error is not None:
+                            errors.append((domain, operation, error))
+    finally:
+        if own_client:
+            client.close()
+    return plans, errors
+
+
+# --- Command line (argument parsing lives in porkbun_cli) ---
+
+def _describe(operation):
+    action, old, new = operation
+    if action == "nameservers":
+        return f"~ nameservers {','.join(old or [])} -> {','.join(new)}"
+    if action == "delete":
+        return f"- {old.name} {old.type} {old.content} (ttl {old.ttl})"
+    if action == "create":
+        return f"+ {new.name} {new.type} {new.content} (ttl {new.ttl})"
+    return f"~ {old.name} {old.type} {old.content} (ttl {old.ttl}) -> {new.content} (ttl {new.ttl})"
+
+
+def run_command(args):
+    """Runs a `zone` subcommand parsed by porkbun_cli."""
+    import requests
+
+    start = time.perf_counter()
+    if args.action == "export":
+        import porkbun_accounts
+        try:
+            client, domains = porkbun_accounts.portfolio(args.domains, args.all, args.accounts, args.concurrency)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"API Call Error while listing domains: {e}")
+            return 1
+        if not domains:
+            client.close()
+            print("No domains given (pass domain names or --all).")
+            return 2
+
+        def report(result):
+            if result["status"] == "error":
+                print(f"[ERROR]     {result['domain']}: {result['error']}")
+            elif result["status"] != "unchanged":
+                print(f"[{result['status'].upper():<9}] {result['domain']}: {result['records']} records")
+            elif args.verbose:
+                print(f"[UNCHANGED] {result['domain']}")
+
+        try:
+            results = export_zones(domains, args.dest, args.concurrency, args.nameservers, client, on_result=report)
+        finally:
+            client.close()
+        counts = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        summary = ", ".join(f"{counts.get(status, 0)} {status}" for status in ("created", "updated", "unchanged", "error"))
+        print(f"{len(results)} zones exported to {args.dest} in {time.perf_counter() - start:.1f}s: {summary}")
+        return 1 if counts.get("error") else 0
+
+    domains = list(dict.fromkeys(args.domains)) or sorted(read_manifest(args.dest)["domains"])
+    if not domains:
+        print(f"No snapshots in {args.dest}.")
+        return 2
+    client = None
+    if args.accounts:
+        import porkbun_accounts
+        try:
+            client = porkbun_accounts.AccountPool(pool_size=args.concurrency)
+        except ValueError as e:
+            print(e)
+            return 2
+    try:
+        plans, errors = restore_zones(args.dest, domains, args.concurrency, not args.keep_extra, args.nameservers,
+                                      args.dry_run, client)
+    finally:
+        if client is not None:
+            client.close()
+    writes = 0
+    for domain in sorted(plans):
+        if plans[domain]:
+            print(f"{domain}:")
+            for operation in plans[domain]:
+                print(f"  {_describe(operation)}")
+        writes += len(plans[domain])
+    for domain, operation, error in errors:
+        what = f" ({_describe(operation).strip()})" if operation else ""
+        print(f"[ERROR] {domain}{what}: {error}")
+    verb = "would be made" if args.dry_run else "made"
+    changed = sum(1 for operations in plans.values() if operations)
+    print(f"{len(plans)} zones compared, {changed} differ: {writes} writes {verb}, {len(errors)} errors "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    import porkbun_cli
+    sys.exit(porkbun_cli.main(["zone"] + sys.argv[1:]))
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+Local stub DNS server (UDP and TCP) for offline tests and benchmarks.
+
+Answers from an in-memory zone; names with no records get NXDOMAIN. Responses
+larger than 512 bytes over UDP are sent truncated (TC bit) so clients retry
+over TCP, as real resolvers do.
+
+Records can be scoped to a client subnet. A query carrying an EDNS Client
+Subnet option (RFC 7871) inside that subnet gets the scoped records instead of
+the unscoped ones, and the option is echoed back with the scope prefix length,
+like a GeoDNS-aware resolver.
+
+Usage: ./stub_dns_server.py [--host 127.0.0.1] [--port 5353] [--latency-ms 0]
+                            [--record "example.com NS kellen.ns.cloudflare.com"] ...
+                            [--ecs-record "198.51.100.0/24 example.com NS ns1.old-dns.net"] ...
+Query it with: dig @127.0.0.1 -p 5353 example.com NS +short
+"""
+
+import argparse
+import ipaddress
+import socket
+import struct
+import threading
+import time
+
+import dns_wire
+
+
+class StubDnsServer:
+    """
+    A UDP+TCP DNS server on one port answering from an in-memory zone.
+
+    Example:
+        server = StubDnsServer(port=0)
+        server.add_record("example.com", "NS", "kellen.ns.cloudflare.com")
+        server.start()
+        ... query server.host:server.port ...
+        server.stop()
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0.0):
+        self.host = host
+        self.latency_ms = latency_ms
+        self.zone = {}          # (name, type number) -> [(ttl, value)]
+        self.scoped = {}        # client subnet -> {(name, type number): [(ttl, value)]}
+        self.names = set()      # names that exist (for NXDOMAIN vs NODATA)
+        self.query_count = 0
+        self._lock = threading.Lock()
+        self._running = False
+
+        self.udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp_sock.bind((host, port))
+        self.port = self.udp_sock.getsockname()[1]
+        self.tcp_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.tcp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.tcp_sock.bind((host, self.port))
+        self.tcp_sock.listen(64)
+        self._threads = []
+
+    def add_record(self, name, record_type, value, ttl=300, subnet=None):
+        """
+        Adds a record; value is in presentation form (e.g. '10 mx.example.com' for MX).
+
+        With a subnet (e.g. '198.51.100.0/24') the record is only served to queries whose
+        Client Subnet option falls inside it, in place of the unscoped records of that name and type.
+        """
+        name = dns_wire.normalize_name(name)
+        key = (name, dns_wire.type_number(record_type))
+        with self._lock:
+            if subnet is None:
+                zone = self.zone
+            else:
+                zone = self.scoped.setdefault(ipaddress.ip_network(subnet, strict=False), {})
+            zone.setdefault(key, []).append((ttl, value))
+            self.names.add(name)
+
+    def match_subnet(self, query):
+        """
+        Returns the most specific record subnet containing the query's Client Subnet, or None.
+
+        Raises:
+            dns_wire.DnsFormatError: If the Client Subnet option is malformed.
+        """
+        ecs = dns_wire.client_subnet(query)
+        if ecs is None:
+            return None
+        network = ecs[0]
+        with self._lock:
+            matches = [subnet for subnet in self.scoped
+                       if subnet.version == network.version and network.subnet_of(subnet)]
+        return max(matches, key=lambda subnet: subnet.prefixlen, default=None)
+
+    def _lookup(self, key, subnet):
+        """Records for (name, type number), from the subnet's scope if it has any; returns (records, scope)."""
+        with self._lock:
+            if subnet is not None and key in self.scoped[subnet]:
+                return list(self.scoped[subnet][key]), subnet.prefixlen
+            return list(self.zone.get(key, [])), 0
+
+    def resolve(self, query, client_address):
+        """
+        Produces the answer for a parsed query. Override or replace to customise answers.
+
+        Args:
+            query (dict): Parsed query (dns_wire.parse_message).
+            client_address (tuple): Address of the client.
+
+        Returns:
+            tuple: (rcode, list of (name, type, ttl, value))
+        """
+        if not query["questions"]:
+            return dns_wire.RCODE_FORMERR, []
+        qname, qtype, _ = query["questions"][0]
+        name = dns_wire.normalize_name(qname)
+        records, _ = self._lookup((name, qtype), self.match_subnet(query))
+        with self._lock:
+            exists = name in self.names
+        if not exists:
+            return dns_wire.RCODE_NXDOMAIN, []
+        record_type = dns_wire.TYPE_NAMES.get(qtype, qtype)
+        return dns_wire.RCODE_NOERROR, [(qname, record_type, ttl, value) for ttl, value in records]
+
+    def handle(self, data, client_address, max_size=None):
+        """Builds the wire-format response to one query message."""
+        with self._lock:
+            self.query_count += 1
+        try:
+            query = dns_wire.parse_message(data)
+        except dns_wire.DnsFormatError:
+            return None
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        try:
+            opt = self.response_opt(query)
+        except dns_wire.DnsFormatError:
+            return dns_wire.build_response(query, (), dns_wire.RCODE_FORMERR)
+        rcode, answers = self.resolve(query, client_address)
+        response = dns_wire.build_response(query, answers, rcode, additional=opt, additional_count=int(bool(opt)))
+        if max_size is not None and len(response) > max_size:
+            response = dns_wire.build_response(query, (), rcode, truncated=True,
+                                               additional=opt, additional_count=int(bool(opt)))
+        return response
+
+    def response_opt(self, query):
+        """
+        OPT record for the response: empty unless the query used EDNS. A Client Subnet option
+        is echoed with the scope prefix the answer applies to (0 if it is not subnet-specific).
+        """
+        if not any(record["type"] == "OPT" for record in query["additional"]):
+            return b""
+        options = []
+        ecs = dns_wire.client_subnet(query)
+        if ecs is not None and query["questions"]:
+            qname, qtype, _ = query["questions"][0]
+            _, scope = self._lookup((dns_wire.normalize_name(qname), qtype), self.match_subnet(query))
+            options.append(dns_wire.encode_client_subnet(str(ecs[0]), scope))
+        return dns_wire.encode_opt_record(options=options)
+
+    def start(self):
+        """Starts the UDP and TCP listener threads; returns self."""
+        self._running = True
+        for target in (self._serve_udp, self._serve_tcp):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """Stops listening and closes the sockets."""
+        self._running = False
+        for sock in (self.udp_sock, self.tcp_sock):
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def _serve_udp(self):
+        while self._running:
+            try:
+                data, address = self.udp_sock.recvfrom(4096)
+            except OSError:
+                break
+            # Answer from a worker thread so artificial latency does not serialise queries
+            threading.Thread(target=self._answer_udp, args=(data, address), daemon=True).start()
+
+    def _answer_udp(self, data, address):
+        response = self.handle(data, address, max_size=self.max_udp_size(data))
+        if response:
+            try:
+                self.udp_sock.sendto(response, address)
+            except OSError:
+                pass
+
+    def max_udp_size(self, data):
+        """Largest UDP response the client accepts (512 bytes unless it sent EDNS)."""
+        try:
+            query = dns_wire.parse_message(data)
+        except dns_wire.DnsFormatError:
+            return dns_wire.MAX_UDP_PAYLOAD
+        for record in query["additional"]:
+            if record["type"] == "OPT":
+                return max(dns_wire.MAX_UDP_PAYLOAD, record["class"])  # OPT class = UDP payload size
+        return dns_wire.MAX_UDP_PAYLOAD
+
+    def _serve_tcp(self):
+        while self._running:
+            try:
+                conn, address = self.tcp_sock.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._answer_tcp, args=(conn, address), daemon=True).start()
+
+    def _answer_tcp(self, conn, address):
+        with conn:
+            conn.settimeout(5)
+            try:
+                while True:
+                    header = dns_wire.recv_exact(conn, 2)
+                    if not header:
+                        return
+                    (length,) = struct.unpack("!H", header)
+                    data = dns_wire.recv_exact(conn, length)
+                    if not data:
+                        return
+                    response = self.handle(data, address)
+                    if response:
+                        conn.sendall(struct.pack("!H", len(response)) + response)
+            except OSError:
+                return
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stub DNS server.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=5353, help="UDP/TCP port (default: 5353)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Artificial delay per query")
+    parser.add_argument("--record", action="append", default=[], metavar='"NAME TYPE VALUE [TTL]"',
+                        help="Record to serve; repeatable")
+    parser.add_argument("--ecs-record", action="append", default=[], metavar='"SUBNET NAME TYPE VALUE [TTL]"',
+                        help="Record served only to queries whose Client Subnet is inside SUBNET; repeatable")
+    args = parser.parse_args()
+
+    server = StubDnsServer(args.host, args.port, args.latency_ms)
+    specs = [(None, spec.split()) for spec in args.record]
+    specs += [(spec.split()[0], spec.split()[1:]) for spec in args.ecs_record]
+    for subnet, parts in specs:
+        ttl = 300
+        if len(parts) > 3 and parts[-1].isdigit() and parts[1].upper() != "TXT":
+            ttl = int(parts.pop())
+        server.add_record(parts[0], parts[1], " ".join(parts[2:]), ttl, subnet)
+    server.start()
+    print(f"Stub DNS server listening on {args.host}:{server.port} (UDP and TCP), {len(server.zone)} record set(s), "
+          f"{len(server.scoped)} client subnet(s)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+        server.stop()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: MIT
+
+"""
+In-place terminal renderer for live dashboards.
+
+Redraws only the lines that changed since the previous frame using ANSI cursor
+control (no subprocesses, no curses), throttles redraws to a maximum frame rate
+(a throttled frame is drawn by a timer once the interval has passed), and falls back to plain line output when the stream is not a TTY. Frames taller
+than the terminal are cut to fit (the final frame is printed in full).
+
+Usage:
+    renderer = LiveRenderer()
+    renderer.render(lines)          # call as often as you like; throttled
+    renderer.event("one result")    # plain-mode only: printed as it happens
+    renderer.finish(lines)          # always draws/prints the final frame
+"""
+
+import re
+import shutil
+import sys
+import threading
+import time
+
+# ANSI control sequences
+CURSOR_UP = "\033[{}A"
+CURSOR_DOWN = "\033[{}B"
+CLEAR_LINE = "\r\033[2K"
+CLEAR_SCREEN = "\033[2J\033[H"
+HIDE_CURSOR = "\033[?25l"
+SHOW_CURSOR = "\033[?25h"
+
+ANSI_ESCAPE_RE = re.compile(r"\033\[[0-9;?]*[A-Za-z]")
+
+
+def visible_length(text):
+    """Returns the printable length of a string, ignoring ANSI escape codes."""
+    return len(ANSI_ESCAPE_RE.sub("", text))
+
+
+def fit_to_width(text, width):
+    """
+    Truncates a line to the given printable width while keeping ANSI codes intact,
+    so a long line never wraps and throws off cursor positioning.
+
+    Args:
+        text (str): Line that may contain ANSI escape codes.
+        width (int): Maximum number of printable characters.
+
+    Returns:
+        str: The (possibly truncated) line.
+    """
+    if visible_length(text) <= width:
+        return text
+    out = []
+    printed = 0
+    pos = 0
+    while pos < len(text) and printed < width:
+        match = ANSI_ESCAPE_RE.match(text, pos)
+        if match:
+            out.append(match.group())
+            pos = match.end()
+            continue
+        out.append(text[pos])
+        printed += 1
+        pos += 1
+    # Keep any trailing escape codes (typically a color reset)
+    out.extend(ANSI_ESCAPE_RE.findall(text[pos:]))
+    return "".join(out)
+
+
+def fit_to_height(lines, height):
+    """
+    Cuts a frame to at most `height` lines, ending with a "... N more lines" line,
+    so relative cursor movement never runs past the top of the terminal.
+
+    Args:
+        lines (list): Lines of the frame.
+        height (int): Maximum number of lines (at least 2).
+
+    Returns:
+        list: The (possibly shortened) frame.
+    """
+    if len(lines) <= height:
+        return lines
+    hidden = len(lines) - (height - 1)
+    return lines[:height - 1] + [f"\u2026 {hidden} more lines (enlarge the terminal to see them)"]
+
+
+class LiveRenderer:
+    """
+    Draws successive frames (lists of lines) to a stream.
+
+    On a TTY each frame is diffed against the previous one and only changed lines
+    are rewritten in place. Elsewhere (pipes, files, cron) frames are not animated:
+    `event()` lines are written as they arrive and `finish()` prints the final frame.
+    Methods may be called from any thread.
+    """
+
+    def __init__(self, stream=None, max_fps=10, live=None):
+        """
+        Args:
+            stream: Output stream (default: sys.stdout).
+            max_fps (float): Maximum number of redraws per second on a TTY.
+            live (bool, optional): Force live (True) or plain (False) mode.
+                Defaults to auto-detecting whether the stream is a TTY.
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        if live is None:
+            isatty = getattr(self.stream, "isatty", None)
+            live = bool(isatty and isatty())
+        self.live = live
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self._frame = []        # lines currently on screen
+        self._pending = None    # newest frame not yet drawn because of throttling
+        self._last_draw = 0.0
+        self._cursor_hidden = False
+        self._timer = None      # draws _pending once the frame interval has passed
+        self._lock = threading.RLock()
+
+    def reset(self, clear_screen=False):
+        """
+        Starts a new frame sequence below (or instead of) the current one.
+
+        Args:
+            clear_screen (bool): On a TTY, clear the screen first (ANSI, no subprocess).
+        """
+        with self._lock:
+            self._cancel_timer()
+            if self.live and clear_screen:
+                self.stream.write(CLEAR_SCREEN)
+                self.stream.flush()
+            self._frame = []
+            self._pending = None
+            self._last_draw = 0.0
+
+    def render(self, lines, force=False):
+        """
+        Offers a new frame. On a TTY it is drawn immediately unless the previous draw
+        was less than 1/max_fps seconds ago, in which case it is kept and drawn as
+        soon as that interval has passed (unless a newer frame replaces it first).
+        In plain mode this is a no-op.
+
+        Args:
+            lines (list): Lines of the frame (may contain ANSI color codes).
+            force (bool): Draw now regardless of the frame-rate limit.
+        """
+        if not self.live:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._last_draw + self.min_interval - now
+            if not force and wait > 0:
+                self._pending = list(lines)
+                if self._timer is None:
+                    self._timer = threading.Timer(wait, self._draw_pending)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+            self._cancel_timer()
+            self._draw(lines)
+            self._pending = None
+            self._last_draw = now
+
+    def _draw_pending(self):
+        """Timer callback: draws the frame held back by throttling."""
+        with self._lock:
+            self._timer = None
+            if self._pending is not None:
+                self._draw(self._pending)
+                self._pending = None
+                self._last_draw = time.monotonic()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def event(self, line):
+        """Writes a single line immediately in plain mode; ignored on a TTY."""
+        if self.live:
+            return
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def finish(self, lines=None):
+        """
+        Draws the final frame. On a TTY this flushes any throttled frame and restores
+        the cursor; in plain mode the full frame is printed once.
+
+        Args:
+            lines (list, optional): Final frame. Defaults to the last offered frame.
+        """
+        if self.live:
+            with self._lock:
+                self._cancel_timer()
+                final = lines if lines is not None else self._pending
+                if final is not None:
+                    # Nothing is redrawn afterwards, so the full final frame may scroll the terminal
+                    self._draw(final, fit_height=False)
+                self._pending = None
+                if self._cursor_hidden:
+                    self.stream.write(SHOW_CURSOR)
+                    self.stream.flush()
+                    self._cursor_hidden = False
+        elif lines:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+
+    def _draw(self, lines, fit_height=True):
+        """Rewrites only the lines that differ from what is on screen."""
+        size = shutil.get_terminal_size((120, 24))
+        width = max(size.columns - 1, 20)
+        if fit_height:
+            # The cursor rests on the line below the frame, so the frame gets one line less than the terminal
+            lines = fit_to_height(lines, max(size.lines - 1, 2))
+        new = [fit_to_width(line, width) for line in lines]
+        old = self._frame
+        out = []
+        if not self._cursor_hidden:
+            out.append(HIDE_CURSOR)
+            self._cursor_hidden = True
+
+        # The cursor always rests on the line just below the frame.
+        for index in range(min(len(old), len(new))):
+            if old[index] != new[index]:
+                distance = len(old) - index
+                out.append(CURSOR_UP.format(distance))
+                out.append(CLEAR_LINE + new[index])
+                out.append("\r" + CURSOR_DOWN.format(distance))
+
+        if len(new) > len(old):
+            for line in new[len(old):]:
+                out.append(CLEAR_LINE + line + "\n")
+        elif len(new) < len(old):
+            extra = len(old) - len(new)
+            out.append(CURSOR_UP.format(extra))
+            for _ in range(extra):
+                out.append(CLEAR_LINE + "\n")
+            out.append(CURSOR_UP.format(extra))
+
+        if out:
+            self.stream.write("".join(out))
+            self.stream.flush()
+        self._frame = new